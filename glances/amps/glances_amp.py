@@ -32,6 +32,9 @@ The return string is a string with one or more line (\n between lines).
 If the *one_line* var is true then the AMP will be displayed in one line.
 """
 
+import subprocess
+import threading
+
 from glances.compat import u, b, n, nativestr
 from glances.timer import Timer
 from glances.logger import logger
@@ -137,6 +140,13 @@ class GlancesAmp(object):
         """Return refresh time in seconds for the current application monitoring process."""
         return self.get('refresh')
 
+    def timeout(self):
+        """Return the max time in seconds of an AMP update (default: the refresh time)."""
+        ret = self.get('timeout')
+        if ret is None:
+            return self.refresh()
+        return ret
+
     def one_line(self):
         """Return True|False if the AMP shoukd be displayed in oneline (one_lineline=true|false)."""
         ret = self.get('one_line')
@@ -192,6 +202,31 @@ class GlancesAmp(object):
             ret = u(ret)
         return ret
 
+    def check_output(self, cmd, stderr=None):
+        """Run the command (list) and return its output.
+
+        The command is killed if it runs longer than the AMP timeout
+        (CalledProcessError is then raised, as for a non zero return code).
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        killed = []
+
+        def kill():
+            killed.append(True)
+            proc.kill()
+
+        timer = threading.Timer(self.timeout(), kill)
+        timer.start()
+        try:
+            output, _ = proc.communicate()
+        finally:
+            timer.cancel()
+        if killed:
+            logger.debug("AMP - {}: Command {} killed after {} seconds".format(self.NAME, cmd, self.timeout()))
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=output)
+        return output
+
     def update_wrapper(self, process_list):
         """Wrapper for the children update"""
         # Set the number of running process
@@ -35,7 +35,7 @@ one_line=false
 command=foo status
 """
 
-from subprocess import check_output, STDOUT, CalledProcessError
+from subprocess import STDOUT, CalledProcessError
 
 from glances.compat import u, to_ascii
 from glances.logger import logger
@@ -79,7 +79,7 @@ class Amp(GlancesAmp):
         try:
             msg = ''
             for cmd in res.split(';'):
-                msg += u(check_output(cmd.split(), stderr=STDOUT))
+                msg += u(self.check_output(cmd.split(), stderr=STDOUT))
             self.set_result(to_ascii(msg.rstrip()))
         except CalledProcessError as e:
             self.set_result(e.output)
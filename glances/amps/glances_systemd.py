@@ -31,6 +31,10 @@ unit has started successfully or not.
 loaded: Number of loaded units (unit's configuration has been parsed by systemd).
 failed: Number of units with an active failed status.
 
+The units states are read from the systemd D-Bus API (persistent connection,
+units states updated from the D-Bus signals) if the jeepney lib is
+installed, else from the systemctl command line.
+
 Source reference: https://www.digitalocean.com/community/tutorials/how-to-use-systemctl-to-manage-systemd-services-and-units
 
 Configuration file example
@@ -43,53 +47,251 @@ regex=\/usr\/lib\/systemd\/systemd
 refresh=60
 one_line=true
 systemctl_cmd=/usr/bin/systemctl --plain
+# Use the D-Bus API (default: true)
+dbus=true
 """
 
-from subprocess import check_output, CalledProcessError
+from collections import deque
+from subprocess import CalledProcessError
 
 from glances.logger import logger
-from glances.compat import iteritems, to_ascii
+from glances.compat import iteritems, itervalues, to_ascii
 from glances.amps.glances_amp import GlancesAmp
 
+try:
+    from jeepney import DBusAddress, HeaderFields, MatchRule, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:
+    jeepney_tag = False
+else:
+    jeepney_tag = True
+
+SYSTEMD_PATH = '/org/freedesktop/systemd1'
+SYSTEMD_MANAGER = 'org.freedesktop.systemd1.Manager'
+SYSTEMD_UNIT = 'org.freedesktop.systemd1.Unit'
+
+
+class SystemdBus(object):
+
+    """Persistent connection to the systemd D-Bus API (jeepney lib).
+
+    The signals received between two calls are queued (at most <max_signals>).
+    """
+
+    def __init__(self, timeout=5, max_signals=10000):
+        self.timeout = timeout
+        self.manager = DBusAddress(SYSTEMD_PATH, bus_name='org.freedesktop.systemd1',
+                                   interface=SYSTEMD_MANAGER)
+        self.conn = open_dbus_connection(bus='SYSTEM')
+        self.queue = deque(maxlen=max_signals)
+        self.filters = []
+        for rule in [MatchRule(type='signal', interface='org.freedesktop.DBus.Properties',
+                               member='PropertiesChanged', path_namespace=SYSTEMD_PATH + '/unit'),
+                     MatchRule(type='signal', interface=SYSTEMD_MANAGER, path=SYSTEMD_PATH)]:
+            self.filters.append(self.conn.filter(rule, queue=self.queue))
+            self.conn.bus_proxy.AddMatch(rule)
+        # Ask systemd to emit the units signals
+        self.call('Subscribe')
+
+    def close(self):
+        """Close the D-Bus connection."""
+        self.conn.close()
+
+    def call(self, method):
+        """Call a method of the systemd manager and return the reply body."""
+        return unwrap_msg(self.conn.send_and_get_reply(new_method_call(self.manager, method),
+                                                       timeout=self.timeout))
+
+    def list_units(self):
+        """Return the loaded units.
+
+        Output: list of (name, description, load state, active state, sub state,
+        followed unit, path, job id, job type, job path)
+        """
+        return self.call('ListUnits')[0]
+
+    def signals(self):
+        """Return the received signals: list of (member, path, body).
+
+        The PropertiesChanged variants are unwrapped.
+        Return None if signals were lost (queue full).
+        """
+        while True:
+            try:
+                self.conn.recv_messages(timeout=0)
+            except TimeoutError:
+                break
+        lost = len(self.queue) == self.queue.maxlen
+        ret = []
+        while self.queue:
+            msg = self.queue.popleft()
+            member = msg.header.fields.get(HeaderFields.member)
+            body = msg.body
+            if member == 'PropertiesChanged':
+                body = (body[0], dict((k, v[1]) for k, v in iteritems(body[1])), body[2])
+            ret.append((member, msg.header.fields.get(HeaderFields.path), body))
+        return None if lost else ret
+
+
+class SystemdUnits(object):
+
+    """In-memory table of the systemd units states.
+
+    The table is read once with ListUnits and then updated from the
+    PropertiesChanged, UnitNew, UnitRemoved, JobNew and JobRemoved signals.
+    It is read again if a new unit appears or if signals were lost.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        # Units: {path: {'name': ..., 'load': ..., 'active': ..., 'sub': ..., 'job': ...}}
+        self.units = {}
+        # Units paths: {name: path}
+        self.paths = {}
+        self.synced = False
+
+    def update(self):
+        """Update and return the units table."""
+        if self.synced:
+            signals = self.bus.signals()
+            if signals is None:
+                self.synced = False
+            else:
+                for member, path, body in signals:
+                    self.apply(member, path, body)
+        if not self.synced:
+            # Signals received before ListUnits are useless
+            self.bus.signals()
+            self.units = {}
+            self.paths = {}
+            for unit in self.bus.list_units():
+                self.units[unit[6]] = {'name': unit[0], 'load': unit[2],
+                                       'active': unit[3], 'sub': unit[4],
+                                       'job': unit[7]}
+                self.paths[unit[0]] = unit[6]
+            self.synced = True
+        return self.units
+
+    def apply(self, member, path, body):
+        """Update the units table from a signal."""
+        if member == 'PropertiesChanged':
+            if body[0] != SYSTEMD_UNIT:
+                return
+            if path not in self.units:
+                # New unit: read the whole list again
+                self.synced = False
+                return
+            for key, prop in [('load', 'LoadState'), ('active', 'ActiveState'), ('sub', 'SubState')]:
+                if prop in body[1]:
+                    self.units[path][key] = body[1][prop]
+            if 'Job' in body[1]:
+                # Job property: (job id, job path), id 0 if no job
+                self.units[path]['job'] = body[1]['Job'][0]
+        elif member == 'UnitNew':
+            if body[1] not in self.units:
+                self.synced = False
+        elif member == 'UnitRemoved':
+            unit = self.units.pop(body[1], None)
+            if unit is not None:
+                self.paths.pop(unit['name'], None)
+        elif member in ('JobNew', 'JobRemoved'):
+            # Body: (job id, job path, unit name[, result])
+            path = self.paths.get(body[2])
+            if path is None:
+                if member == 'JobNew':
+                    self.synced = False
+                return
+            self.units[path]['job'] = body[0] if member == 'JobNew' else 0
+
+    def status(self):
+        """Return the number of units per load and active states.
+
+        As systemctl list-units, the inactive units without job are not counted.
+        """
+        ret = {}
+        for unit in itervalues(self.units):
+            if unit['active'] == 'inactive' and not unit['job']:
+                continue
+            for state in [unit['load'], unit['active']]:
+                ret[state] = ret.get(state, 0) + 1
+        return ret
+
 
 class Amp(GlancesAmp):
     """Glances' Systemd AMP."""
 
     NAME = 'Systemd'
-    VERSION = '1.0'
-    DESCRIPTION = 'Get services list from systemctl (systemd)'
+    VERSION = '1.1'
+    DESCRIPTION = 'Get services list from D-Bus or systemctl (systemd)'
     AUTHOR = 'Nicolargo'
     EMAIL = 'contact@nicolargo.com'
 
-    # def __init__(self, args=None):
-    #     """Init the AMP."""
-    #     super(Amp, self).__init__(args=args)
+    def __init__(self, name=None, args=None):
+        """Init the AMP."""
+        super(Amp, self).__init__(name=name, args=args)
+        # Units states table (None: D-Bus not used or not available yet)
+        self.units = None
 
     def update(self, process_list):
         """Update the AMP"""
+        if self.units is None and jeepney_tag and self.dbus():
+            try:
+                self.units = SystemdUnits(SystemdBus(timeout=self.timeout()))
+            except Exception as e:
+                logger.debug('{}: Cannot connect to D-Bus, use systemctl ({})'.format(self.NAME, e))
+                self.configs['dbus'] = 'false'
+
+        status = None
+        if self.units is not None:
+            try:
+                self.units.update()
+            except Exception as e:
+                logger.debug('{}: Error while reading the units from D-Bus ({})'.format(self.NAME, e))
+                self.units.bus.close()
+                # Connect again at the next update
+                self.units = None
+            else:
+                status = self.units.status()
+        if status is None:
+            status = self.update_systemctl()
+            if status is None:
+                return self.result()
+
+        # Build the output (string) message
+        output = 'Services\n'
+        for k, v in iteritems(status):
+            output += '{}: {}\n'.format(k, v)
+        self.set_result(output, separator=' ')
+
+        return self.result()
+
+    def dbus(self):
+        """Return True if the D-Bus API should be used (dbus=true|false, default true)."""
+        ret = self.get('dbus')
+        if ret is None:
+            return True
+        return ret.lower().startswith('true')
+
+    def update_systemctl(self):
+        """Return the number of units per load and active states (systemctl command line)."""
         # Get the systemctl status
         logger.debug('{}: Update stats using systemctl {}'.format(self.NAME, self.get('systemctl_cmd')))
         try:
-            res = check_output(self.get('systemctl_cmd').split())
+            res = self.check_output(self.get('systemctl_cmd').split())
         except (OSError, CalledProcessError) as e:
             logger.debug('{}: Error while executing systemctl ({})'.format(self.NAME, e))
-        else:
-            status = {}
-            # For each line
-            for r in to_ascii(res).split('\n')[1:-8]:
-                # Split per space .*
-                column = r.split()
-                if len(column) > 3:
-                    # load column
-                    for c in range(1, 3):
-                        try:
-                            status[column[c]] += 1
-                        except KeyError:
-                            status[column[c]] = 1
-            # Build the output (string) message
-            output = 'Services\n'
-            for k, v in iteritems(status):
-                output += '{}: {}\n'.format(k, v)
-            self.set_result(output, separator=' ')
-
-        return self.result()
+            return None
+        status = {}
+        # For each line
+        for r in to_ascii(res).split('\n')[1:-8]:
+            # Split per space .*
+            column = r.split()
+            if len(column) > 3:
+                # load column
+                for c in range(1, 3):
+                    try:
+                        status[column[c]] += 1
+                    except KeyError:
+                        status[column[c]] = 1
+        return status
@@ -44,7 +44,7 @@ one_line=true
 service_cmd=/usr/bin/service --status-all
 """
 
-from subprocess import check_output, STDOUT
+from subprocess import STDOUT, CalledProcessError
 
 from glances.logger import logger
 from glances.compat import iteritems
@@ -69,8 +69,8 @@ class Amp(GlancesAmp):
         # Get the systemctl status
         logger.debug('{}: Update stats using service {}'.format(self.NAME, self.get('service_cmd')))
         try:
-            res = check_output(self.get('service_cmd').split(), stderr=STDOUT).decode('utf-8')
-        except OSError as e:
+            res = self.check_output(self.get('service_cmd').split(), stderr=STDOUT).decode('utf-8')
+        except (OSError, CalledProcessError) as e:
             logger.debug('{}: Error while executing service ({})'.format(self.NAME, e))
         else:
             status = {'running': 0, 'stopped': 0, 'upstart': 0}
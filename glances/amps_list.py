@@ -21,7 +21,8 @@
 
 import os
 import re
-import threading
+import time
+from multiprocessing.pool import ThreadPool
 
 from glances.compat import listkeys, iteritems
 from glances.logger import logger
@@ -29,6 +30,162 @@ from glances.globals import amps_path
 from glances.processes import glances_processes
 
 
+class AmpsMatcher(object):
+
+    """Match the processes against the AMPs regular expressions.
+
+    The regular expressions are compiled once. A process is only matched
+    when it appears (new pid or create time) or when its name or command
+    line changes. The AMP to PIDs index is updated incrementally from the
+    processes arrivals and departures.
+    """
+
+    def __init__(self):
+        # AMPs regular expressions: {AMP name: regex string}
+        self.regexes = {}
+        # Compiled regular expressions: {AMP name: compiled regex}
+        self.patterns = {}
+        # All the regular expressions in one alternation (used as a pre-filter)
+        self.combined = None
+        # Processes already matched: {pid: (create_time, name, cmdline, AMPs names)}
+        self.cache = {}
+        # Processes matching each AMP: {AMP name: set of pids}
+        self.index = {}
+
+    def set_regexes(self, regexes):
+        """Set the AMPs regular expressions ({AMP name: regex string}).
+
+        Nothing is done if they did not change, else the processes will be
+        matched again at the next update.
+        """
+        if regexes == self.regexes:
+            return
+        self.regexes = dict(regexes)
+        self.patterns = {}
+        for name, regex in iteritems(self.regexes):
+            try:
+                self.patterns[name] = re.compile(regex)
+            except (re.error, TypeError) as e:
+                logger.warning("AMP {}: Invalid regular expression {} ({})".format(name, regex, e))
+        self.combined = None
+        # The numbered groups (and backreferences) would be shifted in the alternation
+        if self.patterns and all(p.groups == 0 for p in self.patterns.values()):
+            try:
+                self.combined = re.compile('|'.join('(?:{})'.format(p.pattern)
+                                                    for p in self.patterns.values()))
+            except re.error:
+                pass
+        self.cache = {}
+        self.index = dict((name, set()) for name in self.patterns)
+
+    def match(self, name, cmdline):
+        """Return the names of the AMPs matching the process name or one of its arguments."""
+        # Search in both cmdline and name (for kernel thread, see #1261)
+        strings = [name or ''] + list(cmdline)
+        if self.combined is not None and not any(self.combined.search(s) for s in strings):
+            # Most of the processes do not match any AMP
+            return frozenset()
+        return frozenset(amp for amp, pattern in iteritems(self.patterns)
+                         if any(pattern.search(s) for s in strings))
+
+    def update(self, processlist):
+        """Update the AMP to PIDs index from the processes list."""
+        pids = set()
+        for p in processlist:
+            pid = p['pid']
+            pids.add(pid)
+            cmdline = p['cmdline'] or []
+            cached = self.cache.get(pid)
+            if (cached is not None and cached[0] == p.get('create_time') and
+                    cached[1] == p['name'] and cached[2] == cmdline):
+                continue
+            amps = self.match(p['name'], cmdline)
+            if cached is not None:
+                for amp in cached[3] - amps:
+                    self.index[amp].discard(pid)
+            for amp in amps:
+                self.index[amp].add(pid)
+            self.cache[pid] = (p.get('create_time'), p['name'], cmdline, amps)
+
+        # Departed processes
+        for pid in listkeys(self.cache):
+            if pid not in pids:
+                for amp in self.cache.pop(pid)[3]:
+                    self.index[amp].discard(pid)
+
+        return self.index
+
+    def get(self, amp):
+        """Return the set of PIDs matching the AMP."""
+        return self.index.get(amp, set())
+
+
+class AmpsExecutor(object):
+
+    """Run the AMPs updates in a bounded pool of threads.
+
+    An AMP is never run twice at the same time: it is not submitted again
+    while its previous update is running. An update running longer than the
+    AMP timeout is reported (the AMP commands are killed by the AMP itself,
+    see GlancesAmp.check_output).
+    """
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        # The pool is only started when an AMP is run
+        self.pool = None
+        # Running updates: {AMP name: [async result, start time, timed out]}
+        self.running = {}
+        # Metrics: {AMP name: {'runs': ..., 'run_time': ..., 'timeouts': ..., 'errors': ...}}
+        self.metrics = {}
+
+    def exit(self):
+        """Stop the pool of threads."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def is_running(self, name):
+        """Return True if the update of the AMP is running."""
+        return name in self.running
+
+    def submit(self, amp, process_list):
+        """Run the update of the AMP in the pool."""
+        if self.pool is None:
+            self.pool = ThreadPool(self.workers)
+        self.running[amp.amp_name] = [self.pool.apply_async(amp.update, (process_list,)),
+                                      time.time(), False]
+
+    def collect(self, amps):
+        """Collect the ended updates and check the timeouts.
+
+        amps: the AMPs dict {AMP name: AMP}
+        """
+        now = time.time()
+        for name, (result, start, timed_out) in list(iteritems(self.running)):
+            metrics = self.metrics.setdefault(name, {'runs': 0, 'run_time': None,
+                                                     'timeouts': 0, 'errors': 0})
+            if result.ready():
+                del self.running[name]
+                metrics['runs'] += 1
+                metrics['run_time'] = now - start
+                try:
+                    result.get()
+                except Exception as e:
+                    metrics['errors'] += 1
+                    logger.debug("AMP {}: Error during the update ({})".format(name, e))
+            elif not timed_out and name in amps and now - start > amps[name].timeout():
+                # Only reported once per update, the result is kept until the update ends
+                self.running[name][2] = True
+                metrics['timeouts'] += 1
+                logger.debug("AMP {}: Update still running after {} seconds".format(name, amps[name].timeout()))
+                amps[name].set_result("Timeout after {} seconds".format(amps[name].timeout()))
+
+    def get(self, name):
+        """Return the metrics of the AMP (None if never run)."""
+        return self.metrics.get(name)
+
+
 class AmpsList(object):
 
     """This class describes the optional application monitoring process list.
@@ -48,6 +205,12 @@ class AmpsList(object):
         self.args = args
         self.config = config
 
+        # Processes matching each AMP
+        self.matcher = AmpsMatcher()
+
+        # Pool running the AMPs updates
+        self.executor = AmpsExecutor()
+
         # Load the AMP configurations / scripts
         self.load_configs()
 
@@ -90,6 +253,10 @@ class AmpsList(object):
 
         return True
 
+    def exit(self):
+        """Stop the running AMPs."""
+        self.executor.exit()
+
     def __str__(self):
         return str(self.__amps_dict)
 
@@ -107,22 +274,33 @@ class AmpsList(object):
         # Get the current processes list (once)
         processlist = glances_processes.getlist()
 
+        # Match the new (or changed) processes against the enabled AMPs
+        self.matcher.set_regexes(dict((k, self._regex(v)) for k, v in iteritems(self.get())
+                                      if v.enable() and v.regex() is not None))
+        self.matcher.update(processlist)
+        processes = dict((p['pid'], p) for p in processlist)
+
+        # Collect the ended AMPs updates
+        self.executor.collect(self.get())
+
         # Iter upon the AMPs dict
         for k, v in iteritems(self.get()):
             if not v.enable():
                 # Do not update if the enable tag is set
                 continue
 
-            amps_list = self._build_amps_list(v, processlist)
+            amps_list = self._build_amps_list(k, processes)
 
             if len(amps_list) > 0:
                 # At least one process is matching the regex
                 logger.debug("AMPS: {} processes {} detected ({})".format(len(amps_list),
                                                                           k,
                                                                           amps_list))
-                # Call the AMP update method
-                thread = threading.Thread(target=v.update_wrapper, args=[amps_list])
-                thread.start()
+                v.set_count(len(amps_list))
+                # Call the AMP update method (only every refresh seconds and
+                # if the previous update is over, else keep the last result)
+                if not self.executor.is_running(k) and v.should_update():
+                    self.executor.submit(v, amps_list)
             else:
                 # Set the process number to 0
                 v.set_count(0)
@@ -132,31 +310,31 @@ class AmpsList(object):
 
         return self.__amps_dict
 
-    def _build_amps_list(self, amp_value, processlist):
-        """Return the AMPS process list according to the amp_value
+    @staticmethod
+    def _regex(amp_value):
+        """Return the regular expression of the AMP as a string.
 
-        Search application monitored processes by a regular expression
+        The configuration values with commas are split in a list, for example
+        regex=nginx{1,2}.
         """
-        ret = []
-        try:
-            # Search in both cmdline and name (for kernel thread, see #1261)
-            for p in processlist:
-                add_it = False
-                if (re.search(amp_value.regex(), p['name']) is not None):
-                    add_it = True
-                else:
-                    for c in p['cmdline']:
-                        if (re.search(amp_value.regex(), c) is not None):
-                            add_it = True
-                            break
-                if add_it:
-                    ret.append({'pid': p['pid'],
-                                'cpu_percent': p['cpu_percent'],
-                                'memory_percent': p['memory_percent']})
-
-        except (TypeError, KeyError) as e:
-            logger.debug("Can not build AMPS list ({})".format(e))
+        regex = amp_value.regex()
+        if isinstance(regex, list):
+            regex = ','.join(regex)
+        return regex
+
+    def _build_amps_list(self, amp_name, processes):
+        """Return the AMPS process list of the AMP.
 
+        processes: dict {pid: process stats}
+        """
+        ret = []
+        for pid in sorted(self.matcher.get(amp_name)):
+            if pid not in processes:
+                continue
+            p = processes[pid]
+            ret.append({'pid': p['pid'],
+                        'cpu_percent': p['cpu_percent'],
+                        'memory_percent': p['memory_percent']})
         return ret
 
     def getList(self):
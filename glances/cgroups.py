@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Read the containers stats from the cgroup (v1 and v2) hierarchies (Linux only)."""
+
+import os
+import re
+
+from glances.compat import iteritems, itervalues, listkeys
+from glances.logger import logger
+
+import psutil
+
+# Key of the cgroup v2 (unified) hierarchy
+UNIFIED = ''
+
+# Container id and Kubernetes pod uid in a cgroup path
+CONTAINER_RE = re.compile(r'([0-9a-f]{64})')
+POD_RE = re.compile(r'pod([0-9a-f]{8}[-_][0-9a-f]{4}[-_][0-9a-f]{4}[-_][0-9a-f]{4}[-_][0-9a-f]{12})')
+
+
+def read_file(file_name):
+    """Return the content of the file or None if it can not be read."""
+    try:
+        with open(file_name, 'r') as f:
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+
+def cgroup_mounts(mountinfo='/proc/self/mountinfo'):
+    """Return the mounted cgroup hierarchies.
+
+    Output: a dict {controller: (root, mount point)}
+    The cgroup v2 hierarchy is stored with the UNIFIED controller.
+    """
+    ret = {}
+    data = read_file(mountinfo)
+    if data is None:
+        return ret
+    for line in data.splitlines():
+        # 36 25 0:31 / /sys/fs/cgroup/memory rw,nosuid - cgroup cgroup rw,memory
+        fields = line.split()
+        try:
+            sep = fields.index('-')
+            fstype = fields[sep + 1]
+            root, mount_point, options = fields[3], fields[4], fields[sep + 3]
+        except (ValueError, IndexError):
+            continue
+        if fstype == 'cgroup2':
+            ret.setdefault(UNIFIED, (root, mount_point))
+        elif fstype == 'cgroup':
+            for controller in options.split(','):
+                ret.setdefault(controller, (root, mount_point))
+    return ret
+
+
+def pid_cgroups(pid):
+    """Return the cgroups of the given process.
+
+    Output: a dict {controller: cgroup path}, None if the process is gone
+    """
+    data = read_file('/proc/{}/cgroup'.format(pid))
+    if data is None:
+        return None
+    ret = {}
+    for line in data.splitlines():
+        # 4:memory:/docker/<id> (v1) or 0::/system.slice/docker-<id>.scope (v2)
+        fields = line.split(':', 2)
+        if len(fields) != 3:
+            continue
+        if fields[1] == '':
+            ret[UNIFIED] = fields[2]
+        else:
+            for controller in fields[1].split(','):
+                ret[controller] = fields[2]
+    return ret
+
+
+def read_keys(data):
+    """Return the {key: int value} dict of a flat keyed file (cpu.stat, memory.stat...)."""
+    ret = {}
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[1].isdigit():
+            ret[fields[0]] = int(fields[1])
+    return ret
+
+
+class GlancesCgroups(object):
+
+    """Read the stats of the containers from the cgroup hierarchies.
+
+    The stats of all the containers are read in one pass (update method).
+    They are returned with the layout of the Docker API stats, so they can
+    be used as a drop-in replacement of the Docker stats stream.
+    """
+
+    def __init__(self):
+        self.mounts = cgroup_mounts()
+        self.clk_tck = os.sysconf(os.sysconf_names['SC_CLK_TCK'])
+        self.nb_cpus = psutil.cpu_count()
+        self.mem_total = psutil.virtual_memory().total
+        # Cgroup folders of the containers: {container id: (pid, {controller: folder})}
+        self.folders = {}
+
+    def available(self):
+        """Return True if the cgroup hierarchies are readable."""
+        return 'cpuacct' in self.mounts or UNIFIED in self.mounts
+
+    def get_folders(self, container_id, pid):
+        """Return the cgroup folders of the container (cached)."""
+        if container_id in self.folders and self.folders[container_id][0] == pid:
+            return self.folders[container_id][1]
+        cgroups = pid_cgroups(pid)
+        if cgroups is None:
+            return {}
+        folders = {}
+        for controller, path in iteritems(cgroups):
+            if controller not in self.mounts:
+                continue
+            root, mount_point = self.mounts[controller]
+            if root != '/' and path.startswith(root):
+                path = path[len(root):]
+            folders[controller] = os.path.join(mount_point, path.lstrip('/'))
+        self.folders[container_id] = (pid, folders)
+        return folders
+
+    def system_cpu_usage(self):
+        """Return the host CPU time (in nanoseconds, as the Docker API)."""
+        data = read_file('/proc/stat')
+        if data is None:
+            return None
+        # cpu user nice system idle iowait irq softirq steal guest guest_nice
+        ticks = sum(int(i) for i in data.splitlines()[0].split()[1:9])
+        return ticks * 10 ** 9 // self.clk_tck
+
+    def update(self, containers):
+        """Read the stats of the containers.
+
+        Input: a dict {container id: pid of the container main process}
+        Output: a dict {container id: stats (Docker API layout)}
+        """
+        # Forget the removed containers
+        for container_id in listkeys(self.folders):
+            if container_id not in containers:
+                del self.folders[container_id]
+
+        system = self.system_cpu_usage()
+        ret = {}
+        for container_id, pid in iteritems(containers):
+            if not pid:
+                continue
+            folders = self.get_folders(container_id, pid)
+            if not folders:
+                continue
+            stats = {}
+            if 'cpuacct' in folders:
+                stats.update(self.read_v1(folders))
+            elif UNIFIED in folders:
+                stats.update(self.read_v2(folders[UNIFIED]))
+            if 'cpu_stats' in stats:
+                stats['cpu_stats']['system_cpu_usage'] = system
+                stats['cpu_stats']['online_cpus'] = self.nb_cpus
+            stats['networks'] = self.read_net(pid)
+            ret[container_id] = stats
+        return ret
+
+    def read_v1(self, folders):
+        """Read the stats of a cgroup v1 container."""
+        ret = {}
+        data = read_file(os.path.join(folders['cpuacct'], 'cpuacct.usage'))
+        if data is not None:
+            ret['cpu_stats'] = {'cpu_usage': {'total_usage': int(data)}}
+
+        if 'memory' in folders:
+            memory = {}
+            for key, file_name in [('usage', 'memory.usage_in_bytes'),
+                                   ('limit', 'memory.limit_in_bytes'),
+                                   ('max_usage', 'memory.max_usage_in_bytes')]:
+                data = read_file(os.path.join(folders['memory'], file_name))
+                if data is not None:
+                    memory[key] = int(data)
+            if 'limit' in memory:
+                # No limit: 9223372036854771712
+                memory['limit'] = min(memory['limit'], self.mem_total)
+            ret['memory_stats'] = memory
+
+        if 'blkio' in folders:
+            data = read_file(os.path.join(folders['blkio'], 'blkio.throttle.io_service_bytes_recursive'))
+            if data is None:
+                data = read_file(os.path.join(folders['blkio'], 'blkio.throttle.io_service_bytes'))
+            if data is not None:
+                # 8:0 Read 4096
+                io = {'Read': 0, 'Write': 0}
+                for line in data.splitlines():
+                    fields = line.split()
+                    if len(fields) == 3 and fields[1] in io:
+                        io[fields[1]] += int(fields[2])
+                ret['blkio_stats'] = self.blkio_stats(io['Read'], io['Write'])
+        return ret
+
+    def read_v2(self, folder):
+        """Read the stats of a cgroup v2 container."""
+        ret = {}
+        data = read_file(os.path.join(folder, 'cpu.stat'))
+        if data is not None:
+            usage = read_keys(data).get('usage_usec')
+            if usage is not None:
+                ret['cpu_stats'] = {'cpu_usage': {'total_usage': usage * 1000}}
+
+        memory = {}
+        data = read_file(os.path.join(folder, 'memory.current'))
+        if data is not None:
+            memory['usage'] = int(data)
+            data = read_file(os.path.join(folder, 'memory.max'))
+            if data is None or data.strip() == 'max':
+                memory['limit'] = self.mem_total
+            else:
+                memory['limit'] = min(int(data), self.mem_total)
+            # Only available since Linux 5.19
+            data = read_file(os.path.join(folder, 'memory.peak'))
+            if data is not None:
+                memory['max_usage'] = int(data)
+            ret['memory_stats'] = memory
+
+        data = read_file(os.path.join(folder, 'io.stat'))
+        if data is not None:
+            # 8:0 rbytes=4096 wbytes=0 rios=1 wios=0 dbytes=0 dios=0
+            io = {'rbytes': 0, 'wbytes': 0}
+            for line in data.splitlines():
+                for field in line.split()[1:]:
+                    key, _, value = field.partition('=')
+                    if key in io:
+                        io[key] += int(value)
+            ret['blkio_stats'] = self.blkio_stats(io['rbytes'], io['wbytes'])
+        return ret
+
+    @staticmethod
+    def blkio_stats(read, write):
+        """Return the IO stats with the Docker API layout."""
+        return {'io_service_bytes_recursive': [{'op': 'Read', 'value': read},
+                                               {'op': 'Write', 'value': write}]}
+
+    @staticmethod
+    def read_net(pid):
+        """Return the network stats of the process network namespace.
+
+        Output: a dict {interface: {'rx_bytes': ..., 'tx_bytes': ...}}
+        """
+        ret = {}
+        data = read_file('/proc/{}/net/dev'.format(pid))
+        if data is None:
+            logger.debug("Cannot read the network stats of process {}".format(pid))
+            return ret
+        # The two first lines are the header
+        for line in data.splitlines()[2:]:
+            interface, _, counters = line.partition(':')
+            interface = interface.strip()
+            counters = counters.split()
+            if interface == 'lo' or len(counters) < 9:
+                continue
+            ret[interface] = {'rx_bytes': int(counters[0]),
+                              'tx_bytes': int(counters[8])}
+        return ret
+
+
+def cgroup_container(path):
+    """Return the (container id, pod uid) of a cgroup path.
+
+    /docker/<id>
+    /system.slice/docker-<id>.scope
+    /kubepods/burstable/pod<uid>/<id>
+    /kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod<uid>.slice/cri-containerd-<id>.scope
+    """
+    containers = CONTAINER_RE.findall(path)
+    if not containers:
+        return None, None
+    pod = POD_RE.search(path)
+    return containers[-1], pod.group(1).replace('_', '-') if pod else None
+
+
+class GlancesPidContainers(object):
+
+    """Map the processes to their container and pod.
+
+    The /proc/<pid>/cgroup file is only read once per process lifetime
+    (a process is identified by its pid and its creation time).
+    """
+
+    def __init__(self):
+        # {(pid, create time): (container id, pod uid)}
+        self.cache = {}
+
+    def get(self, pid, create_time=None):
+        """Return the (container id, pod uid) of the process (None, None for the host)."""
+        key = (pid, create_time)
+        if key not in self.cache:
+            cgroups = pid_cgroups(pid) or {}
+            self.cache[key] = (None, None)
+            for path in itervalues(cgroups):
+                container = cgroup_container(path)
+                if container[0] is not None:
+                    self.cache[key] = container
+                    break
+        return self.cache[key]
+
+    def prune(self, keys):
+        """Forget the processes not in the (pid, create time) keys list."""
+        for key in listkeys(self.cache):
+            if key not in keys:
+                del self.cache[key]
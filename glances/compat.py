@@ -32,6 +32,10 @@ import os
 
 from glances.logger import logger
 
+# NumPy is optional (used to speed up the time series subsampling and the
+# per CPU stats): it is only imported when needed (see get_numpy)
+_numpy = []
+
 PY3 = sys.version_info[0] == 3
 
 if PY3:
@@ -50,6 +54,7 @@ if PY3:
 
     text_type = str
     binary_type = bytes
+    string_types = (str,)
     bool_type = bool
     long = int
 
@@ -136,6 +141,7 @@ else:
 
     text_type = unicode
     binary_type = str
+    string_types = (str, unicode)
     bool_type = types.BooleanType
     long = long
 
@@ -207,6 +213,17 @@ else:
 # Globals functions for both Python 2 and 3
 
 
+def get_numpy():
+    """Return the NumPy module (imported on the first call) or None if not installed."""
+    if not _numpy:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy.append(numpy)
+    return _numpy[0]
+
+
 def subsample(data, sampling):
     """Compute a simple mean subsampling.
 
@@ -231,10 +248,69 @@ def time_serie_subsample(data, sampling):
         return data
     t = [t[0] for t in data]
     v = [t[1] for t in data]
-    sampling_length = int(round(len(data) / float(sampling)))
-    t_subsampled = [t[s * sampling_length:(s + 1) * sampling_length][0] for s in range(0, sampling)]
-    v_subsampled = [mean(v[s * sampling_length:(s + 1) * sampling_length]) for s in range(0, sampling)]
-    return list(zip(t_subsampled, v_subsampled))
+    # Start index of the buckets
+    starts = [len(data) * s // sampling for s in range(0, sampling)]
+    np = get_numpy()
+    if np is not None:
+        try:
+            v = np.asarray(v, dtype=float)
+        except (TypeError, ValueError):
+            pass
+        else:
+            sums = np.add.reduceat(v, starts)
+            sizes = np.diff(starts + [len(data)])
+            return list(zip([t[s] for s in starts], (sums / sizes).tolist()))
+    ends = starts[1:] + [len(data)]
+    return [(t[s], mean(v[s:e])) for s, e in zip(starts, ends)]
+
+
+def time_serie_lttb(data, threshold):
+    """Compute a Largest-Triangle-Three-Buckets subsampling.
+
+    Unlike the mean subsampling, the LTTB algorithm keeps the peaks of the
+    time serie (visually faithful). Data should be a list of set (time, value)
+    with a datetime time.
+
+    Return a subsampled list of threshold lenght
+    """
+    n = len(data)
+    if threshold >= n or threshold < 3:
+        return data
+    try:
+        x = [(d[0] - data[0][0]).total_seconds() for d in data]
+        y = [float(d[1]) for d in data]
+    except (TypeError, ValueError):
+        return time_serie_subsample(data, threshold)
+    np = get_numpy()
+    if np is not None:
+        x = np.asarray(x)
+        y = np.asarray(y)
+
+    every = (n - 2) / float(threshold - 2)
+    sampled = [data[0]]
+    a = 0
+    for i in range(0, threshold - 2):
+        # Average point of the next bucket
+        avg_start = min(int(i * every + every) + 1, n - 1)
+        avg_end = max(min(int(i * every + 2 * every) + 1, n), avg_start + 1)
+        # Current bucket
+        start = int(i * every) + 1
+        end = int(i * every + every) + 1
+        if np is not None:
+            avg_x = x[avg_start:avg_end].mean()
+            avg_y = y[avg_start:avg_end].mean()
+            areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                           (x[a] - x[start:end]) * (avg_y - y[a]))
+            a = start + int(areas.argmax())
+        else:
+            avg_x = mean(x[avg_start:avg_end])
+            avg_y = mean(y[avg_start:avg_end])
+            a = max(range(start, end),
+                    key=lambda j: abs((x[a] - avg_x) * (y[j] - y[a]) -
+                                      (x[a] - x[j]) * (avg_y - y[a])))
+        sampled.append(data[a])
+    sampled.append(data[-1])
+    return sampled
 
 
 def to_fahrenheit(celsius):
@@ -19,18 +19,151 @@
 
 """CPU percent stats shared between CPU and Quicklook plugins."""
 
+import glob
+import os
+
+from glances.compat import get_numpy
+from glances.globals import LINUX
+from glances.procfs import procfs
 from glances.timer import Timer
 
-import psutil
+# Per CPU stats (if available)
+PERCPU_FIELDS = ['user', 'system', 'idle', 'nice', 'iowait',
+                 'irq', 'softirq', 'steal', 'guest', 'guest_nice']
+
+# Width (in percent) of the CPU usage histogram buckets
+HISTOGRAM_STEP = 10
+
+
+def cpu_total_time(times):
+    """Return the total CPU time (the guest times are already in the user and nice times on Linux)."""
+    total = sum(times)
+    if LINUX:
+        total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    return total
+
+
+def cpu_times_percent(last, current):
+    """Return the CPU times percent between the two CPU times (as psutil.cpu_times_percent).
+
+    Output: a dict {field: percent}
+    """
+    deltas = [max(0, c - l) for l, c in zip(last, current)]
+    all_delta = cpu_total_time(type(current)(*deltas))
+    # The CPU times are in seconds: only a null delta is not scaled
+    scale = 100.0 / all_delta if all_delta > 0 else 0.0
+    return dict((field, min(max(0.0, round(delta * scale, 1)), 100.0))
+                for field, delta in zip(current._fields, deltas))
+
+
+def cpu_busy_percent(last, current):
+    """Return the CPU usage percent between the two CPU times (as psutil.cpu_percent)."""
+    busy = [cpu_total_time(t) - t.idle - getattr(t, 'iowait', 0) for t in (last, current)]
+    if busy[1] <= busy[0]:
+        return 0.0
+    all_delta = cpu_total_time(current) - cpu_total_time(last)
+    return round(min(100.0, 100.0 * (busy[1] - busy[0]) / all_delta), 1)
+
+
+def parse_cpulist(data):
+    """Return the CPU numbers of a sysfs CPU list (for example 0-3,8-11)."""
+    ret = []
+    for item in data.strip().split(','):
+        if '-' in item:
+            first, last = item.split('-')
+            ret += range(int(first), int(last) + 1)
+        elif item:
+            ret.append(int(item))
+    return ret
+
+
+def cpu_topology(cpu_ids, root='/sys'):
+    """Return the socket (physical package) and the NUMA node of the CPUs.
+
+    Output: two lists (sockets, nodes) with one item per CPU (0 if unknown)
+    """
+    sockets = []
+    for cpu in cpu_ids:
+        try:
+            with open(os.path.join(root, 'devices', 'system', 'cpu', 'cpu{}'.format(cpu),
+                                   'topology', 'physical_package_id'), 'r') as f:
+                # -1 on some virtual machines
+                sockets.append(max(int(f.read()), 0))
+        except (IOError, OSError, ValueError):
+            sockets.append(0)
+    nodes = {}
+    for path in glob.glob(os.path.join(root, 'devices', 'system', 'node', 'node*', 'cpulist')):
+        try:
+            node = int(os.path.basename(os.path.dirname(path))[4:])
+            with open(path, 'r') as f:
+                for cpu in parse_cpulist(f.read()):
+                    nodes[cpu] = node
+        except (IOError, OSError, ValueError):
+            continue
+    return sockets, [nodes.get(cpu, 0) for cpu in cpu_ids]
+
+
+def percpu_groups(percpu, name):
+    """Return the average stats of the CPUs per group (name is socket or node).
+
+    Input: the per CPU stats (list of dict)
+    """
+    groups = {}
+    for cpu in percpu:
+        groups.setdefault(cpu.get(name, 0), []).append(cpu)
+    ret = []
+    for group in sorted(groups):
+        cpus = groups[group]
+        stat = dict((k, round(sum(cpu[k] for cpu in cpus) / len(cpus), 1))
+                    for k in cpus[0] if k in ['total'] + PERCPU_FIELDS)
+        stat.update({name: group, 'cpus': len(cpus)})
+        ret.append(stat)
+    return ret
+
+
+def percpu_histogram(percpu, step=HISTOGRAM_STEP):
+    """Return the number of CPUs per usage (total) bucket of <step> percent.
+
+    Input: the per CPU stats (list of dict)
+    """
+    buckets = 100 // step
+    ret = [0] * buckets
+    for cpu in percpu:
+        ret[min(int(cpu['total'] // step), buckets - 1)] += 1
+    return ret
 
 
 class CpuPercent(object):
 
-    """Get and store the CPU percent."""
+    """Get and store the CPU percent.
 
-    def __init__(self, cached_time=1):
+    The per CPU stats are stored as a matrix (one row per CPU, one column
+    per stat) computed with NumPy if available. Summaries (per socket and
+    per NUMA node, busiest CPUs and CPU usage histogram) are computed from
+    this matrix for the hosts with many CPUs.
+    """
+
+    def __init__(self, cached_time=1, kernel_stats=None, sys_root='/sys'):
+        """Init the CPU percent.
+
+        kernel_stats: GlancesProcFS instance (default: the one shared between plugins)
+        sys_root: root of the sysfs file system (CPU topology)
+        """
+        self.kernel_stats = procfs if kernel_stats is None else kernel_stats
+        self.sys_root = sys_root
         self.cpu_percent = 0
+        self.cpu_times_percent = {}
         self.percpu_percent = []
+        # CPU times at the last update
+        self.cpu_times = None
+        self.percpu_times = None
+        # Per CPU stats matrix (CPU x percpu_keys) and CPU topology
+        # The CPU numbers are the kernel ones (the offline CPUs are not listed)
+        self.percpu_keys = []
+        self.percpu_matrix = []
+        self.cpu_ids = []
+        self.sockets = []
+        self.nodes = []
 
         # cached_time is the minimum time interval between stats updates
         # since last update is passed (will retrieve old cached info instead)
@@ -43,53 +176,154 @@ class CpuPercent(object):
         return 'cpu_number'
 
     def get(self, percpu=False):
-        """Update and/or return the CPU using the psutil library.
+        """Update and/or return the CPU using the kernel stats.
         If percpu, return the percpu stats"""
         if percpu:
             return self.__get_percpu()
         else:
             return self.__get_cpu()
 
+    def get_times_percent(self):
+        """Update and/or return the CPU times percent (dict {field: percent})."""
+        self.__get_cpu()
+        return self.cpu_times_percent
+
+    def get_busiest(self, number):
+        """Update and/or return the per CPU stats of the <number> busiest CPUs (highest total first)."""
+        self.__get_percpu()
+        return self.__busiest(number)
+
+    def __busiest(self, number):
+        """Return the per CPU stats of the <number> busiest CPUs."""
+        np = get_numpy()
+        if np is None or not self.percpu_percent:
+            return sorted(self.percpu_percent, key=lambda cpu: cpu['total'], reverse=True)[:number]
+        # Stable sort (same order as sorted)
+        order = np.argsort(-self.percpu_matrix[:, 0], kind='mergesort')[:number].tolist()
+        return [self.percpu_percent[i] for i in order]
+
+    def get_summary(self, top=4):
+        """Update and/or return the per CPU stats summary.
+
+        Output: a dict with the keys:
+        - cpus: number of CPUs
+        - top: per CPU stats of the <top> busiest CPUs
+        - sockets, nodes: average stats per socket and per NUMA node (list of dict)
+        - histogram: number of CPUs per usage bucket (0-10%, 10-20%... 90-100%)
+        """
+        return {'cpus': len(self.__get_percpu()),
+                'top': self.__busiest(top),
+                'sockets': self.__groups('socket', self.sockets),
+                'nodes': self.__groups('node', self.nodes),
+                'histogram': self.__histogram()}
+
+    def __groups(self, name, groups):
+        """Return the average stats of the CPUs per group (socket or node)."""
+        np = get_numpy()
+        if np is None or not self.percpu_percent:
+            return percpu_groups(self.percpu_percent, name)
+        ids, inverse = np.unique(np.asarray(groups), return_inverse=True)
+        counts = np.bincount(inverse)
+        means = np.column_stack([np.round(np.bincount(inverse, weights=column) / counts, 1)
+                                 for column in self.percpu_matrix.T])
+        ret = []
+        for group, count, row in zip(ids.tolist(), counts.tolist(), means.tolist()):
+            stat = dict(zip(self.percpu_keys, row))
+            stat.update({name: group, 'cpus': count})
+            ret.append(stat)
+        return ret
+
+    def __histogram(self):
+        """Return the number of CPUs per usage bucket."""
+        np = get_numpy()
+        if np is None or not self.percpu_percent:
+            return percpu_histogram(self.percpu_percent)
+        # The last bucket includes 100%
+        return np.histogram(self.percpu_matrix[:, 0], bins=100 // HISTOGRAM_STEP, range=(0, 100))[0].tolist()
+
     def __get_cpu(self):
-        """Update and/or return the CPU using the psutil library."""
+        """Update and/or return the CPU using the kernel stats."""
         # Never update more than 1 time per cached_time
         if self.timer_cpu.finished():
-            self.cpu_percent = psutil.cpu_percent(interval=0.0)
+            cpu_times = self.kernel_stats.cpu_times()
+            if self.cpu_times is None:
+                # First update: percent since the boot
+                self.cpu_times = type(cpu_times)(*[0] * len(cpu_times))
+            self.cpu_percent = cpu_busy_percent(self.cpu_times, cpu_times)
+            self.cpu_times_percent = cpu_times_percent(self.cpu_times, cpu_times)
+            self.cpu_times = cpu_times
             # Reset timer for cache
             self.timer_cpu = Timer(self.cached_time)
         return self.cpu_percent
 
+    def __percpu_matrix(self, percpu_times):
+        """Return the per CPU stats matrix (total first, then the PERCPU_FIELDS percents)."""
+        np = get_numpy()
+        fields = percpu_times[0]._fields
+        columns = [fields.index(f) for f in PERCPU_FIELDS if f in fields]
+        idle = [PERCPU_FIELDS[i] for i in range(len(PERCPU_FIELDS))
+                if PERCPU_FIELDS[i] in fields].index('idle')
+        if np is not None:
+            current = np.array(percpu_times, dtype=np.float64)
+            last = self.percpu_times
+            if last is None or last.shape != current.shape:
+                # First update (or CPU hotplug): percent since the boot
+                last = np.zeros_like(current)
+            self.percpu_times = current
+            # Same computation as cpu_times_percent, for all the CPUs at once
+            deltas = np.maximum(current - last, 0)
+            all_delta = deltas.sum(axis=1)
+            if LINUX:
+                for field in ['guest', 'guest_nice']:
+                    if field in fields:
+                        all_delta -= deltas[:, fields.index(field)]
+            scale = np.divide(100.0, all_delta, out=np.zeros_like(all_delta), where=all_delta > 0)
+            percents = np.clip(np.round(deltas * scale[:, np.newaxis], 1), 0.0, 100.0)[:, columns]
+            # No busy time for the CPUs without delta
+            total = np.where(all_delta > 0, np.round(100 - percents[:, idle], 1), 0.0)
+            return np.column_stack((total, percents))
+        last = self.percpu_times
+        if last is None or len(last) != len(percpu_times):
+            last = [type(t)(*[0] * len(t)) for t in percpu_times]
+        self.percpu_times = percpu_times
+        ret = []
+        for l, c in zip(last, percpu_times):
+            cputimes = cpu_times_percent(l, c)
+            row = [cputimes[fields[i]] for i in columns]
+            # No busy time for the CPUs without delta (all the percents are null)
+            ret.append([round(100 - row[idle], 1) if any(row) else 0.0] + row)
+        return ret
+
     def __get_percpu(self):
-        """Update and/or return the per CPU list using the psutil library."""
+        """Update and/or return the per CPU list using the kernel stats."""
         # Never update more than 1 time per cached_time
         if self.timer_percpu.finished():
+            percpu_times = self.kernel_stats.cpu_times(percpu=True)
+            cpu_ids = self.kernel_stats.cpu_ids()
+            if len(cpu_ids) != len(percpu_times):
+                # CPU times and numbers not read from the same source
+                cpu_ids = list(range(len(percpu_times)))
+            if cpu_ids != self.cpu_ids:
+                # CPU topology (read again on CPU hotplug)
+                self.cpu_ids = cpu_ids
+                self.sockets, self.nodes = cpu_topology(cpu_ids, root=self.sys_root)
+            if percpu_times:
+                fields = percpu_times[0]._fields
+                self.percpu_keys = ['total'] + [f for f in PERCPU_FIELDS if f in fields]
+                self.percpu_matrix = self.__percpu_matrix(percpu_times)
+            else:
+                self.percpu_matrix = []
+            rows = self.percpu_matrix.tolist() if hasattr(self.percpu_matrix, 'tolist') else self.percpu_matrix
             self.percpu_percent = []
-            for cpu_number, cputimes in enumerate(psutil.cpu_times_percent(interval=0.0, percpu=True)):
-                cpu = {'key': self.get_key(),
-                       'cpu_number': cpu_number,
-                       'total': round(100 - cputimes.idle, 1),
-                       'user': cputimes.user,
-                       'system': cputimes.system,
-                       'idle': cputimes.idle}
-                # The following stats are for API purposes only
-                if hasattr(cputimes, 'nice'):
-                    cpu['nice'] = cputimes.nice
-                if hasattr(cputimes, 'iowait'):
-                    cpu['iowait'] = cputimes.iowait
-                if hasattr(cputimes, 'irq'):
-                    cpu['irq'] = cputimes.irq
-                if hasattr(cputimes, 'softirq'):
-                    cpu['softirq'] = cputimes.softirq
-                if hasattr(cputimes, 'steal'):
-                    cpu['steal'] = cputimes.steal
-                if hasattr(cputimes, 'guest'):
-                    cpu['guest'] = cputimes.guest
-                if hasattr(cputimes, 'guest_nice'):
-                    cpu['guest_nice'] = cputimes.guest_nice
-                # Append new CPU to the list
+            for i, row in enumerate(rows):
+                cpu = dict(zip(self.percpu_keys, row))
+                cpu.update({'key': self.get_key(),
+                            'cpu_number': self.cpu_ids[i],
+                            'socket': self.sockets[i],
+                            'node': self.nodes[i]})
                 self.percpu_percent.append(cpu)
-                # Reset timer for cache
-                self.timer_percpu = Timer(self.cached_time)
+            # Reset timer for cache
+            self.timer_percpu = Timer(self.cached_time)
         return self.percpu_percent
 
 
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Asyncio Docker stats collector (Python 3.5 or higher)."""
+
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+from collections import deque
+
+from glances.logger import logger
+
+# Default Docker daemon socket
+DOCKER_HOST = 'unix:///var/run/docker.sock'
+
+
+class GlancesDockerAsync(object):
+
+    """Fetch the stats of the containers with the Docker API (stats?stream=false).
+
+    The requests are sent by an asyncio loop (running in one thread) over a
+    pool of at most <concurrency> keep-alive connections: the cost depends on
+    the concurrency and not on the number of containers.
+
+    The update method waits at most <deadline> seconds. The containers not
+    fetched in time keep their last (stale) stats, the requests go on in
+    background and are used at the next refresh.
+
+    The stats dict is only written by the loop thread, and always replaced by
+    a new dict (single assignment): the update method reads a consistent
+    snapshot without lock.
+    """
+
+    def __init__(self, url=None, concurrency=16, deadline=1.0, timeout=10.0):
+        """Init the collector.
+
+        url: Docker daemon URL (unix:///path or tcp://host:port), default DOCKER_HOST
+        concurrency: max number of requests (and connections) at the same time
+        deadline: max time (in seconds) spent in the update method
+        timeout: max time (in seconds) of one request
+        """
+        self.url = url or os.environ.get('DOCKER_HOST', DOCKER_HOST)
+        self.concurrency = max(int(concurrency), 1)
+        self.deadline = deadline
+        self.timeout = timeout
+
+        # Last stats of the containers: {container id: stats} (never modified in place)
+        self.stats = {}
+        # Idle connections: list of (reader, writer)
+        self.connections = []
+        # Current collect (concurrent.futures.Future)
+        self.future = None
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='glances-docker-async')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def exit(self):
+        """Close the connections and stop the loop."""
+        for _, writer in self.connections:
+            self.loop.call_soon_threadsafe(writer.close)
+        self.connections = []
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(1)
+
+    def update(self, containers):
+        """Fetch the stats of the containers.
+
+        Input: list of containers id
+        Output: a dict {container id: stats (Docker API layout)}
+        """
+        if self.future is None or self.future.done():
+            # Do not start a new collect while the previous one is running
+            self.future = asyncio.run_coroutine_threadsafe(self.collect(containers), self.loop)
+        try:
+            self.future.result(timeout=self.deadline)
+        except concurrent.futures.TimeoutError:
+            logger.debug("docker plugin - Stats of some containers not fetched in {} seconds, use the previous ones".format(
+                self.deadline))
+        except Exception as e:
+            logger.debug("docker plugin - Cannot fetch the containers stats ({})".format(e))
+
+        stats = self.stats
+        return {container_id: stats[container_id] for container_id in containers
+                if container_id in stats}
+
+    async def collect(self, containers):
+        """Fetch the stats of the containers (at most concurrency requests at the same time)."""
+        # Forget the removed containers
+        alive = set(containers)
+        self.stats = {container_id: s for container_id, s in self.stats.items()
+                      if container_id in alive}
+        queue = deque(containers)
+        workers = [self.worker(queue) for _ in range(min(self.concurrency, len(queue)))]
+        if workers:
+            await asyncio.gather(*workers)
+
+    async def worker(self, queue):
+        """Fetch the stats of the queued containers, one at a time."""
+        while queue:
+            container_id = queue.popleft()
+            try:
+                container_stats = await asyncio.wait_for(
+                    self.get('/containers/{}/stats?stream=false&one-shot=true'.format(container_id)),
+                    self.timeout)
+            except Exception as e:
+                logger.debug("docker plugin - Cannot fetch the stats of container {} ({})".format(container_id[:12], e))
+            else:
+                stats = dict(self.stats)
+                stats[container_id] = container_stats
+                self.stats = stats
+
+    async def connect(self):
+        """Open a new connection to the Docker daemon."""
+        if self.url.startswith('unix://'):
+            return await asyncio.open_unix_connection(self.url[len('unix://'):])
+        host, _, port = self.url.split('://')[-1].rpartition(':')
+        return await asyncio.open_connection(host, int(port))
+
+    async def get(self, path):
+        """Send a GET request and return the decoded JSON body.
+
+        The connection is put back in the pool only if the response was read
+        completely (a cancelled request closes its connection).
+        """
+        if self.connections:
+            reader, writer = self.connections.pop()
+        else:
+            reader, writer = await self.connect()
+        try:
+            writer.write('GET {} HTTP/1.1\r\nHost: docker\r\n\r\n'.format(path).encode('ascii'))
+            status = await reader.readline()
+            if not status:
+                raise ConnectionError('connection closed by the Docker daemon')
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                key, _, value = line.decode('latin-1').partition(':')
+                headers[key.strip().lower()] = value.strip().lower()
+
+            if headers.get('transfer-encoding') == 'chunked':
+                body = b''
+                while True:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                    chunk = await reader.readexactly(size + 2)
+                    if size == 0:
+                        break
+                    body += chunk[:-2]
+            else:
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get('connection') == 'close':
+            writer.close()
+        else:
+            self.connections.append((reader, writer))
+
+        code = status.split()[1]
+        if code != b'200':
+            raise ValueError('HTTP {}'.format(code.decode('ascii')))
+        return json.loads(body.decode('utf-8'))
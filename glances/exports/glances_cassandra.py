@@ -20,6 +20,7 @@
 """Cassandra/Scylla interface class."""
 
 import sys
+from collections import deque
 from datetime import datetime
 from numbers import Number
 
@@ -62,9 +63,21 @@ class Export(GlancesExport):
         if not self.export_enable:
             sys.exit(2)
 
+        # Max number of pending asynchronous writes
+        self.max_inflight = self.config.get_int_value('cassandra', 'max_inflight', default=32)
+
         # Init the Cassandra client
         self.cluster, self.session = self.init()
 
+        # The insert statement is prepared once
+        self.query = self.session.prepare(
+            "INSERT INTO {} (plugin, time, stat) VALUES (?, ?, ?)".format(self.table))
+
+        # Asynchronous writes (bounded by max_inflight)
+        # The plugin is the partition key: one write per plugin instead of a
+        # multi-partition batch
+        self.inflight = deque()
+
     def init(self):
         """Init the connection to the Cassandra server."""
         if not self.export_enable:
@@ -111,19 +124,42 @@ class Export(GlancesExport):
         logger.debug("Export {} stats to Cassandra".format(name))
 
         # Remove non number stats and convert all to float (for Boolean)
-        data = {k: float(v) for (k, v) in dict(zip(columns, points)).iteritems() if isinstance(v, Number)}
+        data = {k: float(v) for (k, v) in iteritems(dict(zip(columns, points))) if isinstance(v, Number)}
+        values = (name, uuid_from_time(self.export_time or datetime.now()), data)
+
+        return self._execute_async(self.query, values)
 
-        # Write input to the Cassandra table
+    def _execute_async(self, query, values=None):
+        """Write the query asynchronously.
+
+        Wait for the oldest write if max_inflight writes are pending.
+        Return False if a write failed.
+        """
+        ret = True
+        if len(self.inflight) >= self.max_inflight:
+            ret = self._wait(self.inflight.popleft())
         try:
+            self.inflight.append(self.session.execute_async(query, values))
+        except Exception as e:
+            logger.error("Cannot export stats to Cassandra ({})".format(e))
+            return False
+        return ret
 
-            stmt = "INSERT INTO {} (plugin, time, stat) VALUES (?, ?, ?)".format(self.table)
-            query = self.session.prepare(stmt)
-            self.session.execute(
-                query,
-                (name, uuid_from_time(datetime.now()), data)
-            )
+    def _wait(self, future):
+        """Wait for an asynchronous write. Return False if it failed."""
+        try:
+            future.result()
         except Exception as e:
-            logger.error("Cannot export {} stats to Cassandra ({})".format(name, e))
+            logger.error("Cannot export stats to Cassandra ({})".format(e))
+            return False
+        return True
+
+    def flush(self):
+        """Wait for the pending writes."""
+        ret = True
+        while self.inflight:
+            ret = self._wait(self.inflight.popleft()) and ret
+        return ret
 
     def exit(self):
         """Close the Cassandra export module."""
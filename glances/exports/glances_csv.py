@@ -27,6 +27,7 @@ import time
 from glances.compat import PY3, iterkeys, itervalues
 from glances.logger import logger
 from glances.exports.glances_export import GlancesExport
+from glances.rotating_file import GlancesRotatingFile, rotating_file_conf
 
 
 class Export(GlancesExport):
@@ -61,7 +62,9 @@ class Export(GlancesExport):
             self.csv_file.close()
 
         try:
-            self.csv_file = open_csv_file(self.csv_filename, file_mode)
+            # Buffered file with optional rotation (see the [csv] section)
+            self.csv_file = GlancesRotatingFile(self.csv_filename, file_mode,
+                                                **rotating_file_conf(config, 'csv'))
             self.writer = csv.writer(self.csv_file)
         except IOError as e:
             logger.critical("Cannot create the CSV file: {}".format(e))
@@ -71,7 +74,9 @@ class Export(GlancesExport):
 
         self.export_enable = True
 
-        self.first_line = True
+        # Header of the current CSV file (None for a new file)
+        # The union of the known columns: new columns are added at the end
+        self.header = self.old_header
 
     def exit(self):
         """Close the CSV file."""
@@ -84,50 +89,44 @@ class Export(GlancesExport):
         all_stats = stats.getAllExportsAsDict(plugin_list=self.plugins_to_export())
 
         # Init data with timestamp (issue#708)
-        if self.first_line:
-            csv_header = ['timestamp']
+        csv_header = ['timestamp']
         csv_data = [time.strftime('%Y-%m-%d %H:%M:%S')]
 
         # Loop over plugins to export
         for plugin in self.plugins_to_export():
             if isinstance(all_stats[plugin], list):
                 for stat in all_stats[plugin]:
-                    # First line: header
-                    if self.first_line:
-                        csv_header += ('{}_{}_{}'.format(
-                            plugin, self.get_item_key(stat), item) for item in stat)
-                    # Others lines: stats
+                    csv_header += ('{}_{}_{}'.format(
+                        plugin, self.get_item_key(stat), item) for item in stat)
                     csv_data += itervalues(stat)
             elif isinstance(all_stats[plugin], dict):
-                # First line: header
-                if self.first_line:
-                    fieldnames = iterkeys(all_stats[plugin])
-                    csv_header += ('{}_{}'.format(plugin, fieldname)
-                                   for fieldname in fieldnames)
-                # Others lines: stats
+                fieldnames = iterkeys(all_stats[plugin])
+                csv_header += ('{}_{}'.format(plugin, fieldname)
+                               for fieldname in fieldnames)
                 csv_data += itervalues(all_stats[plugin])
 
         # Export to CSV
-        # Manage header
-        if self.first_line:
-            if self.old_header is None:
-                # New file, write the header on top on the CSV file
-                self.writer.writerow(csv_header)
-            # File already exist, check if header are compatible
-            if self.old_header != csv_header:
-                # Header are differents, log an error and do not write data
-                logger.error("Cannot append data to existing CSV file. Headers are differents.")
-                logger.debug("Old header: {}".format(self.old_header))
-                logger.debug("New header: {}".format(csv_header))
-            else:
-                # Header are equals, ready to write data
-                self.old_header = None
-            # Only do this once
-            self.first_line = False
+        # Manage header: the columns are the union of all the known
+        # columns (blank value if a column is missing in the current stats)
+        if self.header is None:
+            # New file, write the header on top on the CSV file
+            self.header = csv_header
+            self.writer.writerow(self.header)
+        else:
+            known = set(self.header)
+            new_columns = [column for column in csv_header if column not in known]
+            if new_columns or self.csv_file.need_rotate():
+                # New columns (ex: a new network interface) or file too
+                # big/old: start a new file
+                if new_columns:
+                    logger.info("New CSV columns, rotate the CSV file")
+                    logger.debug("New columns: {}".format(new_columns))
+                    self.header = self.header + new_columns
+                self.csv_file.rotate()
+                self.writer.writerow(self.header)
         # Manage data
-        if self.old_header is None:
-            self.writer.writerow(csv_data)
-            self.csv_file.flush()
+        values = dict(zip(csv_header, csv_data))
+        self.writer.writerow([values.get(column, '') for column in self.header])
 
 
 def open_csv_file(file_name, file_mode):
@@ -24,9 +24,14 @@ I am your father...
 """
 
 import json
+import os
+import threading
+import time
 
 from glances.compat import NoOptionError, NoSectionError, iteritems, iterkeys
+from glances.config import user_cache_dir
 from glances.logger import logger
+from glances.spool import GlancesSpool
 
 
 class GlancesExport(object):
@@ -73,6 +78,16 @@ class GlancesExport(object):
         # Build the export list on startup to avoid change during execution
         self.export_list = self._plugins_to_export()
 
+        # Store and forward (disable by default, see the spool_* options)
+        # Failed (or queued) batches are written in the spool and
+        # replayed, in order, when the export server is back
+        self.spool = None
+        self.spool_rate = 10
+        self.spool_lock = threading.Lock()
+        # Timestamp of the stats currently exported
+        # None means now (only set when the spool is enable)
+        self.export_time = None
+
     def exit(self):
         """Close the export module."""
         logger.debug("Finalise export interface %s" % self.export_name)
@@ -123,8 +138,32 @@ class GlancesExport(object):
         logger.debug("Load {} from the Glances configuration file".format(section))
         logger.debug("{} parameters: {}".format(section, {opt: getattr(self, opt) for opt in mandatories + options}))
 
+        # Load the store and forward options
+        self.spool = self.load_spool(section)
+
         return True
 
+    def load_spool(self, section):
+        """Load the spool configuration of the export <section>.
+
+        The spool is enable if the spool key is set to true (or to a folder).
+
+        :returns: the GlancesSpool instance or None if the spool is disable
+        """
+        spool = self.config.get_value(section, 'spool', default='false')
+        if spool.lower() in ['false', 'no', '0']:
+            return None
+        if spool.lower() in ['true', 'yes', '1']:
+            spool = os.path.join(user_cache_dir(), 'spool')
+        # Max size (in MB) of the spool
+        spool_size = self.config.get_float_value(section, 'spool_size', default=64)
+        # Max number of batches to replay per export
+        self.spool_rate = self.config.get_int_value(section, 'spool_rate', default=10)
+
+        logger.info("Failed {} exports will be spooled in {} (max {} MB)".format(section, spool, spool_size))
+        return GlancesSpool(os.path.join(spool, self.export_name),
+                            max_size=int(spool_size * 1024 * 1024))
+
     def get_item_key(self, item):
         """Return the value of the item 'key'."""
         try:
@@ -171,6 +210,7 @@ class GlancesExport(object):
         all_limits = stats.getAllLimitsAsDict(plugin_list=self.plugins_to_export())
 
         # Loop over plugins to export
+        batch = []
         for plugin in self.plugins_to_export():
             if isinstance(all_stats[plugin], dict):
                 all_stats[plugin].update(all_limits[plugin])
@@ -181,10 +221,55 @@ class GlancesExport(object):
             else:
                 continue
             export_names, export_values = self.__build_export(all_stats[plugin])
-            self.export(plugin, export_names, export_values)
+            batch.append([plugin, export_names, export_values])
+
+        if self.spool is None:
+            self.export_batch(batch)
+        else:
+            self.__spool_batch(time.time(), batch)
 
         return True
 
+    def export_batch(self, batch, stop_on_error=False):
+        """Export a batch of stats: a list of [name, columns, points].
+
+        :returns: False if the export of (at least) one item failed
+        """
+        ret = True
+        for name, columns, points in batch:
+            if self.export(name, columns, points) is False:
+                ret = False
+                if stop_on_error:
+                    return ret
+        return self.flush() is not False and ret
+
+    def __spool_batch(self, timestamp, batch):
+        """Export a batch of stats through the spool.
+
+        Spooled batches are replayed first (max spool_rate per call), then
+        the current one is exported. If an export failed, the current batch
+        is appended to the spool.
+        """
+        with self.spool_lock:
+            replayed = 0
+            while replayed < self.spool_rate:
+                record = self.spool.peek()
+                if record is None:
+                    break
+                self.export_time = record[0]
+                if not self.export_batch(record[1], stop_on_error=True):
+                    break
+                self.spool.pop()
+                replayed += 1
+            if replayed:
+                logger.debug("{} batch(es) replayed from the {} spool".format(replayed, self.export_name))
+
+            self.export_time = timestamp
+            if not self.spool.is_empty() or not self.export_batch(batch, stop_on_error=True):
+                logger.debug("Spool the {} batch".format(self.export_name))
+                self.spool.append([timestamp, batch])
+            self.export_time = None
+
     def __build_export(self, stats):
         """Build the export lists."""
         export_names = []
@@ -225,4 +310,11 @@ class GlancesExport(object):
 
     def export(self, name, columns, points):
         # This method should be implemented by each exporter
+        # Return False if the export failed (the stats will be spooled)
+        pass
+
+    def flush(self):
+        # This method is called after the export of all the plugins
+        # It could be implemented by exporters buffering stats
+        # Return False if the export failed (the stats will be spooled)
         pass
@@ -25,10 +25,11 @@ import sys
 import os
 import tempfile
 import errno
+import multiprocessing
 
 from glances.logger import logger
 from glances.timer import Timer
-from glances.compat import iteritems, time_serie_subsample
+from glances.compat import iteritems, time_serie_lttb
 from glances.exports.glances_export import GlancesExport
 
 
@@ -53,9 +54,15 @@ class Export(GlancesExport):
         self.generate_every = int(getattr(self, 'generate_every', 0))
         self.width = int(getattr(self, 'width', 800))
         self.height = int(getattr(self, 'height', 600))
-        self.style = getattr(pygal.style,
-                             getattr(self, 'style', 'DarkStyle'),
-                             pygal.style.DarkStyle)
+        self.style = getattr(self, 'style', None) or 'DarkStyle'
+        # Number of processes used to render the charts (0: no process)
+        if self.export_enable:
+            self.processes = self.config.get_int_value('graph', 'processes', default=2)
+        else:
+            self.processes = 2
+        self.pool = None
+        # Signature of the data of the last generated charts
+        self.signatures = {}
 
         # Create export folder
         try:
@@ -84,6 +91,10 @@ class Export(GlancesExport):
     def exit(self):
         """Close the files."""
         logger.debug("Finalise export interface %s" % self.export_name)
+        if self.pool is not None:
+            # Wait for the charts being rendered
+            self.pool.close()
+            self.pool.join()
 
     def update(self, stats):
         """Generate Graph file in the output folder."""
@@ -120,21 +131,61 @@ class Export(GlancesExport):
 
         Return:
         * True if the graph have been generated
-        * False if the graph have not been generated
+        * False if the graph have not been generated (no data or no change)
         """
         if data == {}:
             return False
 
+        # Do not generate the graph again if the data did not change
+        signature = [(k, len(v), v[-1] if v else None) for k, v in sorted(iteritems(data))]
+        if self.signatures.get(title) == signature:
+            logger.debug("Graph {} is up to date".format(title))
+            return False
+
+        # One point per pixel is enough
+        data = {k: time_serie_lttb(v, self.width) for k, v in iteritems(data)}
+
+        args = (os.path.join(self.path, title + '.svg'), title, data,
+                self.width, self.height, self.style)
+        if self.processes > 0:
+            # Render the chart in the background
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.processes)
+            self.pool.apply_async(render_chart, args,
+                                  callback=lambda error: self.rendered(title, signature, error))
+        else:
+            self.rendered(title, signature, render_chart(*args))
+        return True
+
+    def rendered(self, title, signature, error):
+        """Log the render_chart result.
+
+        The signature is only recorded once the chart is written (a failed
+        chart is generated again).
+        """
+        if error is not None:
+            logger.error(error)
+        else:
+            self.signatures[title] = signature
+
+
+def render_chart(file_name, title, data, width, height, style):
+    """Render the chart of the data to the file_name SVG file.
+
+    Return None or the error message (the function could run in a pool).
+    """
+    try:
         chart = DateTimeLine(title=title.capitalize(),
-                             width=self.width,
-                             height=self.height,
-                             style=self.style,
+                             width=width,
+                             height=height,
+                             style=getattr(pygal.style, style, pygal.style.DarkStyle),
                              show_dots=False,
                              legend_at_bottom=True,
                              x_label_rotation=20,
                              x_value_formatter=lambda dt: dt.strftime('%Y/%m/%d %H:%M:%S'))
-        for k, v in iteritems(time_serie_subsample(data, self.width)):
+        for k, v in iteritems(data):
             chart.add(k, v)
-        chart.render_to_file(os.path.join(self.path,
-                                          title + '.svg'))
-        return True
+        chart.render_to_file(file_name)
+    except Exception as e:
+        return "Cannot create the graph {} ({})".format(file_name, e)
+    return None
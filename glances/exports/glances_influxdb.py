@@ -116,9 +116,13 @@ class Export(GlancesExport):
             else:
                 continue
 
-        return [{'measurement': name,
-                 'tags': self.parse_tags(self.tags),
-                 'fields': dict(zip(columns, points))}]
+        ret = {'measurement': name,
+               'tags': self.parse_tags(self.tags),
+               'fields': dict(zip(columns, points))}
+        if self.export_time is not None:
+            # Spooled stats are written with their original timestamp
+            ret['time'] = int(self.export_time)
+        return [ret]
 
     def export(self, name, columns, points):
         """Write the points to the InfluxDB server."""
@@ -134,5 +138,6 @@ class Export(GlancesExport):
             except Exception as e:
                 # Log level set to debug instead of error (see: issue #1561)
                 logger.debug("Cannot export {} stats to InfluxDB ({})".format(name, e))
+                return False
             else:
                 logger.debug("Export {} stats to InfluxDB".format(name))
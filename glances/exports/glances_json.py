@@ -3,9 +3,10 @@
 import sys
 import json
 
-from glances.compat import PY3, listkeys
+from glances.compat import listkeys
 from glances.logger import logger
 from glances.exports.glances_export import GlancesExport
+from glances.rotating_file import GlancesRotatingFile, rotating_file_conf
 
 
 class Export(GlancesExport):
@@ -20,11 +21,10 @@ class Export(GlancesExport):
         self.json_filename = args.export_json_file
 
         # Set the JSON output file
+        # Buffered file with optional rotation (see the [json] section)
         try:
-            if PY3:
-                self.json_file = open(self.json_filename, 'w')
-            else:
-                self.json_file = open(self.json_filename, 'wb')
+            self.json_file = GlancesRotatingFile(self.json_filename, 'w',
+                                                 **rotating_file_conf(config, 'json'))
         except IOError as e:
             logger.critical("Cannot create the JSON file: {}".format(e))
             sys.exit(2)
@@ -42,23 +42,25 @@ class Export(GlancesExport):
         self.json_file.close()
 
     def export(self, name, columns, points):
-        """Export the stats to the JSON file."""
+        """Add the stats to the buffer (written by the flush method)."""
+        self.buffer[name] = dict(zip(columns, points))
 
-        # Check for completion of loop for all exports
-        if name == self.plugins_to_export()[0] and self.buffer != {}:
-            # One whole loop has been completed
-            # Flush stats to file
-            logger.debug("Exporting stats ({}) to JSON file ({})".format(
-                listkeys(self.buffer),
-                self.json_filename)
-            )
+    def flush(self):
+        """Export the buffered stats to the JSON file."""
+        if self.buffer == {}:
+            return
+        # One whole loop has been completed
+        logger.debug("Exporting stats ({}) to JSON file ({})".format(
+            listkeys(self.buffer),
+            self.json_filename)
+        )
 
-            # Export stats to JSON file
-            data_json = json.dumps(self.buffer)
-            self.json_file.write("{}\n".format(data_json))
+        if self.json_file.need_rotate():
+            self.json_file.rotate()
 
-            # Reset buffer
-            self.buffer = {}
+        # Export stats to JSON file
+        data_json = json.dumps(self.buffer)
+        self.json_file.write("{}\n".format(data_json))
 
-        # Add current stat to the buffer
-        self.buffer[name] = dict(zip(columns, points))
+        # Reset buffer
+        self.buffer = {}
@@ -22,11 +22,11 @@
 import sys
 
 from glances.logger import logger
-from glances.compat import iteritems
+from glances.compat import b
 from glances.exports.glances_export import GlancesExport
+from glances.framing import GlancesFraming, framing_conf
 
 from kafka import KafkaProducer
-import json
 
 
 class Export(GlancesExport):
@@ -50,6 +50,13 @@ class Export(GlancesExport):
         if not self.export_enable:
             sys.exit(2)
 
+        # Producer batching (see the KafkaProducer documentation)
+        self.linger_ms = self.config.get_int_value('kafka', 'linger_ms', default=0)
+        self.batch_size = self.config.get_int_value('kafka', 'batch_size', default=16384)
+
+        # Messages framing (envelope, encoding and column_dict keys)
+        self.framing = GlancesFraming(**framing_conf(self.config, 'kafka'))
+
         # Init the kafka client
         self.client = self.init()
 
@@ -63,8 +70,9 @@ class Export(GlancesExport):
 
         try:
             s = KafkaProducer(bootstrap_servers=server_uri,
-                              value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-                              compression_type=self.compression)
+                              compression_type=self.compression,
+                              linger_ms=self.linger_ms,
+                              batch_size=self.batch_size)
         except Exception as e:
             logger.critical("Cannot connect to Kafka server %s (%s)" % (server_uri, e))
             sys.exit(2)
@@ -76,19 +84,31 @@ class Export(GlancesExport):
     def export(self, name, columns, points):
         """Write the points to the kafka server."""
         logger.debug("Export {} stats to Kafka".format(name))
-
-        # Create DB input
-        data = dict(zip(columns, points))
-
-        # Send stats to the kafka topic
-        # key=<plugin name>
-        # value=JSON dict
-        try:
-            self.client.send(self.topic,
-                             key=name,
-                             value=data)
-        except Exception as e:
-            logger.error("Cannot export {} stats to Kafka ({})".format(name, e))
+        return self.send(self.framing.add(name, columns, points))
+
+    def flush(self):
+        """Write the refresh envelope (if any) to the kafka server."""
+        return self.send(self.framing.flush())
+
+    def send(self, messages):
+        """Send the messages to the kafka topic.
+
+        key=<plugin name> (or glances for a refresh envelope)
+        value=JSON dict (see the framing options)
+        """
+        # Spooled stats are sent with their original timestamp
+        timestamp_ms = None
+        if self.export_time is not None:
+            timestamp_ms = int(self.export_time * 1000)
+        for key, value in messages:
+            try:
+                self.client.send(self.topic,
+                                 key=b(key),
+                                 value=value,
+                                 timestamp_ms=timestamp_ms)
+            except Exception as e:
+                logger.error("Cannot export {} stats to Kafka ({})".format(key, e))
+                return False
 
     def exit(self):
         """Close the Kafka export module."""
@@ -24,6 +24,7 @@ import string
 
 from glances.logger import logger
 from glances.exports.glances_export import GlancesExport
+from glances.framing import GlancesFraming, framing_conf
 
 # Import paho for MQTT
 from requests import certs
@@ -59,6 +60,12 @@ class Export(GlancesExport):
         self.user = self.user or 'glances'
         self.tls = (self.tls and self.tls.lower() == 'true')
 
+        # Messages framing (envelope, encoding and column_dict keys)
+        # By default, one message (topic) per stat is published
+        self.framing = None
+        if self.config.get_value('mqtt', 'envelope') is not None:
+            self.framing = GlancesFraming(**framing_conf(self.config, 'mqtt'))
+
         # Init the MQTT client
         self.client = self.init()
 
@@ -83,14 +90,8 @@ class Export(GlancesExport):
 
     def export(self, name, columns, points):
         """Write the points in MQTT."""
-
-        WHITELIST = '_-' + string.ascii_letters + string.digits
-        SUBSTITUTE = '_'
-
-        def whitelisted(s,
-                        whitelist=WHITELIST,
-                        substitute=SUBSTITUTE):
-            return ''.join(c if c in whitelist else substitute for c in s)
+        if self.framing is not None:
+            return self.send(self.framing.add(name, columns, points))
 
         for sensor, value in zip(columns, points):
             try:
@@ -102,3 +103,28 @@ class Export(GlancesExport):
                 self.client.publish(topic, value)
             except Exception as e:
                 logger.error("Can not export stats to MQTT server (%s)" % e)
+
+    def flush(self):
+        """Write the refresh envelope (if any) in MQTT."""
+        if self.framing is not None:
+            return self.send(self.framing.flush())
+
+    def send(self, messages):
+        """Publish the framed messages in the <topic>/<hostname>/<key> topics."""
+        for key, payload in messages:
+            topic = '/'.join([self.topic, self.hostname, whitelisted(key)])
+            try:
+                self.client.publish(topic, payload)
+            except Exception as e:
+                logger.error("Can not export stats to MQTT server (%s)" % e)
+                return False
+
+
+WHITELIST = '_-' + string.ascii_letters + string.digits
+SUBSTITUTE = '_'
+
+
+def whitelisted(s,
+                whitelist=WHITELIST,
+                substitute=SUBSTITUTE):
+    return ''.join(c if c in whitelist else substitute for c in s)
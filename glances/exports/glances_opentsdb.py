@@ -81,10 +81,14 @@ class Export(GlancesExport):
             stat_name = '{}.{}.{}'.format(self.prefix, name, columns[i])
             stat_value = points[i]
             tags = self.parse_tags(self.tags)
+            if self.export_time is not None:
+                # Spooled stats are sent with their original timestamp
+                tags['timestamp'] = int(self.export_time)
             try:
                 self.client.send(stat_name, stat_value, **tags)
             except Exception as e:
                 logger.error("Can not export stats %s to OpenTSDB (%s)" % (name, e))
+                return False
         logger.debug("Export {} stats to OpenTSDB".format(name))
 
     def exit(self):
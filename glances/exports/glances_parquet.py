@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Parquet interface class."""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from numbers import Number
+
+from glances.compat import iteritems, iterkeys, listkeys, string_types
+from glances.globals import safe_makedirs
+from glances.logger import logger
+from glances.exports.glances_export import GlancesExport
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def to_table(plugin, columns):
+    """Return the Arrow table of the buffered columns: {column: [values]}.
+
+    A column with mixed types (ex: numbers and strings) is stored as strings.
+    """
+    arrays = {}
+    for key, values in iteritems(columns):
+        try:
+            arrays[key] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError) as e:
+            logger.debug("Store the {}.{} stats as strings ({})".format(plugin, key, e))
+            values = [v if v is None or isinstance(v, string_types) else str(v) for v in values]
+            arrays[key] = pa.array(values, type=pa.string())
+    return pa.Table.from_pydict(arrays)
+
+
+class Export(GlancesExport):
+
+    """This class manages the Parquet export module.
+
+    Stats are written in one Parquet file per plugin (<plugin>.<date>.parquet).
+    List plugins (network, fs...) are exploded: one row per item.
+    """
+
+    def __init__(self, config=None, args=None):
+        """Init the Parquet export IF."""
+        super(Export, self).__init__(config=config, args=args)
+
+        # Optionals configuration keys
+        self.path = None
+        self.row_group = None
+        self.rotate_every = None
+        self.compression = None
+
+        # Load the Parquet configuration file section
+        self.export_enable = self.load_conf('parquet',
+                                            mandatories=['path'],
+                                            options=['row_group',
+                                                     'rotate_every',
+                                                     'compression'])
+        if not self.export_enable:
+            sys.exit(2)
+
+        # Write a row group every <row_group> refreshes
+        self.row_group = int(self.row_group or 60)
+        # Start new files every <rotate_every> seconds
+        # (a Parquet file can only be read once closed)
+        self.rotate_every = int(self.rotate_every or 3600)
+        self.compression = self.compression or 'zstd'
+
+        try:
+            safe_makedirs(self.path)
+        except OSError as e:
+            logger.critical("Cannot create the Parquet output folder {} ({})".format(self.path, e))
+            sys.exit(2)
+
+        # Buffered rows per plugin: {plugin: {column: [values]}}
+        self.buffer = {}
+        self.buffer_len = 0
+        # Opened writers per plugin: {plugin: (ParquetWriter, start time)}
+        self.writers = {}
+
+        logger.info("Stats will be exported to Parquet files in {}".format(self.path))
+
+    def exit(self):
+        """Write the buffered stats and close the Parquet files."""
+        self.flush_row_group()
+        for plugin in listkeys(self.writers):
+            self.close_writer(plugin)
+        super(Export, self).exit()
+
+    def update(self, stats):
+        """Add the stats to the buffer and write a row group every row_group refreshes."""
+        all_stats = stats.getAllExportsAsDict(plugin_list=self.plugins_to_export())
+        now = datetime.now()
+
+        for plugin in self.plugins_to_export():
+            if isinstance(all_stats[plugin], dict):
+                self.add_row(plugin, now, all_stats[plugin])
+            elif isinstance(all_stats[plugin], list):
+                # One row per item (the key column is part of the item)
+                for item in all_stats[plugin]:
+                    self.add_row(plugin, now, item)
+
+        self.buffer_len += 1
+        if self.buffer_len >= self.row_group:
+            self.flush_row_group()
+
+        return True
+
+    def add_row(self, plugin, timestamp, stat):
+        """Add a row to the plugin buffer."""
+        if not isinstance(stat, dict):
+            return
+        columns = self.buffer.setdefault(plugin, {'timestamp': []})
+        nb_rows = len(columns['timestamp'])
+        columns['timestamp'].append(timestamp)
+        for key, value in iteritems(stat):
+            if key == 'key':
+                # Name of the key column, same for all the rows
+                continue
+            if value is not None and not isinstance(value, (Number,) + string_types):
+                # Nested stats are stored as JSON strings
+                value = json.dumps(value, default=str)
+            if key not in columns:
+                # New column: previous rows are null
+                columns[key] = [None] * nb_rows
+            columns[key].append(value)
+        # Missing columns are null
+        for key in iterkeys(columns):
+            if len(columns[key]) == nb_rows:
+                columns[key].append(None)
+
+    def flush_row_group(self):
+        """Write the buffered rows (one row group per plugin)."""
+        for plugin, columns in iteritems(self.buffer):
+            self.write_table(plugin, to_table(plugin, columns))
+        self.buffer = {}
+        self.buffer_len = 0
+
+    def write_table(self, plugin, table):
+        """Write the table as a row group of the plugin Parquet file."""
+        if plugin in self.writers:
+            writer, start = self.writers[plugin]
+            if time.time() - start >= self.rotate_every:
+                self.close_writer(plugin)
+            elif table.schema != writer.schema:
+                # Same columns with compatible types (ex: int to double)
+                try:
+                    table = table.select(writer.schema.names).cast(writer.schema)
+                except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    # The schema changed, start a new file
+                    self.close_writer(plugin)
+
+        if plugin not in self.writers:
+            file_name = os.path.join(self.path,
+                                     '{}.{}.parquet'.format(plugin, time.strftime('%Y%m%d-%H%M%S')))
+            try:
+                self.writers[plugin] = (pq.ParquetWriter(file_name, table.schema,
+                                                         compression=self.compression),
+                                        time.time())
+            except (IOError, OSError, pa.ArrowException) as e:
+                logger.error("Cannot create the Parquet file {} ({})".format(file_name, e))
+                return
+            logger.debug("Export {} stats to Parquet file {}".format(plugin, file_name))
+
+        try:
+            self.writers[plugin][0].write_table(table)
+        except (IOError, OSError, pa.ArrowException) as e:
+            logger.error("Cannot export {} stats to Parquet ({})".format(plugin, e))
+
+    def close_writer(self, plugin):
+        """Close the Parquet file of the plugin."""
+        writer, _ = self.writers.pop(plugin)
+        try:
+            writer.close()
+        except (IOError, OSError, pa.ArrowException) as e:
+            logger.error("Cannot close the {} Parquet file ({})".format(plugin, e))
@@ -19,13 +19,17 @@
 
 """RESTful interface class."""
 
+import gzip
+import json
 import sys
+import time
+from io import BytesIO
 
-from glances.compat import listkeys
+from glances.compat import b
 from glances.logger import logger
 from glances.exports.glances_export import GlancesExport
 
-from requests import post
+from requests import Session
 
 
 class Export(GlancesExport):
@@ -47,12 +51,33 @@ class Export(GlancesExport):
         if not self.export_enable:
             sys.exit(2)
 
+        # Connect and read timeout (in seconds)
+        self.timeout = self.config.get_float_value('restful', 'timeout', default=5)
+        # Number of refreshes sent per POST request
+        self.batch_size = max(self.config.get_int_value('restful', 'batch_size', default=1), 1)
+        # Max size (in KB) of a POST request body (0: no limit)
+        self.max_payload = self.config.get_int_value('restful', 'max_payload', default=0) * 1024
+        # Gzip the POST request body
+        self.compress = self.config.get_bool_value('restful', 'compress', default=False)
+        # Max delay (in seconds) between two tries when the endpoint is down
+        self.backoff_max = self.config.get_float_value('restful', 'backoff_max', default=300)
+
         # Init the stats buffer
-        # It's a dict of stats
-        self.buffer = {}
+        # It's a list of [name, columns, points] (current refresh)
+        self.buffer = []
+        # Refreshes waiting to be posted: list of [timestamp, buffer]
+        self.pending = []
+        # Exponential backoff
+        self.retry_delay = 0
+        self.next_try = 0
 
-        # Init the Statsd client
+        # Init the RESTful client
         self.client = self.init()
+        # Persistent (keep-alive) HTTP session
+        self.session = Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        if self.compress:
+            self.session.headers.update({'Content-Encoding': 'gzip'})
 
     def init(self):
         """Init the connection to the RESTful server."""
@@ -67,16 +92,117 @@ class Export(GlancesExport):
             "Stats will be exported to the RESTful endpoint {}".format(url))
         return url
 
+    def exit(self):
+        """Post the pending refreshes and close the RESTful session."""
+        if self.pending:
+            posted = self.post(self.pending)
+            if posted < len(self.pending):
+                if self.spool is not None:
+                    for record in self.pending[posted:]:
+                        self.spool.append(record)
+                else:
+                    logger.debug("Drop {} refresh(es) of stats".format(len(self.pending) - posted))
+            self.pending = []
+        self.session.close()
+        super(Export, self).exit()
+
     def export(self, name, columns, points):
-        """Export the stats to the Statsd server."""
-        if name == self.plugins_to_export()[0] and self.buffer != {}:
-            # One complete loop have been done
-            logger.debug("Export stats ({}) to RESTful endpoint ({})".format(listkeys(self.buffer),
-                                                                             self.client))
-            # Export stats
-            post(self.client, json=self.buffer, allow_redirects=True)
-            # Reset buffer
-            self.buffer = {}
-
-        # Add current stat to the buffer
-        self.buffer[name] = dict(zip(columns, points))
+        """Add the stats to the buffer (exported by the flush method)."""
+        self.buffer.append([name, columns, points])
+
+    def flush(self):
+        """Export the buffered stats to the RESTful endpoint.
+
+        Stats are posted every batch_size refreshes. When the endpoint is down,
+        the next tries are delayed (exponential backoff) and the stats are
+        spooled (if the spool is enable) or dropped.
+
+        The spooled refreshes are replayed one by one (the spool is not empty
+        only while it is replayed): a replayed refresh is removed from the
+        spool only once it has been posted.
+        """
+        if self.buffer == []:
+            return
+        # One complete loop have been done
+        record = [self.export_time or time.time(), self.buffer]
+        self.buffer = []
+        if self.spool is not None and not self.spool.is_empty():
+            # Replay: bypass the batching
+            records = [record]
+        else:
+            self.pending.append(record)
+            if len(self.pending) < self.batch_size:
+                return
+            records = self.pending
+            self.pending = []
+
+        if time.time() < self.next_try:
+            logger.debug("RESTful endpoint {} is down, next try in {:.0f} seconds".format(
+                self.client, self.next_try - time.time()))
+            posted = 0
+        else:
+            posted = self.post(records)
+
+        if posted == len(records):
+            self.retry_delay = 0
+            return True
+
+        self.retry_delay = min(max(self.retry_delay * 2, 1), self.backoff_max)
+        self.next_try = time.time() + self.retry_delay
+        if self.spool is not None:
+            # The current refresh (the last one) is spooled (or kept) by the
+            # caller, spool the other refreshes not posted
+            for record in records[posted:-1]:
+                self.spool.append(record)
+        else:
+            logger.debug("Drop {} refresh(es) of stats".format(len(records) - posted))
+        return False
+
+    def payload(self, records):
+        """Return the JSON body of the records.
+
+        One refresh: {plugin: stats} (as in the previous Glances versions).
+        Many refreshes: [{'timestamp': timestamp, plugin: stats}, ...].
+        """
+        data = []
+        for timestamp, batch in records:
+            stats = {name: dict(zip(columns, points)) for name, columns, points in batch}
+            if self.batch_size > 1 or self.export_time is not None:
+                stats['timestamp'] = timestamp
+            data.append(stats)
+        if self.batch_size == 1:
+            data = data[0]
+        return b(json.dumps(data, default=str))
+
+    def post(self, records):
+        """Post the records to the RESTful endpoint.
+
+        The records are split in many requests if the body is bigger than
+        max_payload. Return the number of records posted: the requests
+        are stopped at the first failure (the next records are not posted).
+        """
+        body = self.payload(records)
+        if self.max_payload and len(body) > self.max_payload and len(records) > 1:
+            middle = len(records) // 2
+            posted = self.post(records[:middle])
+            if posted < middle:
+                return posted
+            return posted + self.post(records[middle:])
+
+        if self.compress:
+            buf = BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+                f.write(body)
+            body = buf.getvalue()
+
+        logger.debug("Export {} refresh(es) of stats ({} bytes) to RESTful endpoint ({})".format(
+            len(records), len(body), self.client))
+        try:
+            self.session.post(self.client,
+                              data=body,
+                              timeout=self.timeout,
+                              allow_redirects=True).raise_for_status()
+        except Exception as e:
+            logger.error("Cannot export stats to RESTful endpoint {} ({})".format(self.client, e))
+            return 0
+        return len(records)
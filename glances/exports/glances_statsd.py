@@ -54,6 +54,19 @@ class Export(GlancesExport):
         if self.prefix is None:
             self.prefix = 'glances'
 
+        # Max size of the UDP packets (default is the Ethernet MTU)
+        self.maxudpsize = self.config.get_int_value('statsd', 'maxudpsize', default=1432)
+        # Only send the gauges whose value changed
+        self.skip_unchanged = self.config.get_bool_value('statsd', 'skip_unchanged', default=False)
+
+        # Cache of the normalized stat names: {(plugin, column): name}
+        self.stat_names = {}
+        # Last sent values (only used if skip_unchanged is True)
+        self.last_values = {}
+        # All the gauges of a refresh are sent through a pipeline
+        # (packed in UDP packets of maxudpsize bytes)
+        self.pipeline = None
+
         # Init the Statsd client
         self.client = self.init()
 
@@ -66,22 +79,41 @@ class Export(GlancesExport):
                                                                     self.port))
         return StatsClient(self.host,
                            int(self.port),
-                           prefix=self.prefix)
+                           prefix=self.prefix,
+                           maxudpsize=self.maxudpsize)
 
     def export(self, name, columns, points):
-        """Export the stats to the Statsd server."""
+        """Add the stats to the Statsd pipeline (sent by the flush method)."""
+        if self.pipeline is None:
+            self.pipeline = self.client.pipeline()
         for i in range(len(columns)):
             if not isinstance(points[i], Number):
                 continue
-            stat_name = '{}.{}'.format(name, columns[i])
-            stat_value = points[i]
             try:
-                self.client.gauge(normalize(stat_name),
-                                  stat_value)
-            except Exception as e:
-                logger.error("Can not export stats to Statsd (%s)" % e)
+                stat_name = self.stat_names[(name, columns[i])]
+            except KeyError:
+                stat_name = normalize('{}.{}'.format(name, columns[i]))
+                self.stat_names[(name, columns[i])] = stat_name
+            stat_value = points[i]
+            if self.skip_unchanged:
+                if self.last_values.get(stat_name) == stat_value:
+                    continue
+                self.last_values[stat_name] = stat_value
+            self.pipeline.gauge(stat_name, stat_value)
         logger.debug("Export {} stats to Statsd".format(name))
 
+    def flush(self):
+        """Send the pipeline to the Statsd server."""
+        if self.pipeline is None:
+            return
+        try:
+            self.pipeline.send()
+        except Exception as e:
+            logger.error("Can not export stats to Statsd (%s)" % e)
+            return False
+        finally:
+            self.pipeline = None
+
 
 def normalize(name):
     """Normalize name for the Statsd convention"""
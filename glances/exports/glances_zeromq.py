@@ -20,11 +20,11 @@
 """ZeroMQ interface class."""
 
 import sys
-import json
 
 from glances.compat import b
 from glances.logger import logger
 from glances.exports.glances_export import GlancesExport
+from glances.framing import GlancesFraming, framing_conf
 
 import zmq
 from zmq.utils.strtypes import asbytes
@@ -51,6 +51,9 @@ class Export(GlancesExport):
         if not self.export_enable:
             sys.exit(2)
 
+        # Messages framing (envelope, encoding and column_dict keys)
+        self.framing = GlancesFraming(**framing_conf(self.config, 'zeromq'))
+
         # Init the ZeroMQ context
         self.context = None
         self.client = self.init()
@@ -84,27 +87,27 @@ class Export(GlancesExport):
     def export(self, name, columns, points):
         """Write the points to the ZeroMQ server."""
         logger.debug("Export {} stats to ZeroMQ".format(name))
-
-        # Create DB input
-        data = dict(zip(columns, points))
-
-        # Do not publish empty stats
-        if data == {}:
-            return False
-
-        # Glances envelopes the stats in a publish message with two frames:
-        # - First frame containing the following prefix (STRING)
-        # - Second frame with the Glances plugin name (STRING)
-        # - Third frame with the Glances plugin stats (JSON)
-        message = [b(self.prefix),
-                   b(name),
-                   asbytes(json.dumps(data))]
-
-        # Write data to the ZeroMQ bus
-        # Result can be view: tcp://host:port
-        try:
-            self.client.send_multipart(message)
-        except Exception as e:
-            logger.error("Cannot export {} stats to ZeroMQ ({})".format(name, e))
-
-        return True
+        return self.send(self.framing.add(name, columns, points))
+
+    def flush(self):
+        """Write the refresh envelope (if any) to the ZeroMQ server."""
+        return self.send(self.framing.flush())
+
+    def send(self, messages):
+        """Publish the messages on the ZeroMQ bus."""
+        for key, payload in messages:
+            # Glances envelopes the stats in a publish message with two frames:
+            # - First frame containing the following prefix (STRING)
+            # - Second frame with the Glances plugin name (STRING)
+            # - Third frame with the Glances plugin stats (JSON)
+            message = [b(self.prefix),
+                       b(key),
+                       asbytes(payload)]
+
+            # Write data to the ZeroMQ bus
+            # Result can be view: tcp://host:port
+            try:
+                self.client.send_multipart(message)
+            except Exception as e:
+                logger.error("Cannot export {} stats to ZeroMQ ({})".format(key, e))
+                return False
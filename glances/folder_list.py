@@ -21,9 +21,12 @@
 from __future__ import unicode_literals
 
 import os
+import time
+from multiprocessing.pool import ThreadPool
 
 from glances.timer import Timer
 from glances.compat import range, nativestr
+from glances.globals import LINUX
 from glances.logger import logger
 
 # Use the built-in version of scandir/walk if possible, otherwise
@@ -39,6 +42,135 @@ except ImportError:
     except ImportError:
         scandir_tag = False
 
+# inotify_simple is optional (Linux only): invalidate the folders size cache
+# when a directory changes
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+
+class FolderSizeCache(object):
+
+    """Content and size of the files of the directories, cached by (inode, mtime).
+
+    The mtime of a directory only changes when an entry is created, deleted
+    or renamed: the directory is only listed again on such a change. As it
+    does not change when a file grows, the size of the listed files is read
+    again (stat) after max_age seconds. With inotify, the directories are
+    invalidated when they (or their files) change and max_age is not used.
+    """
+
+    # inotify events invalidating a directory
+    inotify_mask = 0
+
+    def __init__(self, max_age=30, inotify=False):
+        # {path: (inode, mtime, files, subdirs, files size, size read time)}
+        self.dirs = {}
+        self.max_age = max_age
+        self.inotify = None
+        # {watch descriptor: path}
+        self.watches = {}
+        if inotify:
+            if INotify is None or not LINUX:
+                logger.warning("Missing Python Lib (inotify_simple) or not Linux, folders are not watched")
+            else:
+                self.inotify = INotify()
+                self.inotify_mask = (inotify_flags.CREATE | inotify_flags.DELETE |
+                                     inotify_flags.MODIFY | inotify_flags.MOVED_FROM |
+                                     inotify_flags.MOVED_TO | inotify_flags.DELETE_SELF)
+
+    def close(self):
+        """Close the inotify instance."""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def invalidate(self):
+        """Forget the directories changed since the last call (inotify)."""
+        if self.inotify is None:
+            return
+        for event in self.inotify.read(timeout=0):
+            path = self.watches.get(event.wd)
+            if path is None:
+                continue
+            self.dirs.pop(path, None)
+            if event.mask & inotify_flags.IGNORED:
+                # The watch has been removed (directory deleted)
+                del self.watches[event.wd]
+
+    def watch(self, path):
+        """Watch the directory changes (inotify)."""
+        try:
+            self.watches[self.inotify.add_watch(path, self.inotify_mask)] = path
+        except OSError as e:
+            # ENOSPC: fs.inotify.max_user_watches reached
+            logger.debug("Cannot watch folder {} ({}), use the cache max age".format(path, e))
+            return False
+        return True
+
+    def read_dir(self, path):
+        """Return the (files size, subdirs) of the directory (cached).
+
+        Raise OSError if the directory can not be read.
+        """
+        st = os.stat(path)
+        entry = self.dirs.get(path)
+        now = time.time()
+        if entry is not None and entry[0] == st.st_ino and entry[1] == st.st_mtime:
+            if entry[5] is None or now - entry[5] < self.max_age:
+                return entry[4], entry[3]
+            # Same entries: only read the size of the files again
+            files = entry[2]
+            subdirs = entry[3]
+            files_size = 0
+            for f in files:
+                try:
+                    files_size += os.stat(f).st_size
+                except OSError:
+                    pass
+        else:
+            files = []
+            subdirs = []
+            files_size = 0
+            for f in scandir(path):
+                # Symbolic links to directories are not followed (no loop)
+                if f.is_dir(follow_symlinks=False):
+                    subdirs.append(os.path.join(path, f.name))
+                else:
+                    files.append(os.path.join(path, f.name))
+                    try:
+                        files_size += f.stat().st_size
+                    except OSError:
+                        pass
+
+        # With inotify, the read time is None (no max age)
+        self.dirs[path] = (st.st_ino, st.st_mtime, files, subdirs, files_size,
+                           None if self.inotify is not None and self.watch(path) else now)
+        return files_size, subdirs
+
+    def walk(self, path, deadline=None):
+        """Return the (size, complete) of the directory tree.
+
+        The walk stops at the deadline (time.time() value): the size is then
+        partial (complete is False) but the read directories are cached, so
+        the next walk goes further.
+        """
+        size = 0
+        stack = [path]
+        while stack:
+            if deadline is not None and time.time() > deadline:
+                return size, False
+            current = stack.pop()
+            try:
+                files_size, subdirs = self.read_dir(current)
+            except OSError as e:
+                logger.debug("Cannot read folder {} ({})".format(current, e))
+                continue
+            size += files_size
+            stack.extend(subdirs)
+        return size, True
+
 
 class FolderList(object):
 
@@ -65,6 +197,19 @@ class FolderList(object):
         """Init the folder list from the configuration file, if it exists."""
         self.config = config
 
+        # Directories size cache, workers pool (created on first update)
+        # and max time (in seconds) spent to compute the size of a folder
+        self.cache = None
+        self.pool = None
+        self.workers = 4
+        self.budget = 10
+        # The first update only waits first_budget seconds (partial sizes)
+        self.first_budget = 1
+        # Running scans: {folder index: (root files size, [AsyncResult])}
+        self.scans = {}
+        # Folders with a complete size (else the size is partial)
+        self.complete = set()
+
         # A list of Timer
         # One timer per folder
         # default timer is __default_refresh, can be overwrite by folder_1_refresh=600
@@ -76,6 +221,12 @@ class FolderList(object):
                 # Process monitoring list
                 logger.debug("Folder list configuration detected")
                 self.__set_folder_list('folders')
+                self.workers = self.config.get_int_value('folders', 'workers', default=self.workers)
+                self.budget = self.config.get_float_value('folders', 'budget', default=self.budget)
+                # By default, the cached sizes are not older than the shortest folder refresh
+                max_age = min([f['refresh'] for f in self.__folder_list] or [self.__default_refresh])
+                self.cache = FolderSizeCache(max_age=self.config.get_float_value('folders', 'cache_age', default=max_age),
+                                             inotify=self.config.get_bool_value('folders', 'inotify', default=False))
             else:
                 logger.error('Scandir not found. Please use Python 3.5+ or install the scandir lib')
         else:
@@ -144,52 +295,104 @@ class FolderList(object):
         else:
             return None
 
-    def __folder_size(self, path):
-        """Return the size of the directory given by path
-
-        path: <string>"""
-
-        ret = 0
-        for f in scandir(path):
-            if f.is_dir() and (f.name != '.' or f.name != '..'):
-                ret += self.__folder_size(os.path.join(path, f.name))
-            else:
-                try:
-                    ret += f.stat().st_size
-                except OSError:
-                    pass
-
-        return ret
+    def exit(self):
+        """Stop the workers pool."""
+        if self.pool is not None:
+            self.pool.terminate()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __start_scan(self, i, budget):
+        """Start the scan of the folder: its top-level subtrees are walked in parallel."""
+        # The root directory is read now to report the errors
+        files_size, subdirs = self.cache.read_dir(self.path(i))
+        deadline = time.time() + budget
+        self.scans[i] = (files_size,
+                         [self.pool.apply_async(self.cache.walk, (d, deadline)) for d in subdirs])
+
+    def __end_scan(self, i):
+        """Return the (size, complete) of the folder if its scan is over, else None."""
+        files_size, results = self.scans[i]
+        if not all(r.ready() for r in results):
+            return None
+        del self.scans[i]
+        size = files_size
+        complete = True
+        for r in results:
+            subdir_size, subdir_complete = r.get()
+            size += subdir_size
+            complete = complete and subdir_complete
+        return size, complete
 
     def update(self):
-        """Update the command result attributed."""
+        """Update the command result attributed.
+
+        The folders are scanned by the workers pool: this method does not
+        wait for the sizes, they are available in the next calls. The first
+        grab waits at most first_budget seconds: the sizes are then partial
+        and the scans go on.
+        """
         # Only continue if monitor list is not empty
         if len(self.__folder_list) == 0:
             return self.__folder_list
 
+        if self.pool is None:
+            self.pool = ThreadPool(processes=max(self.workers, 1))
+        self.cache.invalidate()
+
         # Iter upon the folder list
         for i in range(len(self.get())):
             # Update folder size
-            if not self.first_grab and not self.timer_folders[i].finished():
+            if i in self.scans or (not self.first_grab and not self.timer_folders[i].finished()):
                 continue
-            # Get folder size
-            try:
-                self.__folder_list[i]['size'] = self.__folder_size(self.path(i))
-            except OSError as e:
-                logger.debug('Cannot get folder size ({}). Error: {}'.format(self.path(i), e))
-                if e.errno == 13:
-                    # Permission denied
-                    self.__folder_list[i]['size'] = '!'
-                else:
-                    self.__folder_list[i]['size'] = '?'
-            # Reset the timer
-            self.timer_folders[i].reset()
-
-        # It is no more the first time...
-        self.first_grab = False
+            self.__start_scan_or_error(i, min(self.budget, self.first_budget)
+                                       if self.first_grab else self.budget)
+
+        if self.first_grab:
+            # Wait for the first (partial) sizes (the walks stop at the deadline)
+            for _, results in self.scans.values():
+                for r in results:
+                    r.wait()
+            # It is no more the first time...
+            self.first_grab = False
+
+        # Get the sizes of the ended scans
+        for i in list(self.scans):
+            ret = self.__end_scan(i)
+            if ret is None:
+                # Scan in progress
+                continue
+            size, complete = ret
+            if complete or i not in self.complete:
+                # A partial size is only displayed until a complete one is available
+                self.__folder_list[i]['size'] = size
+            if complete:
+                self.complete.add(i)
+                # Reset the timer
+                self.timer_folders[i].reset()
+            else:
+                # The budget is over: go on at the next update
+                # (the read directories are cached)
+                logger.debug("Folder {} scan is not complete, go on".format(self.path(i)))
+                self.__start_scan_or_error(i, self.budget)
 
         return self.__folder_list
 
+    def __start_scan_or_error(self, i, budget):
+        """Start the scan of the folder, set the size to the error tag if it can not be read."""
+        try:
+            self.__start_scan(i, budget)
+        except OSError as e:
+            logger.debug('Cannot get folder size ({}). Error: {}'.format(self.path(i), e))
+            if e.errno == 13:
+                # Permission denied
+                self.__folder_list[i]['size'] = '!'
+            else:
+                self.__folder_list[i]['size'] = '?'
+            self.complete.discard(i)
+            # Reset the timer
+            self.timer_folders[i].reset()
+
     def get(self):
         """Return the monitored list (list of dict)."""
         return self.__folder_list
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Manage the messages framing of the brokers exports (Kafka, MQTT, ZeroMQ)."""
+
+import json
+
+from glances.compat import b
+from glances.logger import logger
+
+# msgpack is optional (only needed for encoding=msgpack)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def framing_conf(config, section):
+    """Return the framing options of the given configuration section.
+
+    envelope: plugin (one message per plugin) or tick (one message per refresh)
+    encoding: json or msgpack
+    column_dict: if true, the columns names are only sent when they change
+    """
+    ret = {}
+    if config is None or not config.has_section(section):
+        return ret
+    ret['envelope'] = config.get_value(section, 'envelope', default='plugin').lower()
+    ret['encoding'] = config.get_value(section, 'encoding', default='json').lower()
+    ret['column_dict'] = config.get_bool_value(section, 'column_dict', default=False)
+    return ret
+
+
+class GlancesFraming(object):
+
+    """This class builds the messages sent by the brokers exports.
+
+    Stats are added (one plugin at a time) with the add method, which returns
+    the messages to send now. The flush method, called at the end of each
+    refresh, returns the remaining messages. A message is a (key, payload)
+    tuple: the key is the plugin name (tick_key for a refresh envelope) and
+    the payload is the encoded (bytes) stats.
+
+    With column_dict, a schema message {"schema": id, "columns": ...} is sent
+    when the columns change (and every schema_every messages for the new
+    subscribers), then data messages only carry {"schema": id, "points": ...}.
+    """
+
+    # Re-send the schema every schema_every messages
+    schema_every = 60
+    # Key of the refresh envelope messages
+    tick_key = 'glances'
+
+    def __init__(self, envelope='plugin', encoding='json', column_dict=False):
+        if envelope not in ['plugin', 'tick']:
+            logger.warning("Unknown envelope {}, use plugin".format(envelope))
+            envelope = 'plugin'
+        self.envelope = envelope
+        if encoding == 'msgpack' and msgpack is None:
+            logger.warning("Missing Python Lib (msgpack), messages will be encoded in JSON")
+            encoding = 'json'
+        self.encoding = encoding
+        self.column_dict = column_dict
+
+        # Current schema per key: {key: [schema id, columns, messages sent]}
+        self.schemas = {}
+        self.schema_id = 0
+        # Stats of the current refresh (tick envelope)
+        self.columns = {}
+        self.points = {}
+
+    def encode(self, data):
+        """Encode the data (return bytes)."""
+        if self.encoding == 'msgpack':
+            return msgpack.packb(data, use_bin_type=True, default=str)
+        return b(json.dumps(data, default=str))
+
+    def __messages(self, key, columns, points):
+        """Return the messages for the given key."""
+        if not self.column_dict:
+            if self.envelope == 'tick':
+                data = {name: dict(zip(columns[name], points[name])) for name in columns}
+            else:
+                data = dict(zip(columns, points))
+            return [(key, self.encode(data))]
+
+        ret = []
+        schema = self.schemas.get(key)
+        if schema is None or schema[1] != columns:
+            self.schema_id += 1
+            schema = self.schemas[key] = [self.schema_id, columns, 0]
+        if schema[2] % self.schema_every == 0:
+            ret.append((key, self.encode({'schema': schema[0], 'columns': columns})))
+        schema[2] += 1
+        ret.append((key, self.encode({'schema': schema[0], 'points': points})))
+        return ret
+
+    def add(self, name, columns, points):
+        """Add the stats of a plugin. Return the messages to send now."""
+        if not columns:
+            # Do not publish empty stats
+            return []
+        if self.envelope == 'tick':
+            self.columns[name] = columns
+            self.points[name] = points
+            return []
+        return self.__messages(name, columns, points)
+
+    def flush(self):
+        """End of the refresh. Return the messages to send now."""
+        if self.envelope != 'tick' or not self.columns:
+            return []
+        ret = self.__messages(self.tick_key, self.columns, self.points)
+        self.columns = {}
+        self.points = {}
+        return ret
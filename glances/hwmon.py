@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Read the temperatures and fans speed from the hwmon and thermal sysfs (Linux only)."""
+
+import glob
+import os
+
+from glances.logger import logger
+from glances.timer import Timer
+
+SENSOR_TEMP_UNIT = 'C'
+SENSOR_FAN_UNIT = 'R'
+
+
+def read_file(file_name, default=''):
+    """Return the stripped content of the file or default if it can not be read."""
+    try:
+        with open(file_name, 'r') as f:
+            return f.read().strip()
+    except (IOError, OSError, ValueError):
+        return default
+
+
+def pread(fd, size=32):
+    """Read the file descriptor from the beginning (the sysfs values are generated at offset 0)."""
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, 0)
+    # Python 2
+    os.lseek(fd, 0, os.SEEK_SET)
+    return os.read(fd, size)
+
+
+class GlancesHwmon(object):
+
+    """Read the sensors from the hwmon and thermal sysfs.
+
+    The sensors (input files, chips names and labels) are discovered once,
+    again every <refresh> seconds or when a hwmon/thermal device appears or
+    disappears. The input files are kept open: an update only reads the
+    current values (one pread per sensor).
+
+    The sensors are the same as the psutil sensors_temperatures and
+    sensors_fans ones.
+    """
+
+    def __init__(self, root='/sys', refresh=60):
+        self.root = root
+        self.refresh = refresh
+        # Sensors: list of dict {'unit': ..., 'label': ..., 'fd': ..., 'scale': ...}
+        self.sensors = []
+        # hwmon and thermal devices at the last discovery
+        self.devices = None
+        self.timer = Timer(0)
+
+    def available(self):
+        """Return True if the hwmon or the thermal sysfs exists."""
+        return (os.path.isdir(os.path.join(self.root, 'class', 'hwmon')) or
+                os.path.isdir(os.path.join(self.root, 'class', 'thermal')))
+
+    def close(self):
+        """Close the input files."""
+        for sensor in self.sensors:
+            try:
+                os.close(sensor['fd'])
+            except OSError:
+                pass
+        self.sensors = []
+
+    def get_devices(self):
+        """Return the hwmon and thermal devices (to detect the hotplug)."""
+        ret = []
+        for folder in ['hwmon', 'thermal']:
+            try:
+                ret.append(sorted(os.listdir(os.path.join(self.root, 'class', folder))))
+            except OSError:
+                ret.append([])
+        return ret
+
+    def inputs(self, prefix):
+        """Return the sorted hwmon input files of the given type (temp or fan)."""
+        hwmon = os.path.join(self.root, 'class', 'hwmon', 'hwmon*')
+        ret = glob.glob(os.path.join(hwmon, prefix + '*_input'))
+        if not ret or prefix == 'temp':
+            # CentOS has an intermediate /device directory
+            ret += glob.glob(os.path.join(hwmon, 'device', prefix + '*_input'))
+        return sorted(ret)
+
+    def discover(self):
+        """Discover the sensors and open their input files."""
+        self.close()
+        # List of (unit, chip name, label, input file, scale)
+        found = []
+        temps = self.inputs('temp')
+        for path in temps:
+            base = path[:-len('_input')]
+            found.append((SENSOR_TEMP_UNIT,
+                          read_file(os.path.join(os.path.dirname(path), 'name')),
+                          read_file(base + '_label'), path, 1000.0))
+        if not temps:
+            # No hwmon temperature: use the thermal zones
+            for zone in sorted(glob.glob(os.path.join(self.root, 'class', 'thermal', 'thermal_zone*'))):
+                found.append((SENSOR_TEMP_UNIT, read_file(os.path.join(zone, 'type')), '',
+                              os.path.join(zone, 'temp'), 1000.0))
+        for path in self.inputs('fan'):
+            found.append((SENSOR_FAN_UNIT,
+                          read_file(os.path.join(os.path.dirname(path), 'name')),
+                          read_file(path[:-len('_input')] + '_label'), path, 1))
+
+        # Group the sensors by chip (as psutil) and number the sensors without label
+        chips = []
+        for unit, chip, _, _, _ in found:
+            if (unit, chip) not in chips:
+                chips.append((unit, chip))
+        for unit, chip in chips:
+            i = 1
+            for sensor in [s for s in found if s[0] == unit and s[1] == chip]:
+                try:
+                    fd = os.open(sensor[3], os.O_RDONLY)
+                except OSError as e:
+                    logger.debug("Cannot open sensor {} ({})".format(sensor[3], e))
+                    continue
+                self.sensors.append({'unit': unit,
+                                     'label': sensor[2] or '{} {}'.format(chip, i),
+                                     'fd': fd,
+                                     'scale': sensor[4]})
+                i += 1
+        logger.debug("{} sensors found in {}".format(len(self.sensors), self.root))
+
+    def update(self):
+        """Read the sensors.
+
+        Output: a list of dict {'label': ..., 'value': ..., 'unit': ...}
+        """
+        devices = self.get_devices()
+        if self.timer.finished() or devices != self.devices:
+            self.discover()
+            self.devices = devices
+            self.timer = Timer(self.refresh)
+
+        ret = []
+        for sensor in self.sensors:
+            try:
+                value = int(int(pread(sensor['fd'])) / sensor['scale'])
+            except (OSError, ValueError):
+                # Sensor not readable (for example ENODATA or EIO)
+                continue
+            ret.append({'label': sensor['label'],
+                        'value': value,
+                        'unit': sensor['unit']})
+        return ret
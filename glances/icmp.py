@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""ICMP echo (ping) probes of many hosts from a single socket (IPv4 only)."""
+
+import os
+import select
+import socket
+import struct
+import time
+from collections import deque
+
+from glances.logger import logger
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+
+def checksum(data):
+    """Return the Internet checksum (RFC 1071) of the data."""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack('!{}H'.format(len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def icmp_socket():
+    """Return an ICMP socket or None if not allowed.
+
+    The unprivileged datagram ICMP socket is used where available (Linux with
+    the net.ipv4.ping_group_range sysctl, macOS), else a raw socket (root).
+    """
+    for sock_type in [socket.SOCK_DGRAM, socket.SOCK_RAW]:
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+        except (socket.error, OSError) as e:
+            logger.debug("Cannot create ICMP socket (type {}): {}".format(sock_type, e))
+            continue
+        sock.setblocking(False)
+        return sock
+    return None
+
+
+class GlancesIcmp(object):
+
+    """Send ICMP echo requests to all the hosts at once and match the replies.
+
+    The replies are matched by source address and sequence number (the Linux
+    datagram ICMP sockets rewrite the identifier). The RTT, jitter and loss
+    are computed over a sliding window of the last <window> probes per host.
+    """
+
+    def __init__(self, window=10):
+        self.window = window
+        self.sock = icmp_socket()
+        # The raw sockets receive the replies to the other processes
+        self.raw = self.sock is not None and self.sock.type == socket.SOCK_RAW
+        self.identifier = os.getpid() & 0xffff
+        self.sequence = 0
+        # Last probes per host: {host: deque([rtt or None, ...])}
+        self.history = {}
+
+    def available(self):
+        """Return True if the ICMP socket is available."""
+        return self.sock is not None
+
+    def close(self):
+        """Close the ICMP socket."""
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def packet(self, sequence):
+        """Return an ICMP echo request."""
+        payload = struct.pack('!d', time.time())
+        header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, self.identifier, sequence)
+        return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0,
+                           checksum(header + payload), self.identifier, sequence) + payload
+
+    def parse(self, data):
+        """Return the (type, identifier, sequence) of a received ICMP packet."""
+        if len(data) >= 20 and ord(data[0:1]) >> 4 == 4:
+            # Raw sockets (and macOS datagram sockets) receive the IP header
+            data = data[(ord(data[0:1]) & 0x0f) * 4:]
+        if len(data) < 8:
+            return None
+        icmp_type, _, _, identifier, sequence = struct.unpack('!BBHHH', data[:8])
+        return icmp_type, identifier, sequence
+
+    def probe(self, hosts, timeout=1):
+        """Send one echo request to each host and wait for the replies.
+
+        Input: list of IPv4 addresses
+        Output: a dict {host: RTT in second or None (lost)}
+        """
+        ret = dict([(host, None) for host in hosts])
+        # Sent requests: {(host, sequence): sent time}
+        pending = {}
+        for host in ret:
+            self.sequence = (self.sequence + 1) & 0xffff
+            try:
+                self.sock.sendto(self.packet(self.sequence), (host, 0))
+            except (socket.error, OSError) as e:
+                logger.debug("Cannot send ICMP echo request to {} ({})".format(host, e))
+                continue
+            pending[(host, self.sequence)] = time.time()
+
+        deadline = time.time() + timeout
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                break
+            try:
+                data, address = self.sock.recvfrom(1024)
+            except (socket.error, OSError):
+                continue
+            received = time.time()
+            packet = self.parse(data)
+            if packet is None or packet[0] != ICMP_ECHO_REPLY:
+                continue
+            if self.raw and packet[1] != self.identifier:
+                # Reply to another process
+                continue
+            sent = pending.pop((address[0], packet[2]), None)
+            if sent is not None:
+                ret[address[0]] = received - sent
+
+        for host, rtt in ret.items():
+            self.history.setdefault(host, deque(maxlen=self.window)).append(rtt)
+        return ret
+
+    def stats(self, host):
+        """Return the stats of the host over the sliding window.
+
+        Output: a dict {'rtt': last RTT, 'rtt_avg': ..., 'jitter': ..., 'loss': percent}
+        (RTT and jitter in second)
+        """
+        history = self.history.get(host)
+        if not history:
+            return {}
+        rtts = [rtt for rtt in history if rtt is not None]
+        ret = {'rtt': history[-1],
+               'loss': 100.0 * (len(history) - len(rtts)) / len(history),
+               'rtt_avg': sum(rtts) / len(rtts) if rtts else None,
+               'jitter': None}
+        if len(rtts) > 1:
+            # Mean deviation between two consecutive RTTs (RFC 3550 like)
+            ret['jitter'] = sum(abs(rtts[i] - rtts[i - 1]) for i in range(1, len(rtts))) / (len(rtts) - 1)
+        return ret
+
+    def forget(self, hosts):
+        """Forget the hosts not in the hosts list."""
+        for host in list(self.history):
+            if host not in hosts:
+                del self.history[host]
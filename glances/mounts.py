@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Mount points list and hang-proof file systems usage."""
+
+import os
+import re
+import select
+import threading
+import time
+from collections import namedtuple
+
+from glances.compat import listkeys, queue
+from glances.globals import LINUX
+from glances.logger import logger
+
+import psutil
+
+# Same fields as the psutil disk_partitions items
+Partition = namedtuple('Partition', ['device', 'mountpoint', 'fstype', 'opts'])
+
+# Octal escapes of the mountinfo paths (\040 for a space)
+ESCAPE_RE = re.compile(r'\\([0-7]{3})')
+
+
+def unescape(path):
+    """Return the path with the octal escapes replaced."""
+    return ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), path)
+
+
+def parse_mountinfo(data):
+    """Return the partitions (list of Partition) of a /proc/<pid>/mountinfo file content."""
+    ret = []
+    for line in data.splitlines():
+        # 36 35 98:0 /mnt1 /mnt2 rw,noatime master:1 - ext3 /dev/root rw,errors=continue
+        fields = line.split()
+        try:
+            sep = fields.index('-', 6)
+            device = unescape(fields[sep + 2])
+            ret.append(Partition('' if device == 'none' else device,
+                                 unescape(fields[4]),
+                                 fields[sep + 1],
+                                 fields[5]))
+        except (ValueError, IndexError):
+            continue
+    return ret
+
+
+def physical_fstypes(data):
+    """Return the physical file system types of a /proc/filesystems file content.
+
+    As psutil, zfs is the only nodev file system considered as physical.
+    """
+    ret = set()
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) == 1:
+            ret.add(fields[0])
+        elif fields == ['nodev', 'zfs']:
+            ret.add('zfs')
+    return ret
+
+
+class GlancesMounts(object):
+
+    """Return the mounted partitions.
+
+    On Linux, /proc/self/mountinfo is only read again when the kernel
+    reports a change of the mount table (poll on the file). Elsewhere,
+    psutil.disk_partitions is used.
+    """
+
+    def __init__(self, mountinfo='/proc/self/mountinfo', filesystems='/proc/filesystems'):
+        self.mountinfo = mountinfo
+        self.filesystems = filesystems
+        self.fd = None
+        self.poller = None
+        # Partitions and physical file system types at the last read
+        self.partitions = []
+        self.fstypes = set()
+        if LINUX and hasattr(select, 'poll'):
+            try:
+                self.fd = os.open(self.mountinfo, os.O_RDONLY)
+            except OSError as e:
+                logger.debug("Cannot open {} ({})".format(self.mountinfo, e))
+            else:
+                self.poller = select.poll()
+                self.poller.register(self.fd, select.POLLPRI | select.POLLERR)
+                self.read()
+
+    def close(self):
+        """Close the mountinfo file."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def read(self):
+        """Read the mount table and the file system types."""
+        data = b''
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        while True:
+            chunk = os.read(self.fd, 65536)
+            if not chunk:
+                break
+            data += chunk
+        self.partitions = parse_mountinfo(data.decode('utf-8', 'replace'))
+        try:
+            with open(self.filesystems, 'r') as f:
+                self.fstypes = physical_fstypes(f.read())
+        except (IOError, OSError):
+            self.fstypes = set()
+
+    def changed(self):
+        """Return True if the mount table changed since the last read."""
+        return bool(self.poller.poll(0))
+
+    def get(self, allow=None):
+        """Return the physical partitions and the partitions of the allowed file system types.
+
+        allow: list of file system types (substring match, for example zfs)
+        """
+        allow = allow or []
+        if self.fd is None:
+            ret = psutil.disk_partitions(all=False)
+            if allow:
+                ret += [p for p in psutil.disk_partitions(all=True)
+                        if any(p.fstype.find(fstype) >= 0 for fstype in allow)]
+        else:
+            if self.changed():
+                self.read()
+            ret = [p for p in self.partitions
+                   if (p.device and p.fstype in self.fstypes) or
+                   any(p.fstype.find(fstype) >= 0 for fstype in allow)]
+        # A mount point is only displayed once (the last mount hides the previous ones)
+        mountpoints = {}
+        for p in ret:
+            mountpoints[p.mountpoint] = p
+        return [p for p in ret if mountpoints[p.mountpoint] is p]
+
+
+class GlancesFsUsage(object):
+
+    """Read the file systems usage (statvfs) in worker threads.
+
+    Each update waits at most <timeout> seconds for all the mount points.
+    A mount point not answering in time (hung NFS/CIFS server...) is marked
+    as stale and keeps its last known usage; it is not read again while
+    its previous call is running and then only after an exponential back
+    off (at most <backoff_max> seconds).
+
+    A worker stuck on a hung mount point is replaced by a new one, so at
+    least <workers> threads are always available for the other mount points.
+    """
+
+    def __init__(self, workers=4, timeout=1.0, backoff_max=300):
+        self.workers = max(int(workers), 1)
+        self.timeout = timeout
+        self.backoff_max = backoff_max
+        self.queue = queue.Queue()
+        self.cond = threading.Condition()
+        self.threads = 0
+        # Running calls: {mount point: start time}
+        self.pending = {}
+        # Last usage: {mount point: psutil sdiskusage}
+        self.usage = {}
+        # Mount points with an error at the last call (ejected disk...)
+        self.errors = set()
+        # Consecutive timeouts and next try time: {mount point: ...}
+        self.failures = {}
+        self.next_try = {}
+
+    def exit(self):
+        """Stop the idle workers (the stuck ones are daemon threads)."""
+        for _ in range(self.threads):
+            self.queue.put(None)
+
+    def worker(self):
+        """Read the usage of the queued mount points."""
+        while True:
+            mountpoint = self.queue.get()
+            if mountpoint is None:
+                return
+            try:
+                usage = psutil.disk_usage(mountpoint)
+            except OSError as e:
+                # Correct issue #346
+                # Disk is ejected during the command
+                logger.debug("Cannot read the usage of {} ({})".format(mountpoint, e))
+                usage = None
+            with self.cond:
+                del self.pending[mountpoint]
+                if usage is None:
+                    self.errors.add(mountpoint)
+                else:
+                    self.errors.discard(mountpoint)
+                    self.usage[mountpoint] = usage
+                self.cond.notify_all()
+                if self.threads > self.workers + len(self.pending):
+                    # Extra worker started to replace a stuck one
+                    self.threads -= 1
+                    return
+
+    def start_workers(self):
+        """Start the workers (the stuck workers are not counted)."""
+        while self.threads < self.workers + len(self.pending) - self.queue.qsize():
+            thread = threading.Thread(target=self.worker, name='glances-fs')
+            thread.daemon = True
+            thread.start()
+            self.threads += 1
+
+    def update(self, mountpoints):
+        """Read the usage of the mount points.
+
+        Output: a dict {mount point: (usage, stale)}
+        The usage of a stale mount point never read is None.
+        The mount points with an error are not returned.
+        """
+        now = time.time()
+        with self.cond:
+            # Forget the unmounted file systems
+            for mountpoint in listkeys(self.usage) + listkeys(self.failures):
+                if mountpoint not in mountpoints:
+                    self.usage.pop(mountpoint, None)
+                    self.failures.pop(mountpoint, None)
+                    self.next_try.pop(mountpoint, None)
+            self.errors.intersection_update(mountpoints)
+
+            submitted = []
+            for mountpoint in mountpoints:
+                if mountpoint in self.pending or self.next_try.get(mountpoint, 0) > now:
+                    continue
+                self.pending[mountpoint] = now
+                submitted.append(mountpoint)
+                self.queue.put(mountpoint)
+            self.start_workers()
+
+            # Wait for the submitted mount points
+            deadline = now + self.timeout
+            while any(m in self.pending for m in submitted):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+
+            ret = {}
+            for mountpoint in mountpoints:
+                stale = mountpoint in self.pending or mountpoint not in submitted
+                if mountpoint in submitted and stale:
+                    # Timeout: back off
+                    failures = self.failures.get(mountpoint, 0) + 1
+                    self.failures[mountpoint] = failures
+                    self.next_try[mountpoint] = now + min(2 ** failures, self.backoff_max)
+                    logger.debug("Usage of {} not read in {} seconds ({} times)".format(
+                        mountpoint, self.timeout, failures))
+                elif mountpoint in submitted:
+                    self.failures.pop(mountpoint, None)
+                    self.next_try.pop(mountpoint, None)
+                if mountpoint in self.errors and not stale:
+                    continue
+                if mountpoint in self.usage:
+                    ret[mountpoint] = (self.usage[mountpoint], stale)
+                elif stale:
+                    # Hung since its first read: unknown usage
+                    ret[mountpoint] = (None, stale)
+        return ret
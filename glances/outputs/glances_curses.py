@@ -103,7 +103,7 @@ class _GlancesCurses(object):
     _left_sidebar_max_width = 34
 
     # Define right sidebar
-    _right_sidebar = ['docker', 'processcount', 'amps', 'processlist', 'alert']
+    _right_sidebar = ['docker', 'containers', 'processcount', 'amps', 'processlist', 'alert']
 
     def __init__(self, config=None, args=None):
         # Init
@@ -518,6 +518,8 @@ class _GlancesCurses(object):
             self.screen.getmaxyx()[0] - 11 -
             (0 if 'docker' not in __stat_display else
                 self.get_stats_display_height(__stat_display["docker"])) -
+            (0 if 'containers' not in __stat_display else
+                self.get_stats_display_height(__stat_display["containers"])) -
             (0 if 'processcount' not in __stat_display else
                 self.get_stats_display_height(__stat_display["processcount"])) -
             (0 if 'amps' not in __stat_display else
@@ -723,7 +725,7 @@ class _GlancesCurses(object):
     def __display_right(self, stat_display):
         """Display the right sidebar in the Curses interface.
 
-        docker + processcount + amps + processlist + alert
+        docker + containers + processcount + amps + processlist + alert
         """
         # Do not display anything if space is not available...
         if self.screen.getmaxyx()[1] < self._left_sidebar_min_width:
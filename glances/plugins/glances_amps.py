@@ -41,6 +41,12 @@ class Plugin(GlancesPlugin):
         # Init the list of AMP (classe define in the glances/amps_list.py script)
         self.glances_amps = glancesAmpsList(self.args, self.config)
 
+    def exit(self):
+        """Overwrite the exit method to stop the AMPs."""
+        self.glances_amps.exit()
+        # Call the father class
+        super(Plugin, self).exit()
+
     @GlancesPlugin._check_decorator
     @GlancesPlugin._log_result_decorator
     def update(self):
@@ -50,6 +56,8 @@ class Plugin(GlancesPlugin):
 
         if self.input_method == 'local':
             for k, v in iteritems(self.glances_amps.update()):
+                # Last update time (in seconds) and number of timeouts
+                metrics = self.glances_amps.executor.get(k) or {}
                 stats.append({'key': k,
                               'name': v.NAME,
                               'result': v.result(),
@@ -57,7 +65,9 @@ class Plugin(GlancesPlugin):
                               'timer': v.time_until_refresh(),
                               'count': v.count(),
                               'countmin': v.count_min(),
-                              'countmax': v.count_max()})
+                              'countmax': v.count_max(),
+                              'run_time': metrics.get('run_time'),
+                              'timeouts': metrics.get('timeouts', 0)})
         else:
             # Not available in SNMP mode
             pass
@@ -20,6 +20,10 @@
 """Connections plugin."""
 from __future__ import unicode_literals
 
+import re
+from collections import Counter
+
+from glances.globals import LINUX
 from glances.logger import logger
 from glances.timer import getTimeSinceLastUpdate
 from glances.plugins.glances_plugin import GlancesPlugin
@@ -27,6 +31,60 @@ from glances.compat import n, u, b, nativestr
 
 import psutil
 
+# TCP sockets tables (Linux)
+PROC_NET_TCP = ['/proc/net/tcp', '/proc/net/tcp6']
+
+# State column of the /proc/net/tcp{,6} lines (after the remote port)
+#   sl  local_address rem_address   st tx_queue ...
+#    0: 0100007F:BC8F 00000000:0000 0A 00000000:00000000 ...
+TCP_STATE_RE = re.compile(br':[0-9A-F]{4} ([0-9A-F]{2}) ')
+
+# TCP states (include/net/tcp_states.h)
+TCP_STATES = {b'01': psutil.CONN_ESTABLISHED,
+              b'02': psutil.CONN_SYN_SENT,
+              b'03': psutil.CONN_SYN_RECV,
+              b'04': psutil.CONN_FIN_WAIT1,
+              b'05': psutil.CONN_FIN_WAIT2,
+              b'06': psutil.CONN_TIME_WAIT,
+              b'07': psutil.CONN_CLOSE,
+              b'08': psutil.CONN_CLOSE_WAIT,
+              b'09': psutil.CONN_LAST_ACK,
+              b'0A': psutil.CONN_LISTEN,
+              b'0B': psutil.CONN_CLOSING}
+
+
+def tcp_states_count(files=None, chunk_size=1024 * 1024):
+    """Return the number of TCP sockets per state from the /proc/net/tcp{,6} files.
+
+    The files are read by chunks and only the state column is extracted:
+    no object is built per socket (and the sockets are not mapped to the
+    processes, unlike psutil.net_connections).
+
+    Output: a Counter {psutil.CONN_*: count}
+    Raise IOError if /proc/net/tcp can not be read
+    """
+    counts = Counter()
+    for i, file_name in enumerate(files or PROC_NET_TCP):
+        try:
+            f = open(file_name, 'rb')
+        except (IOError, OSError):
+            if i == 0:
+                raise
+            # No IPv6
+            continue
+        with f:
+            remaining = b''
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                # Only complete lines are parsed
+                chunk, _, next_remaining = (remaining + chunk).rpartition(b'\n')
+                remaining = next_remaining
+                counts.update(TCP_STATE_RE.findall(chunk))
+            counts.update(TCP_STATE_RE.findall(remaining))
+    return Counter(dict((TCP_STATES.get(k, k), v) for k, v in counts.items()))
+
 # Define the history items list
 # items_history_list = [{'name': 'rx',
 #                        'description': 'Download rate per second',
@@ -86,7 +144,11 @@ class Plugin(GlancesPlugin):
             # Grab network interface stat using the psutil net_connections method
             if self.net_connections_enabled:
                 try:
-                    net_connections = psutil.net_connections(kind="tcp")
+                    if LINUX:
+                        # One pass on the sockets tables
+                        net_connections = tcp_states_count()
+                    else:
+                        net_connections = Counter(c.status for c in psutil.net_connections(kind="tcp"))
                 except Exception as e:
                     logger.debug('Can not get network connections stats ({})'.format(e))
                     self.net_connections_enabled = False
@@ -94,15 +156,15 @@ class Plugin(GlancesPlugin):
                     return self.stats
 
                 for s in self.status_list:
-                    stats[s] = len([c for c in net_connections if c.status == s])
+                    stats[s] = net_connections[s]
                 initiated = 0
                 for s in self.initiated_states:
-                    stats[s] = len([c for c in net_connections if c.status == s])
+                    stats[s] = net_connections[s]
                     initiated += stats[s]
                 stats['initiated'] = initiated
                 terminated = 0
-                for s in self.initiated_states:
-                    stats[s] = len([c for c in net_connections if c.status == s])
+                for s in self.terminated_states:
+                    stats[s] = net_connections[s]
                     terminated += stats[s]
                 stats['terminated'] = terminated
 
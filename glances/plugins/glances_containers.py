@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Containers plugin (processes grouped by container and Kubernetes pod)."""
+
+from glances.compat import itervalues
+from glances.cgroups import GlancesPidContainers
+from glances.globals import LINUX
+from glances.plugins.glances_plugin import GlancesPlugin
+from glances.processes import glances_processes, sort_stats
+
+
+class Plugin(GlancesPlugin):
+    """Glances containers plugin.
+
+    The processes are mapped to their container (and pod) from their cgroup.
+    stats is a list of dict, one per container and one per pod:
+    {'type': 'container' or 'pod', 'id': ..., 'cpu_percent': ..., 'memory_rss': ...,
+     'io_r': ..., 'io_w': ..., 'processes': ...}
+    """
+
+    def __init__(self, args=None, config=None):
+        """Init the plugin."""
+        super(Plugin, self).__init__(args=args,
+                                     config=config,
+                                     stats_init_value=[])
+
+        # We want to display the stat in the curse interface
+        self.display_curse = True
+
+        # PID to container/pod cache
+        self.pid_containers = GlancesPidContainers()
+
+    def get_key(self):
+        """Return the key of the list."""
+        return 'id'
+
+    @GlancesPlugin._check_decorator
+    @GlancesPlugin._log_result_decorator
+    def update(self):
+        """Update the containers stats using the input method."""
+        # Init new stats
+        stats = self.get_init_value()
+
+        if self.input_method == 'local' and LINUX:
+            # Sum the processes stats per container and per pod (one pass)
+            # Note: the processes list is updated by the processcount plugin
+            containers = {}
+            pods = {}
+            # Processes (pid, create time): the pids may be reused
+            procs = set()
+            for proc in glances_processes.getlist():
+                procs.add((proc['pid'], proc.get('create_time')))
+                container_id, pod_uid = self.pid_containers.get(proc['pid'], proc.get('create_time'))
+                if container_id is None:
+                    # Host process
+                    continue
+                if container_id not in containers:
+                    containers[container_id] = self.init_item('container', container_id, pod=pod_uid)
+                self.add_process(containers[container_id], proc)
+                if pod_uid is not None:
+                    if pod_uid not in pods:
+                        pods[pod_uid] = self.init_item('pod', pod_uid, containers=0)
+                    self.add_process(pods[pod_uid], proc)
+            self.pid_containers.prune(procs)
+
+            for container in itervalues(containers):
+                if container['pod'] is not None:
+                    pods[container['pod']]['containers'] += 1
+            stats = sort_stats(list(itervalues(pods)) + list(itervalues(containers)),
+                               sortedby='cpu_percent',
+                               sortedby_secondary='memory_rss')
+
+        elif self.input_method == 'snmp':
+            # Update stats using SNMP
+            # Not available
+            pass
+
+        # Update the stats
+        self.stats = stats
+
+        return self.stats
+
+    def init_item(self, item_type, item_id, **kwargs):
+        """Return a new container/pod item."""
+        ret = {'key': self.get_key(),
+               'type': item_type,
+               'id': item_id,
+               'processes': 0,
+               'cpu_percent': 0.0,
+               'memory_rss': 0,
+               'io_r': 0,
+               'io_w': 0}
+        ret.update(kwargs)
+        return ret
+
+    @staticmethod
+    def add_process(item, proc):
+        """Add the stats of the process to the container/pod item."""
+        item['processes'] += 1
+        item['cpu_percent'] += proc['cpu_percent'] or 0.0
+        if proc['memory_info'] is not None:
+            item['memory_rss'] += proc['memory_info'][0]
+        # io_counters: [read_bytes, write_bytes, read_bytes_old, write_bytes_old, io_tag]
+        io = proc['io_counters']
+        if io[4] == 1 and proc['time_since_update']:
+            item['io_r'] += (io[0] - io[2]) // proc['time_since_update']
+            item['io_w'] += (io[1] - io[3]) // proc['time_since_update']
+
+    def msg_curse(self, args=None, max_width=None):
+        """Return the dict to display in the curse interface."""
+        # Init the return message
+        ret = []
+
+        # Only process if stats exist and display plugin enable...
+        if not self.stats or self.is_disable():
+            return ret
+
+        # Max number of pods and of containers displayed
+        max_items = int(self.get_conf_value('max_items', default=5))
+
+        for item_type, title in [('pod', 'PODS'), ('container', 'CONTAINERS PROCESSES')]:
+            items = [i for i in self.stats if i['type'] == item_type]
+            if not items:
+                continue
+            if ret:
+                ret.append(self.curse_new_line())
+            # Title
+            msg = '{}'.format(title)
+            ret.append(self.curse_add_line(msg, "TITLE"))
+            msg = ' {}'.format(len(items))
+            ret.append(self.curse_add_line(msg))
+            ret.append(self.curse_new_line())
+            # Header
+            msg = ' {:36}'.format('Uid' if item_type == 'pod' else 'Id')
+            ret.append(self.curse_add_line(msg))
+            for msg in ['{:>6}'.format('CPU%'), '{:>7}'.format('MEM'),
+                        '{:>7}'.format('IOR/s'), '{:>7}'.format('IOW/s'),
+                        '{:>6}'.format('Procs')]:
+                ret.append(self.curse_add_line(msg))
+            if item_type == 'pod':
+                ret.append(self.curse_add_line('{:>6}'.format('Ctnrs')))
+            # Data (sorted by CPU)
+            for item in items[:max_items]:
+                ret.append(self.curse_new_line())
+                msg = ' {:36}'.format(item['id'] if item_type == 'pod' else item['id'][:12])
+                ret.append(self.curse_add_line(msg))
+                msg = '{:>6.1f}'.format(item['cpu_percent'])
+                ret.append(self.curse_add_line(msg))
+                msg = '{:>7}'.format(self.auto_unit(item['memory_rss']))
+                ret.append(self.curse_add_line(msg))
+                for key in ['io_r', 'io_w']:
+                    msg = '{:>7}'.format(self.auto_unit(item[key]) + 'B')
+                    ret.append(self.curse_add_line(msg))
+                msg = '{:>6}'.format(item['processes'])
+                ret.append(self.curse_add_line(msg))
+                if item_type == 'pod':
+                    msg = '{:>6}'.format(item['containers'])
+                    ret.append(self.curse_add_line(msg))
+
+        return ret
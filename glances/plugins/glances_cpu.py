@@ -25,8 +25,7 @@ from glances.cpu_percent import cpu_percent
 from glances.globals import LINUX
 from glances.plugins.glances_core import Plugin as CorePlugin
 from glances.plugins.glances_plugin import GlancesPlugin
-
-import psutil
+from glances.procfs import procfs
 
 # SNMP OID
 # percentage of user CPU time: .1.3.6.1.4.1.2021.11.9.0
@@ -93,8 +92,8 @@ class Plugin(GlancesPlugin):
         return self.stats
 
     def update_local(self):
-        """Update CPU stats using psutil."""
-        # Grab CPU stats using psutil's cpu_percent and cpu_times_percent
+        """Update CPU stats using the kernel stats."""
+        # Grab CPU stats using the shared cpu_percent and cpu_times_percent
         # Get all possible values for CPU stats: user, system, idle,
         # nice (UNIX), iowait (Linux), irq (Linux, FreeBSD), steal (Linux 2.6.11+)
         # The following stats are returned by the API but not displayed in the UI:
@@ -104,18 +103,18 @@ class Plugin(GlancesPlugin):
         stats = self.get_init_value()
 
         stats['total'] = cpu_percent.get()
-        cpu_times_percent = psutil.cpu_times_percent(interval=0.0)
+        cpu_times_percent = cpu_percent.get_times_percent()
         for stat in ['user', 'system', 'idle', 'nice', 'iowait',
                      'irq', 'softirq', 'steal', 'guest', 'guest_nice']:
-            if hasattr(cpu_times_percent, stat):
-                stats[stat] = getattr(cpu_times_percent, stat)
+            if stat in cpu_times_percent:
+                stats[stat] = cpu_times_percent[stat]
 
         # Additional CPU stats (number of events not as a %; psutil>=4.1.0)
         # ctx_switches: number of context switches (voluntary + involuntary) per second
         # interrupts: number of interrupts per second
         # soft_interrupts: number of software interrupts per second. Always set to 0 on Windows and SunOS.
         # syscalls: number of system calls since boot. Always set to 0 on Linux.
-        cpu_stats = psutil.cpu_stats()
+        cpu_stats = procfs.cpu_stats()
         # By storing time data we enable Rx/s and Tx/s calculations in the
         # XML/RPC API, which would otherwise be overly difficult work
         # for users of the API
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Per-CPU summary plugin."""
+
+from glances.compat import iteritems
+from glances.cpu_percent import cpu_percent
+from glances.plugins.glances_plugin import GlancesPlugin
+
+
+class Plugin(GlancesPlugin):
+    """Glances per-CPU summary plugin.
+
+    Summary of the per-CPU stats for the hosts with many CPUs.
+
+    stats is a dict with the keys:
+    - cpus: number of CPUs
+    - top: per-CPU stats of the busiest CPUs
+    - sockets: average per-CPU stats per socket (list of dict)
+    - nodes: average per-CPU stats per NUMA node (list of dict)
+    - histogram: number of CPUs per usage bucket (0-10%, 10-20%... 90-100%)
+    """
+
+    def __init__(self, args=None, config=None):
+        """Init the plugin."""
+        super(Plugin, self).__init__(args=args, config=config)
+
+        # We dot not want to display the stat in the curse interface
+        # The summary is displayed by the percpu plugin
+        self.display_curse = False
+
+    def get_export(self):
+        """Overwrite the default export method.
+
+        The summary is flattened (the exports only keep the first item of a list):
+        - cpus: number of CPUs
+        - top<rank>_cpu_number and top<rank>_total: busiest CPUs (rank from 1)
+        - socket<id>_<stat> and node<id>_<stat>: average stats per socket and node
+        - histogram_<min>_<max>: number of CPUs per usage bucket
+        """
+        if not self.stats:
+            return {}
+        ret = {'cpus': self.stats['cpus']}
+        for rank, cpu in enumerate(self.stats['top'], 1):
+            ret['top{}_cpu_number'.format(rank)] = cpu['cpu_number']
+            ret['top{}_total'.format(rank)] = cpu['total']
+        for name in ['socket', 'node']:
+            for group in self.stats[name + 's']:
+                for key, value in iteritems(group):
+                    if key != name:
+                        ret['{}{}_{}'.format(name, group[name], key)] = value
+        step = 100 // len(self.stats['histogram'])
+        for i, count in enumerate(self.stats['histogram']):
+            ret['histogram_{}_{}'.format(i * step, (i + 1) * step)] = count
+        return ret
+
+    @GlancesPlugin._check_decorator
+    @GlancesPlugin._log_result_decorator
+    def update(self):
+        """Update the per-CPU summary using the input method."""
+        # Init new stats
+        stats = self.get_init_value()
+
+        if self.input_method == 'local':
+            # Number of busiest CPUs
+            stats = cpu_percent.get_summary(top=int(self.get_conf_value('top', default=4)))
+        elif self.input_method == 'snmp':
+            # Not available
+            pass
+
+        # Update the stats
+        self.stats = stats
+
+        return self.stats
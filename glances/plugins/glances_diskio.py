@@ -23,8 +23,7 @@ from __future__ import unicode_literals
 from glances.compat import nativestr, n
 from glances.timer import getTimeSinceLastUpdate
 from glances.plugins.glances_plugin import GlancesPlugin
-
-import psutil
+from glances.procfs import procfs
 
 
 # Define the history items list
@@ -65,7 +64,7 @@ class Plugin(GlancesPlugin):
 
         if self.input_method == 'local':
             # Update stats using the standard system lib
-            # Grab the stat using the psutil disk_io_counters method
+            # Grab the stat using the (psutil like) disk_io_counters method
             # read_count: number of reads
             # write_count: number of writes
             # read_bytes: number of bytes read
@@ -73,7 +72,7 @@ class Plugin(GlancesPlugin):
             # read_time: time spent reading from disk (in milliseconds)
             # write_time: time spent writing to disk (in milliseconds)
             try:
-                diskiocounters = psutil.disk_io_counters(perdisk=True)
+                diskiocounters = procfs.disk_io_counters()
             except Exception:
                 return stats
 
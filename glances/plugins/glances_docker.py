@@ -24,8 +24,9 @@ import threading
 import time
 
 from glances.logger import logger
-from glances.compat import iterkeys, itervalues, nativestr
+from glances.compat import iteritems, iterkeys, itervalues, nativestr
 from glances.timer import getTimeSinceLastUpdate
+from glances.cgroups import GlancesCgroups
 from glances.plugins.glances_plugin import GlancesPlugin
 from glances.processes import sort_stats as sort_stats_processes, weighted, glances_processes
 
@@ -40,6 +41,12 @@ except Exception as e:
 else:
     import_error_tag = False
 
+# The asyncio collector needs Python 3.5 or higher
+try:
+    from glances.docker_async import GlancesDockerAsync
+except (ImportError, SyntaxError):
+    GlancesDockerAsync = None
+
 # Define the items history list (list of items to add to history)
 # TODO: For the moment limited to the CPU. Had to change the graph exports
 #       method to display one graph per container.
@@ -92,10 +99,40 @@ class Plugin(GlancesPlugin):
         # value: instance of ThreadDockerGrabber
         self.thread_list = {}
 
+        # Containers list, maintained from the Docker events
+        # (instance of ThreadDockerInventory, started by the first update)
+        self.inventory = None
+        # Image tags cache: {image id: tags}
+        self.image_tags = {}
+
+        # Stats collector:
+        # - api: one Docker stats stream (and thread) per container
+        # - cgroup: read the cgroup and /proc hierarchies of all the containers in one pass
+        # - async: fetch the stats of all the containers with a few asyncio requests
+        self.collector = self._collector_tag()
+        self.cgroups = None
+        self.docker_async = None
+        if self.collector == 'cgroup':
+            self.cgroups = GlancesCgroups()
+            if not self.cgroups.available():
+                logger.warning("docker plugin - Cannot read the cgroup hierarchies, use the Docker API collector")
+                self.collector = 'api'
+        elif self.collector == 'async':
+            if GlancesDockerAsync is None:
+                logger.warning("docker plugin - The async collector needs Python 3.5 or higher, use the Docker API collector")
+                self.collector = 'api'
+            else:
+                self.docker_async = GlancesDockerAsync(concurrency=self.get_conf_value('concurrency', default=16),
+                                                       deadline=self.get_conf_value('deadline', default=1.0))
+
     def exit(self):
         """Overwrite the exit method to close threads."""
         for t in itervalues(self.thread_list):
             t.stop()
+        if self.docker_async is not None:
+            self.docker_async.exit()
+        if self.inventory is not None:
+            self.inventory.stop()
         # Call the father class
         super(Plugin, self).exit()
 
@@ -139,6 +176,19 @@ class Plugin(GlancesPlugin):
         else:
             return all_tag[0].lower() == 'true'
 
+    def _collector_tag(self):
+        """Return the collector tag of the Glances/Docker configuration file.
+
+        # Read the containers stats from the Docker API (api, default),
+        # from the cgroup hierarchies (cgroup) or with asyncio requests (async)
+        collector=api
+        """
+        collector_tag = self.get_conf_value('collector')
+        if len(collector_tag) == 0:
+            return 'api'
+        else:
+            return collector_tag[0].lower()
+
     @GlancesPlugin._check_decorator
     @GlancesPlugin._log_result_decorator
     def update(self):
@@ -174,35 +224,27 @@ class Plugin(GlancesPlugin):
                 self.stats['containers'] = []
                 return self.stats
 
-            # Update current containers list
-            try:
+            # Current containers list
+            # It is not read every refresh but maintained from the Docker events
+            if self.inventory is None:
                 # Issue #1152: Docker module doesn't export details about stopped containers
                 # The Docker/all key of the configuration file should be set to True
-                containers = self.docker_client.containers.list(all=self._all_tag()) or []
-            except Exception as e:
-                logger.error("{} plugin - Cannot get containers list ({})".format(self.plugin_name, e))
-                # We may have lost connection empty the containers list.
-                self.stats['containers'] = []
-                return self.stats
-
-            # Start new thread for new container
-            for container in containers:
-                if container.id not in self.thread_list:
-                    # Thread did not exist in the internal dict
-                    # Create it and add it to the internal dict
-                    logger.debug("{} plugin - Create thread for container {}".format(self.plugin_name, container.id[:12]))
-                    t = ThreadDockerGrabber(container)
-                    self.thread_list[container.id] = t
-                    t.start()
-
-            # Stop threads for non-existing containers
-            nonexisting_containers = set(iterkeys(self.thread_list)) - set([c.id for c in containers])
-            for container_id in nonexisting_containers:
-                # Stop the thread
-                logger.debug("{} plugin - Stop thread for old container {}".format(self.plugin_name, container_id[:12]))
-                self.thread_list[container_id].stop()
-                # Delete the item from the dict
-                del self.thread_list[container_id]
+                self.inventory = ThreadDockerInventory(self.docker_client,
+                                                       all_tag=self._all_tag(),
+                                                       refresh=self.get_conf_value('inventory_refresh', default=300))
+                self.inventory.start()
+            containers = self.inventory.containers
+
+            if self.collector == 'cgroup':
+                # Read the stats of all the running containers in one pass
+                all_stats = self.cgroups.update({c.id: c.attrs['State']['Pid'] for c in containers
+                                                 if c.attrs['State']['Status'] in ('running', 'paused')})
+            elif self.collector == 'async':
+                # Fetch the stats of all the running containers (stream=false)
+                all_stats = self.docker_async.update([c.id for c in containers
+                                                      if c.attrs['State']['Status'] in ('running', 'paused')])
+            else:
+                all_stats = self.update_threads(containers)
 
             # Get stats for all containers
             stats['containers'] = []
@@ -218,20 +260,27 @@ class Plugin(GlancesPlugin):
                 # Container Id
                 container_stats['Id'] = container.id
                 # Container Image
-                container_stats['Image'] = container.image.tags
+                # Container Image (tags are cached, it is an API call)
+                if container.attrs['Image'] not in self.image_tags:
+                    try:
+                        self.image_tags[container.attrs['Image']] = container.image.tags
+                    except Exception as e:
+                        logger.debug("{} plugin - Cannot get image of container {} ({})".format(self.plugin_name, container.name, e))
+                        self.image_tags[container.attrs['Image']] = []
+                container_stats['Image'] = self.image_tags[container.attrs['Image']]
                 # Global stats (from attrs)
                 container_stats['Status'] = container.attrs['State']['Status']
                 container_stats['Command'] = container.attrs['Config']['Entrypoint']
                 # Standards stats
                 if container_stats['Status'] in ('running', 'paused'):
-                    container_stats['cpu'] = self.get_docker_cpu(container.id, self.thread_list[container.id].stats)
+                    container_stats['cpu'] = self.get_docker_cpu(container.id, all_stats.get(container.id, {}))
                     container_stats['cpu_percent'] = container_stats['cpu'].get('total', None)
-                    container_stats['memory'] = self.get_docker_memory(container.id, self.thread_list[container.id].stats)
+                    container_stats['memory'] = self.get_docker_memory(container.id, all_stats.get(container.id, {}))
                     container_stats['memory_usage'] = container_stats['memory'].get('usage', None)
-                    container_stats['io'] = self.get_docker_io(container.id, self.thread_list[container.id].stats)
+                    container_stats['io'] = self.get_docker_io(container.id, all_stats.get(container.id, {}))
                     container_stats['io_r'] = container_stats['io'].get('ior', None)
                     container_stats['io_w'] = container_stats['io'].get('iow', None)
-                    container_stats['network'] = self.get_docker_network(container.id, self.thread_list[container.id].stats)
+                    container_stats['network'] = self.get_docker_network(container.id, all_stats.get(container.id, {}))
                     container_stats['network_rx'] = container_stats['network'].get('rx', None)
                     container_stats['network_tx'] = container_stats['network'].get('tx', None)
                 else:
@@ -258,6 +307,32 @@ class Plugin(GlancesPlugin):
 
         return self.stats
 
+    def update_threads(self, containers):
+        """Start/stop the stats threads and return the last stats of the containers.
+
+        Output: a dict {container id: stats (Docker API layout)}
+        """
+        # Start new thread for new container
+        for container in containers:
+            if container.id not in self.thread_list:
+                # Thread did not exist in the internal dict
+                # Create it and add it to the internal dict
+                logger.debug("{} plugin - Create thread for container {}".format(self.plugin_name, container.id[:12]))
+                t = ThreadDockerGrabber(container)
+                self.thread_list[container.id] = t
+                t.start()
+
+        # Stop threads for non-existing containers
+        nonexisting_containers = set(iterkeys(self.thread_list)) - set([c.id for c in containers])
+        for container_id in nonexisting_containers:
+            # Stop the thread
+            logger.debug("{} plugin - Stop thread for old container {}".format(self.plugin_name, container_id[:12]))
+            self.thread_list[container_id].stop()
+            # Delete the item from the dict
+            del self.thread_list[container_id]
+
+        return {container_id: t.stats for container_id, t in iteritems(self.thread_list)}
+
     def get_docker_cpu(self, container_id, all_stats):
         """Return the container CPU usage.
 
@@ -276,7 +351,9 @@ class Plugin(GlancesPlugin):
         try:
             cpu_new['total'] = all_stats['cpu_stats']['cpu_usage']['total_usage']
             cpu_new['system'] = all_stats['cpu_stats']['system_cpu_usage']
-            cpu_new['nb_core'] = len(all_stats['cpu_stats']['cpu_usage']['percpu_usage'] or [])
+            # percpu_usage is not available with cgroup v2
+            cpu_new['nb_core'] = all_stats['cpu_stats'].get('online_cpus') or \
+                len(all_stats['cpu_stats']['cpu_usage'].get('percpu_usage') or [])
         except KeyError as e:
             # all_stats do not have CPU information
             logger.debug("docker plugin - Cannot grab CPU usage for container {} ({})".format(container_id, e))
@@ -633,6 +710,123 @@ class Plugin(GlancesPlugin):
             return 'CAREFUL'
 
 
+class ThreadDockerInventory(threading.Thread):
+    """
+    Specific thread to maintain the containers list from the Docker events.
+
+    The full list is only read at startup, after a reconnection and every
+    refresh seconds. Between two full lists, only the containers of the
+    received events are inspected.
+    """
+
+    # Events changing the containers list or the containers status
+    events = ('create', 'start', 'restart', 'die', 'kill', 'oom', 'stop',
+              'pause', 'unpause', 'rename', 'update', 'destroy')
+
+    def __init__(self, client, all_tag=False, refresh=300):
+        """Init the class.
+
+        client: instance of Docker-py DockerClient
+        all_tag: list the stopped containers
+        refresh: interval (in seconds) between two full lists
+        """
+        super(ThreadDockerInventory, self).__init__()
+        self.daemon = True
+        # Event needed to stop properly the thread
+        self._stopper = threading.Event()
+        self._client = client
+        self._all = all_tag
+        self._refresh = int(refresh)
+        self._stream = None
+        # Containers: {container id: instance of Docker-py Container}
+        self._containers = {}
+        self._lock = threading.Lock()
+        # First list, so the first refresh is not empty
+        self._since = int(time.time())
+        self.refresh()
+
+    def refresh(self):
+        """Read the full containers list."""
+        try:
+            containers = self._client.containers.list(all=self._all) or []
+        except Exception as e:
+            logger.error("docker plugin - Cannot get containers list ({})".format(e))
+            # The Docker daemon is unreachable: the previous list is stale
+            containers = []
+        with self._lock:
+            self._containers = {c.id: c for c in containers}
+        logger.debug("docker plugin - Full containers list: {} containers".format(len(containers)))
+
+    def run(self):
+        """Update the containers list from the events.
+
+        Infinite loop, should be stopped by calling the stop() method
+        """
+        while not self.stopped():
+            # The stream is closed by the Docker daemon at the until time
+            # The since time replays the events received during the full list
+            until = self._since + self._refresh
+            try:
+                self._stream = self._client.events(since=self._since, until=until, decode=True,
+                                                   filters={'type': 'container'})
+                for event in self._stream:
+                    self.update(event)
+            except Exception as e:
+                if self.stopped():
+                    break
+                logger.debug("docker plugin - Events stream lost ({}), reconnect".format(e))
+                self._stopper.wait(5)
+            if self.stopped():
+                break
+            self._since = int(time.time())
+            self.refresh()
+
+    def update(self, event):
+        """Update the container of the event."""
+        action = event.get('Action', event.get('status', ''))
+        container_id = event.get('id') or event.get('Actor', {}).get('ID')
+        if action not in self.events or container_id is None:
+            return
+        try:
+            container = self._client.containers.get(container_id)
+        except docker.errors.NotFound as e:
+            # The container has been removed (destroy)
+            logger.debug("docker plugin - Remove container {} ({})".format(container_id[:12], e))
+            container = None
+        except Exception as e:
+            # Daemon error or timeout: keep the container (checked by the next full list)
+            logger.debug("docker plugin - Cannot inspect container {} ({})".format(container_id[:12], e))
+            return
+        if container is not None and not self._all and \
+           container.attrs['State']['Status'] not in ('running', 'paused'):
+            container = None
+        with self._lock:
+            if container is None:
+                self._containers.pop(container_id, None)
+            else:
+                self._containers[container_id] = container
+
+    @property
+    def containers(self):
+        """Containers list getter."""
+        with self._lock:
+            return list(itervalues(self._containers))
+
+    def stop(self, timeout=None):
+        """Stop the thread."""
+        logger.debug("docker plugin - Close the events thread")
+        self._stopper.set()
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+
+    def stopped(self):
+        """Return True is the thread is stopped."""
+        return self._stopper.isSet()
+
+
 class ThreadDockerGrabber(threading.Thread):
     """
     Specific thread to grab docker stats.
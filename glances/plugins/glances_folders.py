@@ -45,6 +45,12 @@ class Plugin(GlancesPlugin):
         # Init stats
         self.glances_folders = glancesFolderList(config)
 
+    def exit(self):
+        """Overwrite the exit method to stop the folders scan."""
+        self.glances_folders.exit()
+        # Call the father class
+        super(Plugin, self).exit()
+
     def get_key(self):
         """Return the key of the list."""
         return 'path'
@@ -23,9 +23,9 @@ from __future__ import unicode_literals
 import operator
 
 from glances.compat import u, nativestr, n
+from glances.mounts import GlancesMounts, GlancesFsUsage
 from glances.plugins.glances_plugin import GlancesPlugin
 
-import psutil
 
 # SNMP OID
 # The snmpd.conf needs to be edited.
@@ -80,6 +80,21 @@ class Plugin(GlancesPlugin):
         # We want to display the stat in the curse interface
         self.display_curse = True
 
+        # Mount points list (mountinfo only read again when it changes)
+        self.mounts = None
+        # File systems usage read in worker threads (hung mount points are stale)
+        self.fs_usage = GlancesFsUsage(workers=self.get_conf_value('workers', default=4),
+                                       timeout=self.get_conf_value('timeout', default=1),
+                                       backoff_max=self.get_conf_value('backoff_max', default=300))
+
+    def exit(self):
+        """Overwrite the exit method to stop the workers."""
+        self.fs_usage.exit()
+        if self.mounts is not None:
+            self.mounts.close()
+        # Call the father class
+        super(Plugin, self).exit()
+
     def get_key(self):
         """Return the key of the list."""
         return 'mnt_point'
@@ -94,44 +109,48 @@ class Plugin(GlancesPlugin):
         if self.input_method == 'local':
             # Update stats using the standard system lib
 
-            # Grab the stats using the psutil disk_partitions
-            # If 'all'=False return physical devices only (e.g. hard disks, cd-rom drives, USB keys)
-            # and ignore all others (e.g. memory partitions such as /dev/shm)
+            # Grab the mounted partitions
+            # Only physical devices (e.g. hard disks, cd-rom drives, USB keys)
+            # are returned, and not the others (e.g. memory partitions such as /dev/shm)
+            # Optionnal hack to allow logicals mounts points (issue #448)
+            # Ex: Had to put 'allow=zfs' in the [fs] section of the conf file
+            #     to allow zfs monitoring
             try:
-                fs_stat = psutil.disk_partitions(all=False)
+                if self.mounts is None:
+                    self.mounts = GlancesMounts()
+                fs_stat = self.mounts.get(allow=self.get_conf_value('allow'))
             except (UnicodeDecodeError, PermissionError):
                 return self.stats
 
-            # Optionnal hack to allow logicals mounts points (issue #448)
-            # Ex: Had to put 'allow=zfs' in the [fs] section of the conf file
-            #     to allow zfs monitoring
-            for fstype in self.get_conf_value('allow'):
-                try:
-                    fs_stat += [f for f in psutil.disk_partitions(all=True) if f.fstype.find(fstype) >= 0]
-                except UnicodeDecodeError:
-                    return self.stats
+            # Do not take hidden file system into account
+            fs_stat = [fs for fs in fs_stat if not self.is_hide(fs.mountpoint)]
+
+            # Grab the disk usage (at most timeout seconds)
+            fs_usage = self.fs_usage.update([fs.mountpoint for fs in fs_stat])
 
             # Loop over fs
             for fs in fs_stat:
-                # Do not take hidden file system into account
-                if self.is_hide(fs.mountpoint):
-                    continue
-                # Grab the disk usage
-                try:
-                    fs_usage = psutil.disk_usage(fs.mountpoint)
-                except OSError:
+                if fs.mountpoint not in fs_usage:
                     # Correct issue #346
                     # Disk is ejected during the command
                     continue
+                usage, stale = fs_usage[fs.mountpoint]
+                if usage is not None:
+                    total, used, free, percent = usage
+                else:
+                    # Hung since the first read: unknown usage
+                    total = used = free = percent = None
                 fs_current = {
                     'device_name': fs.device,
                     'fs_type': fs.fstype,
                     # Manage non breaking space (see issue #1065)
                     'mnt_point': u(fs.mountpoint).replace(u'\u00A0', ' '),
-                    'size': fs_usage.total,
-                    'used': fs_usage.used,
-                    'free': fs_usage.free,
-                    'percent': fs_usage.percent,
+                    'size': total,
+                    'used': used,
+                    'free': free,
+                    'percent': percent,
+                    # Usage not read in time (last known usage)
+                    'stale': stale,
                     'key': self.get_key()}
                 stats.append(fs_current)
 
@@ -189,6 +208,10 @@ class Plugin(GlancesPlugin):
         # Add specifics informations
         # Alert
         for i in self.stats:
+            if i.get('stale'):
+                # Hung mount point: no alert on the last known usage
+                self.views[i[self.get_key()]]['mnt_point']['decoration'] = 'WARNING'
+                continue
             self.views[i[self.get_key()]]['used']['decoration'] = self.get_alert(
                 i['used'], maximum=i['size'], header=i['mnt_point'])
 
@@ -232,15 +255,20 @@ class Plugin(GlancesPlugin):
                 mnt_point = i['mnt_point']
             msg = '{:{width}}'.format(nativestr(mnt_point),
                                       width=name_max_width)
-            ret.append(self.curse_add_line(msg))
-            if args.fs_free_space:
+            ret.append(self.curse_add_line(msg, self.get_views(item=i[self.get_key()],
+                                                               key='mnt_point',
+                                                               option='decoration')))
+            if i['size'] is None:
+                # Stale mount point, usage never read
+                msg = '{:>7}'.format('?')
+            elif args.fs_free_space:
                 msg = '{:>7}'.format(self.auto_unit(i['free']))
             else:
                 msg = '{:>7}'.format(self.auto_unit(i['used']))
             ret.append(self.curse_add_line(msg, self.get_views(item=i[self.get_key()],
                                                                key='used',
                                                                option='decoration')))
-            msg = '{:>7}'.format(self.auto_unit(i['size']))
+            msg = '{:>7}'.format('?' if i['size'] is None else self.auto_unit(i['size']))
             ret.append(self.curse_add_line(msg))
 
         return ret
@@ -22,9 +22,11 @@
 import os
 import operator
 
+from glances.compat import get_numpy
 from glances.globals import LINUX
 from glances.timer import getTimeSinceLastUpdate
 from glances.plugins.glances_plugin import GlancesPlugin
+from glances.procfs import ProcFile
 
 
 class Plugin(GlancesPlugin):
@@ -45,6 +47,12 @@ class Plugin(GlancesPlugin):
         # Init the stats
         self.irq = GlancesIRQ()
 
+    def exit(self):
+        """Overwrite the exit method to close the IRQ file."""
+        self.irq.close()
+        # Call the father class
+        super(Plugin, self).exit()
+
     def get_key(self):
         """Return the key of the list."""
         return self.irq.get_key()
@@ -115,18 +123,37 @@ class Plugin(GlancesPlugin):
 
 
 class GlancesIRQ(object):
-    """This class manages the IRQ file."""
+    """This class manages the IRQ file.
+
+    The file is read into a reused buffer. The per-CPU counters are written
+    by the kernel in fixed width columns ("%10u "): the per-CPU block of all
+    the lines is converted at once (with NumPy if available) and the rates
+    are computed by a matrix subtraction.
+    """
 
     IRQ_FILE = '/proc/interrupts'
 
+    # Width of a per-CPU counter column
+    COLUMN_WIDTH = 11
+
     def __init__(self):
         """Init the class.
 
         The stat are stored in a internal list of dict
         """
         self.lasts = {}
+        # Last per-CPU counters: (IRQ lines names, matrix)
+        self.last_matrix = None
+        # Opened IRQ file
+        self.irq_file = None
         self.reset()
 
+    def close(self):
+        """Close the IRQ file."""
+        if self.irq_file is not None:
+            self.irq_file.close()
+            self.irq_file = None
+
     def reset(self):
         """Reset the stats."""
         self.stats = []
@@ -156,11 +183,10 @@ class GlancesIRQ(object):
         1:      44487        341         44         72   IO-APIC   1-edge      i8042
         LOC:   33549868   22394684   32474570   21855077   Local timer interrupts
         """
-        splitted_line = line.split()
-        irq_line = splitted_line[0].replace(':', '')
+        irq_line = line[:line.find(':')].strip()
         if irq_line.isdigit():
             # If the first column is a digit, use the alias (last column)
-            irq_line += '_{}'.format(splitted_line[-1])
+            irq_line += '_{}'.format(line.rsplit(None, 1)[-1])
         return irq_line
 
     def __sum(self, line):
@@ -179,8 +205,34 @@ class GlancesIRQ(object):
             ret = 0
         return ret
 
+    def __read(self):
+        """Read the IRQ file (into a reused buffer) and return its content (str)."""
+        if self.irq_file is None:
+            self.irq_file = ProcFile(self.IRQ_FILE, size=65536)
+        return self.irq_file.read().decode('ascii', 'replace')
+
+    def __matrix(self, blocks):
+        """Return the per-CPU counters matrix (one row per block)."""
+        np = get_numpy()
+        if np is not None:
+            try:
+                matrix = np.array(''.join(blocks).split(), dtype=np.int64)
+            except ValueError:
+                matrix = None
+            if matrix is not None and matrix.size == len(blocks) * self.cpu_number:
+                return matrix.reshape(len(blocks), self.cpu_number)
+        # Without NumPy (or unexpected content)
+        matrix = []
+        for block in blocks:
+            try:
+                matrix.append([int(i) for i in block.split()])
+            except ValueError:
+                matrix.append([0] * self.cpu_number)
+        return matrix
+
     def __update(self):
         """Load the IRQ file and update the internal dict."""
+        np = get_numpy()
         self.reset()
 
         if not os.path.exists(self.IRQ_FILE):
@@ -188,27 +240,79 @@ class GlancesIRQ(object):
             return self.stats
 
         try:
-            with open(self.IRQ_FILE) as irq_proc:
-                time_since_update = getTimeSinceLastUpdate('irq')
-                # Read the header
-                self.__header(irq_proc.readline())
-                # Read the rest of the lines (one line per IRQ)
-                for line in irq_proc.readlines():
-                    irq_line = self.__humanname(line)
-                    current_irqs = self.__sum(line)
-                    irq_rate = int(
-                        current_irqs - self.lasts.get(irq_line)
-                        if self.lasts.get(irq_line)
-                        else 0 // time_since_update)
-                    irq_current = {
-                        'irq_line': irq_line,
-                        'irq_rate': irq_rate,
-                        'key': self.get_key(),
-                        'time_since_update': time_since_update
-                    }
-                    self.stats.append(irq_current)
-                    self.lasts[irq_line] = current_irqs
+            data = self.__read()
         except (OSError, IOError):
-            pass
+            return self.stats
+        time_since_update = getTimeSinceLastUpdate('irq')
+
+        lines = data.splitlines()
+        if not lines:
+            return self.stats
+        # Read the header
+        self.__header(lines[0])
+        width = self.COLUMN_WIDTH * self.cpu_number
+
+        # Split the per-CPU lines (fixed width block) and the other ones (ERR, MIS...)
+        names = []
+        blocks = []
+        others = []
+        for line in lines[1:]:
+            colon = line.find(':')
+            if colon < 0:
+                continue
+            block = line[colon + 2:colon + 2 + width] + ' '
+            if len(block) > width and block[width - 1] == ' ' and block[width - 2] != ' ':
+                names.append(self.__humanname(line))
+                blocks.append(block[:width])
+            else:
+                others.append(line)
+
+        # Per-CPU counters (one row per IRQ line) and rates (interrupts since
+        # the last update, as for the other lines)
+        matrix = self.__matrix(blocks)
+        if self.last_matrix is not None and self.last_matrix[0] == names:
+            last = self.last_matrix[1]
+        else:
+            # First update or IRQ lines added/removed
+            last = None
+        if np is not None and isinstance(matrix, np.ndarray):
+            if last is not None:
+                rates = matrix - last
+            else:
+                rates = np.zeros_like(matrix)
+            line_rates = rates.sum(axis=1).tolist() if len(names) else []
+        else:
+            if last is not None:
+                rates = [[c - l for c, l in zip(row, last_row)]
+                         for row, last_row in zip(matrix, last)]
+            else:
+                rates = [[0] * self.cpu_number for _ in matrix]
+            line_rates = [sum(row) for row in rates]
+        self.last_matrix = (names, matrix)
+
+        for i, irq_line in enumerate(names):
+            irq_current = {
+                'irq_line': irq_line,
+                'irq_rate': int(line_rates[i]),
+                # IRQ rate per CPU (to check the IRQ affinity)
+                'irq_rate_per_cpu': [int(r) for r in rates[i]],
+                'key': self.get_key(),
+                'time_since_update': time_since_update
+            }
+            self.stats.append(irq_current)
+
+        for line in others:
+            irq_line = self.__humanname(line)
+            current_irqs = self.__sum(line)
+            last_irqs = self.lasts.get(irq_line)
+            irq_rate = int(current_irqs - last_irqs) if last_irqs is not None else 0
+            irq_current = {
+                'irq_line': irq_line,
+                'irq_rate': irq_rate,
+                'key': self.get_key(),
+                'time_since_update': time_since_update
+            }
+            self.stats.append(irq_current)
+            self.lasts[irq_line] = current_irqs
 
         return self.stats
@@ -19,12 +19,12 @@
 
 """Load plugin."""
 
-import os
 import psutil
 
 from glances.compat import iteritems
 from glances.plugins.glances_core import Plugin as CorePlugin
 from glances.plugins.glances_plugin import GlancesPlugin
+from glances.procfs import procfs
 
 # SNMP OID
 # 1 minute Load: .1.3.6.1.4.1.2021.10.1.3.1
@@ -68,12 +68,13 @@ class Plugin(GlancesPlugin):
     def _getloadavg(self):
         """Get load average. On both Linux and Windows thanks to PsUtil"""
         try:
-            return psutil.getloadavg()
-        except AttributeError:
+            # /proc/loadavg on Linux, os.getloadavg elsewhere
+            return procfs.getloadavg()
+        except (AttributeError, OSError):
             pass
         try:
-            return os.getloadavg()
-        except (AttributeError, OSError):
+            return psutil.getloadavg()
+        except AttributeError:
             return None
 
     @GlancesPlugin._check_decorator
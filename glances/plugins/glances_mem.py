@@ -21,8 +21,7 @@
 
 from glances.compat import iterkeys
 from glances.plugins.glances_plugin import GlancesPlugin
-
-import psutil
+from glances.procfs import procfs
 
 # SNMP OID
 # Total RAM in machine: .1.3.6.1.4.1.2021.4.5.0
@@ -77,8 +76,8 @@ class Plugin(GlancesPlugin):
 
         if self.input_method == 'local':
             # Update stats using the standard system lib
-            # Grab MEM using the psutil virtual_memory method
-            vm_stats = psutil.virtual_memory()
+            # Grab MEM using the (psutil like) virtual_memory method
+            vm_stats = procfs.virtual_memory()
 
             # Get all the memory stats (copy/paste of the psutil documentation)
             # total: total physical memory available.
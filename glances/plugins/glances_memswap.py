@@ -21,8 +21,7 @@
 
 from glances.compat import iterkeys
 from glances.plugins.glances_plugin import GlancesPlugin
-
-import psutil
+from glances.procfs import procfs
 
 # SNMP OID
 # Total Swap Size: .1.3.6.1.4.1.2021.4.3.0
@@ -65,8 +64,8 @@ class Plugin(GlancesPlugin):
 
         if self.input_method == 'local':
             # Update stats using the standard system lib
-            # Grab SWAP using the psutil swap_memory method
-            sm_stats = psutil.swap_memory()
+            # Grab SWAP using the (psutil like) swap_memory method
+            sm_stats = procfs.swap_memory()
 
             # Get all the swap stats (copy/paste of the psutil documentation)
             # total: total swap memory in bytes
@@ -25,6 +25,7 @@ import operator
 
 from glances.timer import getTimeSinceLastUpdate
 from glances.plugins.glances_plugin import GlancesPlugin
+from glances.procfs import procfs
 from glances.compat import n, u, b, nativestr
 
 import psutil
@@ -78,9 +79,9 @@ class Plugin(GlancesPlugin):
         if self.input_method == 'local':
             # Update stats using the standard system lib
 
-            # Grab network interface stat using the psutil net_io_counter method
+            # Grab network interface stat using the (psutil like) net_io_counter method
             try:
-                netiocounters = psutil.net_io_counters(pernic=True)
+                netiocounters = procfs.net_io_counters()
             except UnicodeDecodeError as e:
                 logger.debug('Can not get network interface counters ({})'.format(e))
                 return self.stats
@@ -20,7 +20,7 @@
 """Per-CPU plugin."""
 
 from glances.logger import logger
-from glances.cpu_percent import cpu_percent
+from glances.cpu_percent import cpu_percent, percpu_groups, percpu_histogram
 from glances.plugins.glances_plugin import GlancesPlugin
 
 # Define the history items list
@@ -60,8 +60,7 @@ class Plugin(GlancesPlugin):
         # Init new stats
         stats = self.get_init_value()
 
-        # Grab per-CPU stats using psutil's cpu_percent(percpu=True) and
-        # cpu_times_percent(percpu=True) methods
+        # Grab per-CPU stats using the shared cpu_percent (one matrix for all the CPUs)
         if self.input_method == 'local':
             stats = cpu_percent.get(percpu=True)
         else:
@@ -82,37 +81,86 @@ class Plugin(GlancesPlugin):
         if not self.stats or not self.args.percpu or self.is_disable():
             return ret
 
+        # Too many CPUs: display the busiest ones and a summary
+        max_cpu_display = int(self.get_conf_value('max_cpu_display', default=16))
+        summary = len(self.stats) > max_cpu_display
+        stat_list = [stat for stat in ['user', 'system', 'idle', 'iowait', 'steal']
+                     if stat in self.stats[0]]
+
         # Build the string message
-        if self.is_disable('quicklook'):
+        if summary:
+            msg = '{:7}'.format('PER CPU' if self.is_disable('quicklook') else 'CPU')
+            ret.append(self.curse_add_line(msg, "TITLE"))
+            if self.is_disable('quicklook'):
+                ret.append(self.curse_add_line('{:>7}'.format('total')))
+        elif self.is_disable('quicklook'):
             msg = '{:7}'.format('PER CPU')
             ret.append(self.curse_add_line(msg, "TITLE"))
 
         # Per CPU stats displayed per line
-        for stat in ['user', 'system', 'idle', 'iowait', 'steal']:
-            if stat not in self.stats[0]:
-                continue
+        for stat in stat_list:
             msg = '{:>7}'.format(stat)
             ret.append(self.curse_add_line(msg))
 
         # Per CPU stats displayed per column
-        for cpu in self.stats:
+        if summary:
+            # Same order as the quicklook plugin
+            cpus = sorted(self.stats, key=lambda cpu: cpu['total'], reverse=True)[:max_cpu_display]
+        else:
+            cpus = self.stats
+        for cpu in cpus:
             ret.append(self.curse_new_line())
-            if self.is_disable('quicklook'):
-                try:
-                    msg = '{:6.1f}%'.format(cpu['total'])
-                except TypeError:
-                    # TypeError: string indices must be integers (issue #1027)
-                    msg = '{:>6}%'.format('?')
-                ret.append(self.curse_add_line(msg))
-            for stat in ['user', 'system', 'idle', 'iowait', 'steal']:
-                if stat not in self.stats[0]:
-                    continue
-                try:
-                    msg = '{:6.1f}%'.format(cpu[stat])
-                except TypeError:
-                    msg = '{:>6}%'.format('?')
-                ret.append(self.curse_add_line(msg,
-                                               self.get_alert(cpu[stat],
-                                                              header=stat)))
+            if summary:
+                ret.append(self.curse_add_line('{:7}'.format('CPU{}'.format(cpu['cpu_number']))))
+            ret.extend(self.msg_curse_cpu(cpu, stat_list))
+
+        if summary:
+            ret.extend(self.msg_curse_summary(stat_list))
+
+        return ret
+
+    def msg_curse_cpu(self, cpu, stat_list):
+        """Return the stats of a CPU (or of a group of CPUs) to display in the curse interface."""
+        ret = []
+        if self.is_disable('quicklook'):
+            try:
+                msg = '{:6.1f}%'.format(cpu['total'])
+            except TypeError:
+                # TypeError: string indices must be integers (issue #1027)
+                msg = '{:>6}%'.format('?')
+            ret.append(self.curse_add_line(msg))
+        for stat in stat_list:
+            try:
+                msg = '{:6.1f}%'.format(cpu[stat])
+            except TypeError:
+                msg = '{:>6}%'.format('?')
+            ret.append(self.curse_add_line(msg,
+                                           self.get_alert(cpu[stat],
+                                                          header=stat)))
+        return ret
 
+    def msg_curse_summary(self, stat_list):
+        """Return the per socket/NUMA node stats and the usage histogram to display in the curse interface."""
+        ret = []
+        # Average per socket and per NUMA node (only if more than one)
+        for name, label in [('socket', 'Socket'), ('node', 'Node')]:
+            groups = percpu_groups(self.stats, name)
+            if len(groups) < 2:
+                continue
+            for group in groups:
+                ret.append(self.curse_new_line())
+                msg = '{:7}'.format('{}{}'.format(label, group[name])[:7])
+                ret.append(self.curse_add_line(msg))
+                ret.extend(self.msg_curse_cpu(group, stat_list))
+        # Number of CPUs per usage bucket of 20%
+        histogram = percpu_histogram(self.stats, step=20)
+        ret.append(self.curse_new_line())
+        ret.append(self.curse_add_line('{:7}'.format('Usage'), "TITLE"))
+        for i in range(len(histogram)):
+            msg = '{:>7}'.format('<{}%'.format((i + 1) * 20) if i < len(histogram) - 1 else '<=100%')
+            ret.append(self.curse_add_line(msg))
+        ret.append(self.curse_new_line())
+        ret.append(self.curse_add_line('{:7}'.format('CPUs')))
+        for count in histogram:
+            ret.append(self.curse_add_line('{:>7}'.format(count)))
         return ret
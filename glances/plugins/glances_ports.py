@@ -27,7 +27,8 @@ import time
 import numbers
 
 from glances.globals import WINDOWS, MACOS, BSD
-from glances.ports_list import GlancesPortsList
+from glances.icmp import GlancesIcmp
+from glances.ports_list import GlancesPortsList, add_rtt, icmp_scan
 from glances.web_list import GlancesWebList
 from glances.timer import Timer, Counter
 from glances.compat import bool_type
@@ -41,6 +42,12 @@ except ImportError as e:
     requests_tag = False
     logger.warning("Missing Python Lib ({}), Ports plugin is limited to port scanning".format(e))
 
+# The asyncio scanner needs Python 3.5 or higher
+try:
+    from glances.ports_async import GlancesPortsScanner
+except (ImportError, SyntaxError):
+    GlancesPortsScanner = None
+
 
 class Plugin(GlancesPlugin):
     """Glances ports scanner plugin."""
@@ -65,10 +72,30 @@ class Plugin(GlancesPlugin):
         # Global Thread running all the scans
         self._thread = None
 
+        # Concurrent scanner (all the items are scanned at the same time,
+        # at most concurrency items at a time)
+        # If not available (Python < 3.5), the items are scanned one by one
+        self._scanner = None
+        # ICMP probes engine (all the ICMP ports are scanned at once from one socket)
+        # If not available (not allowed), the system ping command is used
+        self._icmp = None
+        if any(int(p['port']) == 0 for p in self.stats if 'port' in p):
+            self._icmp = GlancesIcmp(window=int(self.get_conf_value('icmp_window', default=10)))
+            if not self._icmp.available():
+                logger.info("ports plugin - ICMP socket not allowed, use the ping command")
+                self._icmp = None
+        if GlancesPortsScanner is not None:
+            self._scanner = GlancesPortsScanner(concurrency=self.get_conf_value('concurrency', default=20),
+                                                icmp=self._icmp)
+
     def exit(self):
         """Overwrite the exit method to close threads."""
         if self._thread is not None:
             self._thread.stop()
+        if self._scanner is not None:
+            self._scanner.exit()
+        if self._icmp is not None:
+            self._icmp.close()
         # Call the father class
         super(Plugin, self).exit()
 
@@ -85,7 +112,7 @@ class Plugin(GlancesPlugin):
                 thread_is_running = self._thread.is_alive()
             if self.timer_ports.finished() and not thread_is_running:
                 # Run ports scanner
-                self._thread = ThreadScanner(self.stats)
+                self._thread = ThreadScanner(self.stats, scanner=self._scanner, icmp=self._icmp)
                 self._thread.start()
                 # Restart timer
                 if len(self.stats) > 0:
@@ -219,14 +246,20 @@ class ThreadScanner(threading.Thread):
     stats is a list of dict
     """
 
-    def __init__(self, stats):
-        """Init the class."""
+    def __init__(self, stats, scanner=None, icmp=None):
+        """Init the class.
+
+        scanner: instance of GlancesPortsScanner (None: sequential scan)
+        icmp: instance of GlancesIcmp (None: ICMP checks with the ping command)
+        """
         logger.debug("ports plugin - Create thread for scan list {}".format(stats))
         super(ThreadScanner, self).__init__()
         # Event needed to stop properly the thread
         self._stopper = threading.Event()
         # The class return the stats as a list of dict
         self._stats = stats
+        self._scanner = scanner
+        self._icmp = icmp
         # Is part of Ports plugin
         self.plugin_name = "ports"
 
@@ -235,6 +268,13 @@ class ThreadScanner(threading.Thread):
 
         Infinite loop, should be stopped by calling the stop() method.
         """
+        if self._scanner is not None:
+            # Concurrent scan
+            self._scanner.scan(self._stats, stopped=self.stopped)
+            return
+        if self._icmp is not None:
+            # All the ICMP ports are scanned at once (from one socket)
+            icmp_scan(self._icmp, [p for p in self._stats if 'port' in p and int(p['port']) == 0])
         for p in self._stats:
             # End of the thread has been asked
             if self.stopped():
@@ -283,11 +323,15 @@ class ThreadScanner(threading.Thread):
         else:
             web['status'] = req.status_code
             web['elapsed'] = req.elapsed.total_seconds()
+            add_rtt(web, web['elapsed'])
         return web
 
     def _port_scan(self, port):
         """Scan the port structure (dict) and update the status key."""
         if int(port['port']) == 0:
+            if self._icmp is not None:
+                # Already scanned
+                return None
             return self._port_scan_icmp(port)
         else:
             return self._port_scan_tcp(port)
@@ -331,6 +375,7 @@ class ThreadScanner(threading.Thread):
             ret = subprocess.check_call(cmd, stdout=fnull, stderr=fnull, close_fds=True)
             if ret == 0:
                 port['status'] = counter.get()
+                add_rtt(port, port['status'])
             else:
                 port['status'] = False
         except subprocess.CalledProcessError as e:
@@ -347,8 +392,8 @@ class ThreadScanner(threading.Thread):
 
         # Create and configure the scanning socket
         try:
-            socket.setdefaulttimeout(port['timeout'])
             _socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            _socket.settimeout(port['timeout'])
         except Exception as e:
             logger.debug("{}: Error while creating scanning socket".format(self.plugin_name))
 
@@ -362,6 +407,7 @@ class ThreadScanner(threading.Thread):
         else:
             if ret == 0:
                 port['status'] = counter.get()
+                add_rtt(port, port['status'])
             else:
                 port['status'] = False
         finally:
@@ -24,8 +24,7 @@ from glances.logger import logger
 from glances.outputs.glances_bars import Bar
 from glances.outputs.glances_sparklines import Sparkline
 from glances.plugins.glances_plugin import GlancesPlugin
-
-import psutil
+from glances.procfs import procfs
 
 # Import plugin specific dependency
 try:
@@ -67,6 +66,11 @@ class Plugin(GlancesPlugin):
         # We want to display the stat in the curse interface
         self.display_curse = True
 
+        # Maximum number of CPUs displayed in per CPU mode (percpu plugin configuration)
+        self.max_cpu_display = 16
+        if hasattr(config, 'has_section') and config.has_section('percpu'):
+            self.max_cpu_display = config.get_int_value('percpu', 'max_cpu_display', default=16)
+
     @GlancesPlugin._check_decorator
     @GlancesPlugin._log_result_decorator
     def update(self):
@@ -79,9 +83,9 @@ class Plugin(GlancesPlugin):
             # Get the latest CPU percent value
             stats['cpu'] = cpu_percent.get()
             stats['percpu'] = cpu_percent.get(percpu=True)
-            # Use the psutil lib for the memory (virtual and swap)
-            stats['mem'] = psutil.virtual_memory().percent
-            stats['swap'] = psutil.swap_memory().percent
+            # Memory (virtual and swap) stats shared with the mem and memswap plugins
+            stats['mem'] = procfs.virtual_memory().percent
+            stats['swap'] = procfs.swap_memory().percent
         elif self.input_method == 'snmp':
             # Not available
             pass
@@ -146,11 +150,18 @@ class Plugin(GlancesPlugin):
         for key in ['cpu', 'mem', 'swap']:
             if key == 'cpu' and args.percpu:
                 if sparkline_tag:
-                    raw_cpu = self.get_raw_history(item='percpu', nb=data.size)
-                for cpu_index, cpu in enumerate(self.stats['percpu']):
+                    # History of the CPU usage per CPU number (offline CPUs are not listed)
+                    raw_cpu = [dict((c['cpu_number'], c['total']) for c in i[1])
+                               for i in self.get_raw_history(item='percpu', nb=data.size)]
+                percpu = self.stats['percpu']
+                if len(percpu) > self.max_cpu_display:
+                    # Too many CPUs: display the busiest ones (same order as the percpu plugin)
+                    percpu = sorted(percpu, key=lambda cpu: cpu['total'], reverse=True)[:self.max_cpu_display]
+                for cpu in percpu:
                     if sparkline_tag:
                         # Sparkline display an history
-                        data.percents = [i[1][cpu_index]['total'] for i in raw_cpu]
+                        data.percents = [i[cpu['cpu_number']] for i in raw_cpu
+                                         if cpu['cpu_number'] in i]
                         # A simple padding in order to align metrics to the right
                         data.percents += [None] * (data.size - len(data.percents))
                     else:
@@ -22,6 +22,8 @@
 import psutil
 import warnings
 
+from glances.globals import LINUX
+from glances.hwmon import GlancesHwmon, SENSOR_TEMP_UNIT, SENSOR_FAN_UNIT
 from glances.logger import logger
 from glances.compat import iteritems, to_fahrenheit
 from glances.timer import Counter
@@ -29,9 +31,6 @@ from glances.plugins.sensors.glances_batpercent import Plugin as BatPercentPlugi
 from glances.plugins.sensors.glances_hddtemp import Plugin as HddTempPlugin
 from glances.plugins.glances_plugin import GlancesPlugin
 
-SENSOR_TEMP_UNIT = 'C'
-SENSOR_FAN_UNIT = 'R'
-
 
 class Plugin(GlancesPlugin):
     """Glances sensors plugin.
@@ -69,6 +68,14 @@ class Plugin(GlancesPlugin):
         # We want to display the stat in the curse interface
         self.display_curse = True
 
+    def exit(self):
+        """Overwrite the exit method to close the sensors files and stop hddtemp."""
+        if self.glancesgrabsensors.hwmon is not None:
+            self.glancesgrabsensors.hwmon.close()
+        self.hddtemp_plugin.exit()
+        # Call the father class
+        super(Plugin, self).exit()
+
     def get_key(self):
         """Return the key of the list."""
         return 'label'
@@ -83,6 +90,11 @@ class Plugin(GlancesPlugin):
         if self.input_method == 'local':
             # Update stats using the dedicated lib
             stats = []
+            # Read the temperatures and the fans speed (once)
+            try:
+                self.glancesgrabsensors.update()
+            except Exception as e:
+                logger.error("Cannot grab sensors (%s)" % e)
             # Get the temperature
             try:
                 temperature = self.__set_type(self.glancesgrabsensors.get('temperature_core'),
@@ -227,36 +239,28 @@ class GlancesGrabSensors(object):
 
     def __init__(self):
         """Init sensors stats."""
+        # On Linux, the sensors are read from the sysfs input files (kept open)
+        self.hwmon = None
+        if LINUX:
+            self.hwmon = GlancesHwmon()
+            if not self.hwmon.available():
+                self.hwmon = None
+
         # Temperatures
-        self.init_temp = False
-        self.stemps = {}
-        try:
-            # psutil>=5.1.0, Linux-only
-            self.stemps = psutil.sensors_temperatures()
-        except AttributeError:
+        # psutil>=5.1.0, Linux-only
+        self.init_temp = self.hwmon is not None or hasattr(psutil, 'sensors_temperatures')
+        if not self.init_temp:
             logger.debug("Cannot grab temperatures. Platform not supported.")
         else:
-            self.init_temp = True
             # Solve an issue #1203 concerning a RunTimeError warning message displayed
             # in the curses interface.
             warnings.filterwarnings("ignore")
 
         # Fans
-        self.init_fan = False
-        self.sfans = {}
-        try:
-            # psutil>=5.2.0, Linux-only
-            self.sfans = psutil.sensors_fans()
-        except AttributeError:
+        # psutil>=5.2.0, Linux-only
+        self.init_fan = self.hwmon is not None or hasattr(psutil, 'sensors_fans')
+        if not self.init_fan:
             logger.debug("Cannot grab fans speed. Platform not supported.")
-        else:
-            self.init_fan = True
-
-        # !!! Disable Fan: High CPU consumption with psutil 5.2.0 or higher
-        # Delete the two followings lines when corrected (https://github.com/giampaolo/psutil/issues/1199)
-        # Correct and tested with PsUtil 5.6.1 (Ubuntu 18.04)
-        # self.init_fan = False
-        # logger.debug("Fan speed sensors disable (see https://github.com/giampaolo/psutil/issues/1199)")
 
         # Init the stats
         self.reset()
@@ -265,12 +269,16 @@ class GlancesGrabSensors(object):
         """Reset/init the stats."""
         self.sensors_list = []
 
-    def __update__(self):
-        """Update the stats."""
+    def update(self):
+        """Update the stats (temperatures and fans speed)."""
         # Reset the list
         self.reset()
 
-        if not self.init_temp:
+        if self.hwmon is not None:
+            self.sensors_list = self.hwmon.update()
+            return self.sensors_list
+
+        if not self.init_temp and not self.init_fan:
             return self.sensors_list
 
         # Temperatures sensors
@@ -282,7 +290,7 @@ class GlancesGrabSensors(object):
         return self.sensors_list
 
     def build_sensors_list(self, type):
-        """Build the sensors list depending of the type.
+        """Build the sensors list depending of the type (with psutil).
 
         type: SENSOR_TEMP_UNIT or SENSOR_FAN_UNIT
 
@@ -290,11 +298,9 @@ class GlancesGrabSensors(object):
         """
         ret = []
         if type == SENSOR_TEMP_UNIT and self.init_temp:
-            input_list = self.stemps
-            self.stemps = psutil.sensors_temperatures()
+            input_list = psutil.sensors_temperatures()
         elif type == SENSOR_FAN_UNIT and self.init_fan:
-            input_list = self.sfans
-            self.sfans = psutil.sensors_fans()
+            input_list = psutil.sensors_fans()
         else:
             return ret
         for chipname, chip in iteritems(input_list):
@@ -315,8 +321,7 @@ class GlancesGrabSensors(object):
         return ret
 
     def get(self, sensor_type='temperature_core'):
-        """Get sensors list."""
-        self.__update__()
+        """Get sensors list (read by the last update)."""
         if sensor_type == 'temperature_core':
             ret = [s for s in self.sensors_list if s['unit'] == SENSOR_TEMP_UNIT]
         elif sensor_type == 'fan_speed':
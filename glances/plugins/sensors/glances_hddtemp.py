@@ -21,6 +21,7 @@
 
 import os
 import socket
+import threading
 
 from glances.compat import nativestr, range
 from glances.logger import logger
@@ -46,12 +47,20 @@ class Plugin(GlancesPlugin):
                                                default="7634"))
         self.hddtemp = GlancesGrabHDDTemp(args=args,
                                           host=hddtemp_host,
-                                          port=hddtemp_port)
+                                          port=hddtemp_port,
+                                          refresh=self.get_conf_value('refresh', default=10),
+                                          timeout=self.get_conf_value('timeout', default=2))
 
         # We do not want to display the stat in a dedicated area
         # The HDD temp is displayed within the sensors plugin
         self.display_curse = False
 
+    def exit(self):
+        """Overwrite the exit method to stop the hddtemp thread."""
+        self.hddtemp.stop()
+        # Call the father class
+        super(Plugin, self).exit()
+
     @GlancesPlugin._check_decorator
     @GlancesPlugin._log_result_decorator
     def update(self):
@@ -75,25 +84,51 @@ class Plugin(GlancesPlugin):
 
 
 class GlancesGrabHDDTemp(object):
-    """Get hddtemp stats using a socket connection."""
+    """Get hddtemp stats using a socket connection.
+
+    The hddtemp daemon is polled every refresh seconds by a background
+    thread: the get method returns the last parsed stats and never waits
+    for the daemon (except for the first stats, at most timeout seconds).
+    The hddtemp plugin is disabled if the daemon can not be reached, and
+    the thread stops when the plugin is disabled.
+    """
 
-    def __init__(self, host='127.0.0.1', port=7634, args=None):
+    def __init__(self, host='127.0.0.1', port=7634, args=None, refresh=10, timeout=2):
         """Init hddtemp stats."""
         self.args = args
         self.host = host
         self.port = port
+        self.refresh = float(refresh)
+        self.timeout = float(timeout)
         self.cache = ""
         self.reset()
+        # Last fetch failed (only log the state changes)
+        self.failed = False
+        self.thread = None
+        self._stopper = threading.Event()
+        self._fetched = threading.Event()
 
     def reset(self):
         """Reset/init the stats."""
         self.hddtemp_list = []
 
+    def disabled(self):
+        """Return True if the hddtemp plugin is disabled."""
+        return self.args is not None and getattr(self.args, 'disable_hddtemp', False)
+
+    def run(self):
+        """Poll the hddtemp daemon until the stop method is called or the plugin is disabled."""
+        while not self._stopper.is_set() and not self.disabled():
+            self.__update__()
+            self._fetched.set()
+            self._stopper.wait(self.refresh)
+
+    def stop(self):
+        """Stop the polling thread."""
+        self._stopper.set()
+
     def __update__(self):
         """Update the stats."""
-        # Reset the list
-        self.reset()
-
         # Fetch the data
         # data = ("|/dev/sda|WDC WD2500JS-75MHB0|44|C|"
         #         "|/dev/sdb|WDC WD2500JS-75MHB0|35|C|"
@@ -107,14 +142,23 @@ class GlancesGrabHDDTemp(object):
 
         # Exit if no data
         if data == "":
+            self.reset()
             return
 
         # Safety check to avoid malformed data
         # Considering the size of "|/dev/sda||0||" as the minimum
         if len(data) < 14:
-            data = self.cache if len(self.cache) > 0 else self.fetch()
+            # Keep the last stats
+            return
         self.cache = data
 
+        # The list is replaced at once (read by the get method)
+        self.hddtemp_list = self.parse(data)
+
+    @staticmethod
+    def parse(data):
+        """Return the HDDs list from the hddtemp daemon data."""
+        ret = []
         try:
             fields = data.split(b'|')
         except TypeError:
@@ -134,14 +178,19 @@ class GlancesGrabHDDTemp(object):
                 # Improper bytes/unicode in glances_hddtemp.py (see issue #887)
                 hddtemp_current['value'] = nativestr(temperature)
             hddtemp_current['unit'] = unit
-            self.hddtemp_list.append(hddtemp_current)
+            ret.append(hddtemp_current)
+        return ret
 
     def fetch(self):
-        """Fetch the data from hddtemp daemon."""
+        """Fetch the data from hddtemp daemon.
+
+        The daemon closes the connection once the data are sent, a new
+        connection is needed for each fetch.
+        """
         # Taking care of sudden deaths/stops of hddtemp daemon
+        sck = None
         try:
-            sck = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sck.connect((self.host, self.port))
+            sck = socket.create_connection((self.host, self.port), timeout=self.timeout)
             data = b''
             while True:
                 received = sck.recv(4096)
@@ -149,19 +198,30 @@ class GlancesGrabHDDTemp(object):
                     break
                 data += received
         except Exception as e:
-            logger.debug("Cannot connect to an HDDtemp server ({}:{} => {})".format(self.host, self.port, e))
-            logger.debug("Disable the HDDtemp module. Use the --disable-hddtemp to hide the previous message.")
+            if not self.failed:
+                logger.debug("Cannot connect to an HDDtemp server ({}:{} => {})".format(self.host, self.port, e))
+                logger.debug("Disable the HDDtemp module. Use the --disable-hddtemp to hide the previous message.")
+            self.failed = True
             if self.args is not None:
                 self.args.disable_hddtemp = True
             data = ""
+        else:
+            self.failed = False
+            logger.debug("Received data from the HDDtemp server: {}".format(data))
         finally:
-            sck.close()
-            if data != "":
-                logger.debug("Received data from the HDDtemp server: {}".format(data))
+            if sck is not None:
+                sck.close()
 
         return data
 
     def get(self):
-        """Get HDDs list."""
-        self.__update__()
+        """Get HDDs list (last stats fetched by the polling thread)."""
+        if (self.thread is None or not self.thread.is_alive()) and \
+           not self._stopper.is_set() and not self.disabled():
+            # First call (or plugin enabled again)
+            self.thread = threading.Thread(target=self.run, name='glances-hddtemp')
+            self.thread.daemon = True
+            self.thread.start()
+            # Wait for the first stats
+            self._fetched.wait(self.timeout)
         return self.hddtemp_list
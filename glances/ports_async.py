@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Asyncio ports and web scanner (Python 3.5 or higher)."""
+
+import asyncio
+import os
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from glances.globals import WINDOWS, MACOS, BSD
+from glances.logger import logger
+from glances.ports_list import add_rtt, icmp_scan
+from glances.timer import Counter
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+
+class GlancesPortsScanner(object):
+
+    """Scan the ports (TCP or ICMP) and the web (URL) items concurrently.
+
+    At most <concurrency> items are scanned at the same time. The TCP
+    timeouts are per connection (the global socket timeout is not used).
+    The web items share a requests session (keep-alive connections).
+    """
+
+    def __init__(self, concurrency=20, icmp=None):
+        """Init the scanner.
+
+        concurrency: max number of items scanned at the same time
+        icmp: instance of GlancesIcmp (None: ICMP checks with the ping command)
+        """
+        self.concurrency = max(int(concurrency), 1)
+        self.icmp = icmp
+        # The requests lib is blocking: web items are scanned in a thread pool
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self.session = requests.Session() if requests is not None else None
+
+    def exit(self):
+        """Close the thread pool and the web session."""
+        self.executor.shutdown(wait=False)
+        if self.session is not None:
+            self.session.close()
+
+    def scan(self, stats, stopped=None):
+        """Scan all the items of the stats list (blocking, one pass).
+
+        stopped: function returning True if the scan should be aborted
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.scan_all(stats, stopped or (lambda: False)))
+        finally:
+            loop.close()
+
+    async def scan_all(self, stats, stopped):
+        """Scan the items with at most concurrency workers."""
+        workers = []
+        if self.icmp is not None:
+            # All the ICMP ports are scanned at once (from one socket)
+            icmp_ports = [p for p in stats if 'port' in p and int(p['port']) == 0]
+            stats = [p for p in stats if p not in icmp_ports]
+            if icmp_ports:
+                loop = asyncio.get_event_loop()
+                workers.append(loop.run_in_executor(self.executor, icmp_scan, self.icmp, icmp_ports))
+        queue = deque(stats)
+        workers += [self.worker(queue, stopped) for _ in range(min(self.concurrency, len(queue)))]
+        if workers:
+            await asyncio.gather(*workers)
+
+    async def worker(self, queue, stopped):
+        """Scan the queued items, one at a time."""
+        while queue and not stopped():
+            item = queue.popleft()
+            try:
+                if 'port' in item:
+                    await self.port_scan(item)
+                elif 'url' in item and self.session is not None:
+                    await self.web_scan(item)
+            except Exception as e:
+                logger.debug("ports plugin - Error while scanning {} ({})".format(item['indice'], e))
+
+    async def port_scan(self, port):
+        """Scan the port (dict) and update the status key."""
+        if port['host'] is None:
+            return
+        if int(port['port']) == 0:
+            await self.port_scan_icmp(port)
+        else:
+            await self.port_scan_tcp(port)
+        if port['status'] is not False:
+            add_rtt(port, port['status'])
+
+    async def port_scan_tcp(self, port):
+        """Scan the (TCP) port and update the status key."""
+        counter = Counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(port['host'], int(port['port'])),
+                                               port['timeout'])
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug("ports plugin - Port {}:{} is not reachable ({})".format(port['host'], port['port'], e))
+            port['status'] = False
+        else:
+            port['status'] = counter.get()
+            writer.close()
+
+    async def port_scan_icmp(self, port):
+        """Scan the (ICMP) port with the system ping command and update the status key."""
+        # The ping command is run in the thread pool (asyncio child watchers
+        # need the main thread on Python < 3.8)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.executor, self.ping, port)
+
+    @staticmethod
+    def ping(port):
+        """Run the system ping command (blocking, run in the thread pool)."""
+        if WINDOWS:
+            timeout_opt = '-w'
+            count_opt = '-n'
+        elif MACOS or BSD:
+            timeout_opt = '-t'
+            count_opt = '-c'
+        else:
+            # Linux and co...
+            timeout_opt = '-W'
+            count_opt = '-c'
+        cmd = ['ping', count_opt, '1', timeout_opt, str(port['timeout']), port['host']]
+        with open(os.devnull, 'w') as fnull:
+            counter = Counter()
+            try:
+                ret = subprocess.call(cmd, stdout=fnull, stderr=fnull, close_fds=True,
+                                      timeout=port['timeout'] + 1)
+            except subprocess.TimeoutExpired:
+                ret = None
+        # Correct issue #1084: No Offline status for timeouted ports
+        port['status'] = counter.get() if ret == 0 else False
+
+    async def web_scan(self, web):
+        """Scan the Web/URL (dict) and update the status key."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self.executor, self.web_request, web)
+        if isinstance(web['status'], int):
+            add_rtt(web, web['elapsed'])
+
+    def web_request(self, web):
+        """Send the HEAD request (blocking, run in the thread pool)."""
+        try:
+            req = self.session.head(web['url'],
+                                    allow_redirects=True,
+                                    verify=web['ssl_verify'],
+                                    proxies=web['proxies'],
+                                    timeout=web['timeout'])
+        except Exception as e:
+            logger.debug(e)
+            web['status'] = 'Error'
+            web['elapsed'] = 0
+        else:
+            web['status'] = req.status_code
+            web['elapsed'] = req.elapsed.total_seconds()
@@ -19,6 +19,8 @@
 
 """Manage the Glances ports list (Ports plugin)."""
 
+import socket
+
 from glances.compat import range
 from glances.logger import logger
 from glances.globals import BSD
@@ -35,6 +37,54 @@ if not BSD:
 else:
     netifaces_tag = False
 
+# Upper bounds (in ms) of the RTT histograms buckets
+RTT_BUCKETS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def add_rtt(item, rtt):
+    """Add the RTT (in second) to the histogram of the port/web item.
+
+    The histogram is a dict {'<upper bound in ms>': count, ..., '+Inf': count}
+    """
+    histogram = item.setdefault('rtt_histogram',
+                                dict([(str(b), 0) for b in RTT_BUCKETS] + [('+Inf', 0)]))
+    for bucket in RTT_BUCKETS:
+        if rtt * 1000.0 <= bucket:
+            histogram[str(bucket)] += 1
+            return
+    histogram['+Inf'] += 1
+
+
+def icmp_scan(icmp, ports):
+    """Scan the ICMP ports (list of dict) at once and update their status.
+
+    icmp: instance of GlancesIcmp
+    The loss (in %) and jitter (in second) keys are also updated.
+    """
+    hosts = {}
+    for port in ports:
+        if port['host'] is None:
+            continue
+        try:
+            hosts[port['indice']] = socket.gethostbyname(port['host'])
+        except (socket.error, UnicodeError) as e:
+            logger.debug("Cannot convert {} to IP address ({})".format(port['host'], e))
+            port['status'] = False
+    if not hosts:
+        return
+    icmp.probe(list(set(hosts.values())), timeout=max(p['timeout'] for p in ports))
+    icmp.forget(hosts.values())
+    for port in ports:
+        if port['indice'] not in hosts:
+            continue
+        stats = icmp.stats(hosts[port['indice']])
+        # Correct issue #1084: No Offline status for timeouted ports
+        port['status'] = stats['rtt'] if stats['rtt'] is not None else False
+        port['loss'] = stats['loss']
+        port['jitter'] = stats['jitter']
+        if stats['rtt'] is not None:
+            add_rtt(port, stats['rtt'])
+
 
 class GlancesPortsList(object):
 
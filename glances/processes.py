@@ -234,9 +234,10 @@ class GlancesProcesses(object):
 
         # Grab standard stats
         #####################
-        standard_attrs = ['cmdline', 'cpu_percent', 'cpu_times', 'memory_info',
-                          'memory_percent', 'name', 'nice', 'pid', 'ppid',
-                          'status', 'username', 'status', 'num_threads']
+        # create_time is cached by psutil (used to detect the reused pids)
+        standard_attrs = ['cmdline', 'cpu_percent', 'cpu_times', 'create_time',
+                          'memory_info', 'memory_percent', 'name', 'nice', 'pid',
+                          'ppid', 'status', 'username', 'status', 'num_threads']
         # io_counters availability: Linux, BSD, Windows, AIX
         if not MACOS and not SUNOS and not WSL:
             standard_attrs += ['io_counters']
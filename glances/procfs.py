@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Kernel stats shared between plugins (read from /proc on Linux, psutil elsewhere)."""
+
+import io
+import os
+import time
+from collections import namedtuple
+
+from glances.compat import iteritems, listkeys
+from glances.globals import LINUX
+from glances.logger import logger
+
+import psutil
+
+# Same fields as the psutil named tuples
+scputimes = namedtuple('scputimes', ['user', 'nice', 'system', 'idle', 'iowait',
+                                     'irq', 'softirq', 'steal', 'guest', 'guest_nice'])
+scpustats = namedtuple('scpustats', ['ctx_switches', 'interrupts', 'soft_interrupts', 'syscalls'])
+svmem = namedtuple('svmem', ['total', 'available', 'percent', 'used', 'free',
+                             'active', 'inactive', 'buffers', 'cached', 'shared', 'slab'])
+sswap = namedtuple('sswap', ['total', 'used', 'free', 'percent', 'sin', 'sout'])
+snetio = namedtuple('snetio', ['bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                               'errin', 'errout', 'dropin', 'dropout'])
+sdiskio = namedtuple('sdiskio', ['read_count', 'write_count', 'read_bytes', 'write_bytes',
+                                 'read_time', 'write_time', 'read_merged_count',
+                                 'write_merged_count', 'busy_time'])
+
+# Errors raised by a missing or unexpected /proc file (psutil is used instead)
+PROCFS_ERRORS = (IOError, OSError, ValueError, KeyError, IndexError)
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+DISK_SECTOR_SIZE = 512
+
+
+def usage_percent(used, total):
+    """Return the usage percent (as psutil)."""
+    try:
+        return round(float(used) / total * 100, 1)
+    except ZeroDivisionError:
+        return 0.0
+
+
+def parse_stat(data):
+    """Return the CPU times (in second) and counters of a /proc/stat file content.
+
+    Output: a dict {'cpu': list, 'percpu': list of list, 'percpu_ids': list,
+                    'ctxt': int, 'intr': int, 'softirq': int}
+    """
+    ret = {'percpu': [], 'percpu_ids': []}
+    for line in data.splitlines():
+        # The intr and softirq lines have one column per IRQ: only the total is split
+        fields = line.split(None, 11 if line.startswith('cpu') else 2)
+        if not fields:
+            continue
+        if fields[0] == 'cpu':
+            ret['cpu'] = [float(i) / CLOCK_TICKS for i in fields[1:11]]
+        elif fields[0].startswith('cpu'):
+            ret['percpu'].append([float(i) / CLOCK_TICKS for i in fields[1:11]])
+            # The offline CPUs are not listed
+            ret['percpu_ids'].append(int(fields[0][3:]))
+        elif fields[0] in ('ctxt', 'intr', 'softirq'):
+            ret[fields[0]] = int(fields[1])
+    return ret
+
+
+def parse_keys(data, scale=1):
+    """Return the values of a 'key: value' or 'key value' /proc file content (meminfo, vmstat).
+
+    Output: a dict {key: value * scale}
+    """
+    ret = {}
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) >= 2:
+            ret[fields[0].rstrip(':')] = int(fields[1]) * scale
+    return ret
+
+
+def parse_net_dev(data):
+    """Return the network interfaces counters of a /proc/net/dev file content."""
+    ret = {}
+    for line in data.splitlines()[2:]:
+        colon = line.rfind(':')
+        fields = [int(i) for i in line[colon + 1:].split()]
+        ret[line[:colon].strip()] = snetio(fields[8], fields[0], fields[9], fields[1],
+                                           fields[2], fields[10], fields[3], fields[11])
+    return ret
+
+
+def parse_diskstats(data):
+    """Return the disks counters of a /proc/diskstats file content (as psutil)."""
+    ret = {}
+    for line in data.splitlines():
+        fields = line.split()
+        if len(fields) == 15:
+            # Linux 2.4
+            name = fields[3]
+            reads = int(fields[2])
+            (reads_merged, rbytes, rtime, writes, writes_merged,
+             wbytes, wtime, _, busy_time) = [int(i) for i in fields[4:13]]
+        elif len(fields) == 14 or len(fields) >= 18:
+            # Linux 2.6+, line referring to a disk
+            name = fields[2]
+            (reads, reads_merged, rbytes, rtime, writes, writes_merged,
+             wbytes, wtime, _, busy_time) = [int(i) for i in fields[3:13]]
+        elif len(fields) == 7:
+            # Linux 2.6+, line referring to a partition
+            name = fields[2]
+            reads, rbytes, writes, wbytes = [int(i) for i in fields[3:]]
+            rtime = wtime = reads_merged = writes_merged = busy_time = 0
+        else:
+            continue
+        ret[name] = sdiskio(reads, writes,
+                            rbytes * DISK_SECTOR_SIZE, wbytes * DISK_SECTOR_SIZE,
+                            rtime, wtime, reads_merged, writes_merged, busy_time)
+    return ret
+
+
+class WrapNumbers(object):
+
+    """Correct the counters wrapping around between two reads (as the psutil nowrap option).
+
+    Some kernel counters are 32 bits (network interfaces, disks): when a
+    counter is lower than at the previous read, its previous value is added
+    to all its next values.
+    """
+
+    def __init__(self):
+        # Last read counters: {(name, key): named tuple}
+        self.last = {}
+        # Corrections: {(name, key): list of values}
+        self.reminders = {}
+
+    def correct(self, name, counters):
+        """Return the corrected counters of a {key: named tuple} dict."""
+        ret = {}
+        for key, values in iteritems(counters):
+            last = self.last.get((name, key))
+            reminders = self.reminders.get((name, key))
+            if last is not None:
+                for i, (old, new) in enumerate(zip(last, values)):
+                    if new < old:
+                        # The counter wrapped
+                        if reminders is None:
+                            reminders = self.reminders[(name, key)] = [0] * len(values)
+                        reminders[i] += old
+            self.last[(name, key)] = values
+            if reminders is not None:
+                values = type(values)(*[v + r for v, r in zip(values, reminders)])
+            ret[key] = values
+        # Forget the removed interfaces/disks
+        for k in listkeys(self.last):
+            if k[0] == name and k[1] not in counters:
+                del self.last[k]
+                self.reminders.pop(k, None)
+        return ret
+
+
+class ProcFile(object):
+
+    """A /proc file kept open and read from the beginning into a reused buffer.
+
+    The seq_file based files (net/dev, diskstats, interrupts...) return
+    about one page per read system call: the file is read until the end
+    (empty read). The buffer grows with the file.
+    """
+
+    def __init__(self, path, size=4096):
+        self.path = path
+        self.buffer = bytearray(size)
+        self.file = None
+        # Number of read system calls (for the benchmarks)
+        self.reads = 0
+
+    def close(self):
+        """Close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read(self):
+        """Return the file content (bytes)."""
+        if self.file is None:
+            self.file = io.FileIO(self.path, 'r')
+        self.file.seek(0)
+        size = 0
+        while True:
+            if size == len(self.buffer):
+                # Buffer full: grow
+                self.buffer.extend(bytearray(len(self.buffer)))
+            read = self.file.readinto(memoryview(self.buffer)[size:])
+            self.reads += 1
+            if not read:
+                # End of the file
+                break
+            size += read
+        return memoryview(self.buffer)[:size].tobytes()
+
+
+class GlancesProcFS(object):
+
+    """Kernel stats shared between the plugins.
+
+    On Linux, each /proc file is read at most once per update (tick) from a
+    file descriptor kept open, and parsed once: the CPU, quicklook and
+    percpu plugins share /proc/stat, the mem, memswap and quicklook plugins
+    share /proc/meminfo... The methods return the same named tuples as the
+    psutil functions of the same name, which are used on the other
+    operating systems (or if a file can not be read).
+    """
+
+    files = {'stat': 'stat',
+             'meminfo': 'meminfo',
+             'vmstat': 'vmstat',
+             'loadavg': 'loadavg',
+             'net_dev': 'net/dev',
+             'diskstats': 'diskstats'}
+
+    def __init__(self, root='/proc', max_age=1):
+        """Init the kernel stats.
+
+        max_age: maximum age (in second) of the cached stats if tick is not called
+        """
+        self.root = root
+        self.max_age = max_age
+        self.enabled = LINUX and os.path.isdir(root)
+        self.procfiles = {}
+        # Parsed files: {name: (read time, parsed content)}
+        self.cache = {}
+        # The network and disks counters wrap around
+        self.wrap_numbers = WrapNumbers()
+
+    def tick(self):
+        """Start a new update: the files will be read again."""
+        self.cache = {}
+
+    def close(self):
+        """Close the files."""
+        for procfile in self.procfiles.values():
+            procfile.close()
+        self.procfiles = {}
+        self.cache = {}
+
+    def reads(self):
+        """Return the number of read system calls since the start."""
+        return sum(f.reads for f in self.procfiles.values())
+
+    def data(self, name, parser):
+        """Return the parsed content of the file (read at most once per tick)."""
+        cached = self.cache.get(name)
+        if cached is not None and time.time() - cached[0] < self.max_age:
+            return cached[1]
+        if not self.enabled:
+            raise IOError("{} not available".format(self.root))
+        if name not in self.procfiles:
+            self.procfiles[name] = ProcFile(os.path.join(self.root, self.files[name]))
+        try:
+            ret = parser(self.procfiles[name].read().decode('utf-8', 'replace'))
+        except PROCFS_ERRORS as e:
+            logger.debug("Cannot read {} ({})".format(self.procfiles[name].path, e))
+            self.procfiles.pop(name).close()
+            raise
+        self.cache[name] = (time.time(), ret)
+        return ret
+
+    def cpu_times(self, percpu=False):
+        """Return the CPU times (as psutil.cpu_times)."""
+        try:
+            stat = self.data('stat', parse_stat)
+            if percpu:
+                return [scputimes(*(times + [0.0] * (10 - len(times)))) for times in stat['percpu']]
+            times = stat['cpu']
+            return scputimes(*(times + [0.0] * (10 - len(times))))
+        except PROCFS_ERRORS:
+            return psutil.cpu_times(percpu=percpu)
+
+    def cpu_ids(self):
+        """Return the numbers of the CPUs (in the cpu_times percpu order)."""
+        try:
+            return self.data('stat', parse_stat)['percpu_ids']
+        except PROCFS_ERRORS:
+            return list(range(len(psutil.cpu_times(percpu=True))))
+
+    def cpu_stats(self):
+        """Return the CPU counters (as psutil.cpu_stats)."""
+        try:
+            stat = self.data('stat', parse_stat)
+            return scpustats(stat['ctxt'], stat['intr'], stat['softirq'], 0)
+        except PROCFS_ERRORS:
+            return psutil.cpu_stats()
+
+    def virtual_memory(self):
+        """Return the memory stats (as psutil.virtual_memory)."""
+        try:
+            mems = self.data('meminfo', lambda d: parse_keys(d, scale=1024))
+            total = mems['MemTotal']
+            free = mems['MemFree']
+            cached = mems.get('Cached', 0) + mems.get('SReclaimable', 0)
+            available = mems.get('MemAvailable', 0)
+            if available <= 0:
+                # Kernel < 3.14
+                available = free + cached
+            elif available > total:
+                # LXC containers
+                available = free
+            return svmem(total, available, usage_percent(total - available, total),
+                         total - available, free,
+                         mems.get('Active', 0), mems.get('Inactive', 0),
+                         mems.get('Buffers', 0), cached,
+                         mems.get('Shmem', mems.get('MemShared', 0)), mems.get('Slab', 0))
+        except PROCFS_ERRORS:
+            return psutil.virtual_memory()
+
+    def swap_memory(self):
+        """Return the swap stats (as psutil.swap_memory)."""
+        try:
+            mems = self.data('meminfo', lambda d: parse_keys(d, scale=1024))
+            total = mems['SwapTotal']
+            free = mems['SwapFree']
+            try:
+                vmstat = self.data('vmstat', parse_keys)
+                # Values in pages of 4 KB
+                sin = vmstat['pswpin'] * 4 * 1024
+                sout = vmstat['pswpout'] * 4 * 1024
+            except PROCFS_ERRORS:
+                sin = sout = 0
+            return sswap(total, total - free, free, usage_percent(total - free, total), sin, sout)
+        except PROCFS_ERRORS:
+            return psutil.swap_memory()
+
+    def getloadavg(self):
+        """Return the load average (as os.getloadavg)."""
+        try:
+            return self.data('loadavg', lambda d: tuple(float(i) for i in d.split()[:3]))
+        except PROCFS_ERRORS:
+            return os.getloadavg()
+
+    def net_io_counters(self):
+        """Return the network interfaces counters (as psutil.net_io_counters with pernic=True)."""
+        try:
+            return self.data('net_dev', lambda d: self.wrap_numbers.correct('net_dev', parse_net_dev(d)))
+        except PROCFS_ERRORS:
+            return psutil.net_io_counters(pernic=True)
+
+    def disk_io_counters(self):
+        """Return the disks counters (as psutil.disk_io_counters with perdisk=True)."""
+        try:
+            return self.data('diskstats', lambda d: self.wrap_numbers.correct('diskstats', parse_diskstats(d)))
+        except PROCFS_ERRORS:
+            return psutil.disk_io_counters(perdisk=True)
+
+
+# GlancesProcFS instance shared between plugins
+procfs = GlancesProcFS()
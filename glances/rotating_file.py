@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Manage the buffered and rotating files used by the file exports."""
+
+import gzip
+import os
+import shutil
+import threading
+import time
+
+from glances.compat import PY3, text_type
+from glances.logger import logger
+
+# zstandard is optional (only needed for compress=zstd)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def rotating_file_conf(config, section):
+    """Return the rotating file options of the given configuration section.
+
+    flush_every: flush the file every <flush_every> seconds (0: every write)
+    rotate_size: rotate the file when its size reaches <rotate_size> MB (0: never)
+    rotate_every: rotate the file every <rotate_every> seconds (0: never)
+    compress: compress the rotated files (none, gzip or zstd)
+    """
+    ret = {}
+    if config is None or not config.has_section(section):
+        return ret
+    ret['flush_every'] = config.get_float_value(section, 'flush_every', default=0)
+    ret['rotate_size'] = config.get_float_value(section, 'rotate_size', default=0)
+    ret['rotate_every'] = config.get_float_value(section, 'rotate_every', default=0)
+    ret['compress'] = config.get_value(section, 'compress', default='none').lower()
+    return ret
+
+
+def compress_file(file_name, compress):
+    """Compress (and delete) the given file.
+
+    :param compress: gzip or zstd
+    """
+    if compress == 'zstd':
+        target = file_name + '.zst'
+    else:
+        target = file_name + '.gz'
+    try:
+        with open(file_name, 'rb') as f_in:
+            if compress == 'zstd':
+                with open(target, 'wb') as f_out:
+                    zstandard.ZstdCompressor().copy_stream(f_in, f_out)
+            else:
+                with gzip.open(target, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+        os.remove(file_name)
+    except (IOError, OSError) as e:
+        logger.error("Cannot compress file {} ({})".format(file_name, e))
+    else:
+        logger.debug("File {} compressed to {}".format(file_name, target))
+
+
+class GlancesRotatingFile(object):
+
+    """This class manages a buffered file with size or time based rotation.
+
+    The rotated files are renamed <name>.<date>.<ext> and (optionally)
+    compressed in a background thread.
+    """
+
+    def __init__(self, file_name, file_mode='w',
+                 flush_every=0, rotate_size=0, rotate_every=0, compress='none'):
+        self.file_name = file_name
+        self.flush_every = flush_every
+        self.rotate_size = int(rotate_size * 1024 * 1024)
+        self.rotate_every = rotate_every
+        if compress == 'zstd' and zstandard is None:
+            logger.warning("Missing Python Lib (zstandard), rotated files will be compressed with gzip")
+            compress = 'gzip'
+        self.compress = compress if compress in ['gzip', 'zstd'] else None
+
+        self.file = None
+        self.open(file_mode)
+
+    def open(self, file_mode='w'):
+        """Open the file (raise IOError on failure)."""
+        # Use a large buffer, the file is flushed every flush_every seconds
+        if PY3:
+            self.file = open(self.file_name, file_mode, newline='', encoding='utf-8',
+                             buffering=1024 * 1024)
+        else:
+            self.file = open(self.file_name, file_mode + 'b', 1024 * 1024)
+        self.size = os.path.getsize(self.file_name)
+        self.opened = time.time()
+        self.flushed = time.time()
+
+    def close(self):
+        """Flush and close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def write(self, data):
+        """Write data to the file (flushed every flush_every seconds)."""
+        self.file.write(data)
+        # Size in bytes (the text is encoded in UTF-8)
+        if isinstance(data, text_type):
+            self.size += len(data.encode('utf-8'))
+        else:
+            self.size += len(data)
+        if time.time() - self.flushed >= self.flush_every:
+            self.file.flush()
+            self.flushed = time.time()
+
+    def need_rotate(self):
+        """Return True if the file should be rotated (size or time)."""
+        return (self.rotate_size > 0 and self.size >= self.rotate_size) or \
+               (self.rotate_every > 0 and time.time() - self.opened >= self.rotate_every)
+
+    def rotate(self):
+        """Close and rename the current file, then open a new one."""
+        self.close()
+        base, ext = os.path.splitext(self.file_name)
+        rotated = '{}.{}{}'.format(base, time.strftime('%Y%m%d-%H%M%S'), ext)
+        i = 0
+        while os.path.exists(rotated):
+            i += 1
+            rotated = '{}.{}-{}{}'.format(base, time.strftime('%Y%m%d-%H%M%S'), i, ext)
+        try:
+            os.rename(self.file_name, rotated)
+        except OSError as e:
+            logger.error("Cannot rotate file {} ({})".format(self.file_name, e))
+        else:
+            logger.info("File {} rotated to {}".format(self.file_name, rotated))
+            if self.compress is not None:
+                thread = threading.Thread(target=compress_file,
+                                          args=(rotated, self.compress))
+                thread.start()
+        self.open('w')
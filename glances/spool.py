@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of Glances.
+#
+# Copyright (C) 2019 Nicolargo <nicolas@nicolargo.com>
+#
+# Glances is free software; you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Glances is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Manage the on-disk spool used by the exports (store and forward)."""
+
+import io
+import json
+import os
+
+from glances.globals import safe_makedirs
+from glances.logger import logger
+
+
+class GlancesSpool(object):
+
+    """This class manages a size-capped and segmented on-disk log.
+
+    Records (any JSON serializable object) are appended to the last
+    segment and read back, in order, from the first one.
+    A segment is deleted as soon as all its records have been read.
+    When the max size is reached, the oldest segment is dropped.
+    """
+
+    segment_ext = '.spool'
+
+    def __init__(self, path, max_size=64 * 1024 * 1024, segments=8):
+        """Init the spool in the given folder.
+
+        :param path: folder where the segments are stored
+        :param max_size: max size (in bytes) of the spool
+        :param segments: number of segments used to split the spool
+        """
+        self.path = path
+        self.max_size = max_size
+        self.segment_size = max(max_size // segments, 1)
+        safe_makedirs(self.path)
+
+        # Read offset of the first segment
+        self.offset_file = os.path.join(self.path, 'offset')
+        self.offset = self.__load_offset()
+
+        # List of the segments numbers (oldest first) and total size
+        self.segments = sorted(int(f[:-len(self.segment_ext)])
+                               for f in os.listdir(self.path)
+                               if f.endswith(self.segment_ext) and f[:-len(self.segment_ext)].isdigit())
+        self.size = sum(os.path.getsize(self.__segment(s)) for s in self.segments)
+        if not self.segments:
+            self.offset = 0
+        # Size of the record returned by the last peek() call
+        self._peek_size = 0
+
+        if self.segments:
+            logger.info("Spool {} contains {} bytes to replay".format(self.path, self.size - self.offset))
+
+    def __segment(self, number):
+        """Return the file name of the given segment."""
+        return os.path.join(self.path, '{:010d}{}'.format(number, self.segment_ext))
+
+    def __load_offset(self):
+        try:
+            with io.open(self.offset_file, 'r') as f:
+                return int(f.read().strip() or 0)
+        except (IOError, OSError, ValueError):
+            return 0
+
+    def __save_offset(self):
+        try:
+            with io.open(self.offset_file, 'w') as f:
+                f.write(u'{}'.format(self.offset))
+        except (IOError, OSError) as e:
+            logger.debug("Cannot save spool offset in {} ({})".format(self.offset_file, e))
+
+    def __drop_first_segment(self):
+        """Delete the first (oldest) segment."""
+        segment = self.__segment(self.segments.pop(0))
+        try:
+            self.size -= os.path.getsize(segment)
+            os.remove(segment)
+        except OSError as e:
+            logger.debug("Cannot delete spool segment {} ({})".format(segment, e))
+        self.offset = 0
+        self.__save_offset()
+
+    def is_empty(self):
+        """Return True if there is no record to read."""
+        return self.size <= self.offset
+
+    def append(self, record):
+        """Append a record at the end of the spool."""
+        line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+
+        if not self.segments or \
+           os.path.getsize(self.__segment(self.segments[-1])) + len(line) > self.segment_size:
+            self.segments.append(self.segments[-1] + 1 if self.segments else 0)
+
+        try:
+            with io.open(self.__segment(self.segments[-1]), 'ab') as f:
+                f.write(line)
+        except (IOError, OSError) as e:
+            logger.error("Cannot write to the spool {} ({})".format(self.path, e))
+            return False
+        self.size += len(line)
+
+        # Size cap: drop the oldest records
+        while self.size > self.max_size and len(self.segments) > 1:
+            logger.warning("Spool {} is full, drop its oldest records".format(self.path))
+            self.__drop_first_segment()
+
+        return True
+
+    def peek(self):
+        """Return the first record of the spool (without removing it).
+
+        Return None if the spool is empty.
+        """
+        while self.segments:
+            try:
+                with io.open(self.__segment(self.segments[0]), 'rb') as f:
+                    f.seek(self.offset)
+                    line = f.readline()
+            except (IOError, OSError) as e:
+                logger.error("Cannot read the spool {} ({})".format(self.path, e))
+                return None
+
+            if not line:
+                # End of the segment
+                if len(self.segments) == 1 and self.offset == 0:
+                    return None
+                self.__drop_first_segment()
+                continue
+
+            try:
+                self._peek_size = len(line)
+                return json.loads(line.decode('utf-8'))
+            except ValueError:
+                # Truncated record (Glances killed while writing)
+                logger.debug("Skip corrupted record in the spool {}".format(self.path))
+                self.offset += len(line)
+
+        return None
+
+    def pop(self):
+        """Remove the record returned by the last peek() call."""
+        self.offset += self._peek_size
+        self._peek_size = 0
+        self.__save_offset()
@@ -27,6 +27,7 @@ import traceback
 
 from glances.logger import logger
 from glances.globals import exports_path, plugins_path, sys_path
+from glances.procfs import procfs
 from glances.timer import Counter
 
 
@@ -223,6 +224,8 @@ class GlancesStats(object):
     def update(self):
         """Wrapper method to update the stats."""
         # For standalone and server modes
+        # The kernel stats files are read again (once) for this update
+        procfs.tick()
         # For each plugins, call the update method
         for p in self._plugins:
             if self._plugins[p].is_disable():
@@ -326,3 +329,5 @@ class GlancesStats(object):
         # Close plugins
         for p in self._plugins:
             self._plugins[p].exit()
+        # Close the kernel stats files
+        procfs.close()
@@ -58,16 +58,17 @@ def get_install_extras_require():
         'cpuinfo': ['py-cpuinfo'],
         'docker': ['docker>=2.0.0'],
         'export': ['bernhard', 'cassandra-driver', 'couchdb', 'elasticsearch',
-                   'influxdb>=1.0.0', 'kafka-python', 'pika', 'paho-mqtt', 'potsdb',
-                   'prometheus_client', 'pyzmq', 'statsd'],
-        'folders': ['scandir'],  # python_version<"3.5"
+                   'influxdb>=1.0.0', 'kafka-python', 'msgpack', 'pika', 'paho-mqtt', 'potsdb',
+                   'prometheus_client', 'pyarrow', 'pyzmq', 'statsd', 'zstandard'],
+        'folders': ['scandir', 'inotify_simple'],  # scandir: python_version<"3.5", inotify_simple: Linux
         'gpu': ['py3nvml'],
-        'graph': ['pygal'],
+        'graph': ['pygal', 'numpy'],
         'ip': ['netifaces'],
         'raid': ['pymdstat'],
         'smart': ['pySMART.smartx'],
         'snmp': ['pysnmp'],
         'sparklines': ['sparklines'],
+        'systemd': ['jeepney'],
         'web': ['bottle', 'requests'],
         'wifi': ['wifi']
     }
@@ -20,6 +20,8 @@
 
 """Glances unitary tests suite."""
 
+import os
+import sys
 import time
 import unittest
 
@@ -34,7 +36,7 @@ from glances.thresholds import GlancesThresholdWarning
 from glances.thresholds import GlancesThresholdCritical
 from glances.thresholds import GlancesThresholds
 from glances.plugins.glances_plugin import GlancesPlugin
-from glances.compat import subsample, range
+from glances.compat import subsample, time_serie_subsample, time_serie_lttb, range
 
 # Global variables
 # =================
@@ -254,6 +256,21 @@ class TestGlances(unittest.TestCase):
             l_subsample = subsample(l[0], l[1])
             self.assertLessEqual(len(l_subsample), l[1])
 
+    def test_015_time_serie_subsample(self):
+        """Test time series subsampling functions."""
+        print('INFO: [TEST_015] Time series subsampling')
+        from datetime import datetime, timedelta
+        for n, sampling in [(6, 4), (800, 4), (8000, 800)]:
+            data = [(datetime(2019, 1, 1) + timedelta(seconds=3 * i), i % 10) for i in range(n)]
+            data[n // 2] = (data[n // 2][0], 100)
+            self.assertEqual(len(time_serie_subsample(data, sampling)), sampling)
+            lttb = time_serie_lttb(data, sampling)
+            self.assertEqual(len(lttb), sampling)
+            self.assertEqual(lttb[0], data[0])
+            self.assertEqual(lttb[-1], data[-1])
+            # LTTB keeps the peaks
+            self.assertIn(data[n // 2], lttb)
+
     def test_016_hddsmart(self):
         """Check hard disk SMART data plugin."""
         try:
@@ -277,6 +294,1042 @@ class TestGlances(unittest.TestCase):
 
         print('INFO: SMART stats: %s' % stats_grab)
 
+    def test_017_spool(self):
+        """Test the export spool (store and forward)."""
+        print('INFO: [TEST_017] Export spool')
+        import shutil
+        import tempfile
+        from glances.spool import GlancesSpool
+        path = tempfile.mkdtemp()
+        try:
+            spool = GlancesSpool(path, max_size=1024, segments=4)
+            self.assertTrue(spool.is_empty())
+            for i in range(10):
+                spool.append([i, [['cpu', ['total'], [i]]]])
+            # Records are read back in order
+            self.assertEqual(spool.peek()[0], 0)
+            spool.pop()
+            self.assertEqual(spool.peek()[0], 1)
+            # The spool survives a restart
+            spool = GlancesSpool(path, max_size=1024, segments=4)
+            self.assertEqual(spool.peek()[0], 1)
+            # The oldest records are dropped when the spool is full
+            for i in range(10, 100):
+                spool.append([i, [['cpu', ['total'], [i]]]])
+            self.assertLessEqual(spool.size, 1024)
+            self.assertGreater(spool.peek()[0], 1)
+            while spool.peek() is not None:
+                last = spool.peek()[0]
+                spool.pop()
+            self.assertEqual(last, 99)
+            self.assertTrue(spool.is_empty())
+        finally:
+            shutil.rmtree(path)
+
+    def test_018_framing(self):
+        """Test the brokers exports messages framing."""
+        print('INFO: [TEST_018] Messages framing')
+        import json
+        from glances.framing import GlancesFraming
+        # Default: one JSON dict per plugin
+        framing = GlancesFraming()
+        self.assertEqual(framing.add('cpu', ['user', 'system'], [1, 2]),
+                         [('cpu', b'{"user": 1, "system": 2}')])
+        self.assertEqual(framing.flush(), [])
+        # One message per refresh, columns only sent with the schema
+        framing = GlancesFraming(envelope='tick', column_dict=True)
+        for i in range(3):
+            self.assertEqual(framing.add('cpu', ['user', 'system'], [i, 2]), [])
+            self.assertEqual(framing.add('load', ['min1'], [0.5]), [])
+            messages = framing.flush()
+            self.assertEqual(len(messages), 2 if i == 0 else 1)
+            self.assertEqual(json.loads(messages[-1][1].decode('utf-8')),
+                             {'schema': 1, 'points': {'cpu': [i, 2], 'load': [0.5]}})
+        # New schema when the columns change
+        framing.add('cpu', ['user'], [1])
+        messages = framing.flush()
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(json.loads(messages[0][1].decode('utf-8')),
+                         {'schema': 2, 'columns': {'cpu': ['user']}})
+
+    def test_019_cgroups(self):
+        """Check the cgroups reader."""
+        if not LINUX:
+            print('INFO: [TEST_019] cgroups are only available on Linux')
+            return
+        from glances.cgroups import GlancesCgroups, GlancesPidContainers, cgroup_container, pid_cgroups
+        print('INFO: [TEST_019] Read the cgroup stats of the Glances process')
+        self.assertIsInstance(pid_cgroups(os.getpid()), dict)
+        self.assertIsNone(pid_cgroups(-1))
+        cgroups = GlancesCgroups()
+        stats = cgroups.update({'glances': os.getpid()})
+        self.assertIn('networks', stats['glances'])
+        stats = cgroups.update({})
+        self.assertEqual(stats, {})
+        self.assertEqual(cgroups.folders, {})
+        container_id = 'f' * 64
+        pod_uid = '0f9c4a3e-2d1b-4c5a-8e7f-123456789abc'
+        self.assertEqual(cgroup_container('/docker/' + container_id), (container_id, None))
+        self.assertEqual(cgroup_container('/kubepods.slice/kubepods-burstable.slice/'
+                                          'kubepods-burstable-pod{}.slice/'
+                                          'cri-containerd-{}.scope'.format(pod_uid.replace('-', '_'),
+                                                                           container_id)),
+                         (container_id, pod_uid))
+        self.assertEqual(cgroup_container('/user.slice'), (None, None))
+        # A reused pid is a new process
+        pid_containers = GlancesPidContainers()
+        pid_containers.get(os.getpid(), 1.0)
+        pid_containers.get(os.getpid(), 2.0)
+        self.assertEqual(len(pid_containers.cache), 2)
+        pid_containers.prune({(os.getpid(), 2.0)})
+        self.assertEqual(list(pid_containers.cache), [(os.getpid(), 2.0)])
+
+    def test_020_docker_async(self):
+        """Check the asyncio Docker stats collector with a fake Docker daemon."""
+        if WINDOWS or sys.version_info < (3, 5):
+            print('INFO: [TEST_020] The async Docker collector needs Python 3.5 on a Unix system')
+            return
+        import json
+        import shutil
+        import socketserver
+        import tempfile
+        import threading
+        from http.server import BaseHTTPRequestHandler
+        from glances.docker_async import GlancesDockerAsync
+        print('INFO: [TEST_020] Fetch the stats of 1000 containers from a fake Docker daemon')
+
+        connections = []
+
+        class DockerHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                connections.append(self)
+                BaseHTTPRequestHandler.setup(self)
+
+            def do_GET(self):
+                container_id = self.path.split('/')[2]
+                body = json.dumps({'id': container_id,
+                                   'memory_stats': {'usage': 1024}}).encode('utf-8')
+                self.send_response(200 if container_id != 'missing' else 404)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class DockerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+            request_queue_size = 64
+
+        folder = tempfile.mkdtemp()
+        server = DockerServer(os.path.join(folder, 'docker.sock'), DockerHandler)
+        threading.Thread(target=server.serve_forever).start()
+        collector = GlancesDockerAsync(url='unix://' + server.server_address,
+                                       concurrency=8, deadline=30)
+        try:
+            containers = ['{:064x}'.format(i) for i in range(1000)] + ['missing']
+            stats = collector.update(containers)
+            self.assertEqual(len(stats), 1000)
+            self.assertEqual(stats[containers[42]]['id'], containers[42])
+            self.assertNotIn('missing', stats)
+            self.assertLessEqual(len(connections), 8)
+            # Removed containers are forgotten (the stats dict is swapped, not modified)
+            snapshot = collector.stats
+            stats = collector.update(containers[:10])
+            self.assertEqual(len(stats), 10)
+            self.assertEqual(len(collector.stats), 10)
+            self.assertEqual(len(snapshot), 1000)
+        finally:
+            collector.exit()
+            server.shutdown()
+            server.server_close()
+            shutil.rmtree(folder)
+
+    def test_021_ports_scanner(self):
+        """Check the concurrent ports scanner."""
+        if sys.version_info < (3, 5):
+            print('INFO: [TEST_021] The concurrent ports scanner needs Python 3.5')
+            return
+        import socket
+        from glances.ports_async import GlancesPortsScanner
+        print('INFO: [TEST_021] Scan 100 local TCP ports concurrently')
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(128)
+        opened = server.getsockname()[1]
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(('127.0.0.1', 0))
+        ports = [{'host': '127.0.0.1', 'port': opened if i else closed.getsockname()[1],
+                  'timeout': 1, 'status': None, 'indice': 'port_{}'.format(i)} for i in range(100)]
+        scanner = GlancesPortsScanner(concurrency=10)
+        try:
+            scanner.scan(ports)
+        finally:
+            scanner.exit()
+            server.close()
+            closed.close()
+        self.assertIs(ports[0]['status'], False)
+        self.assertNotIn('rtt_histogram', ports[0])
+        for port in ports[1:]:
+            self.assertIsInstance(port['status'], float)
+            self.assertEqual(sum(port['rtt_histogram'].values()), 1)
+
+    def test_022_icmp(self):
+        """Check the ICMP probes engine."""
+        from glances.icmp import GlancesIcmp
+        icmp = GlancesIcmp(window=3)
+        if not icmp.available():
+            print('INFO: [TEST_022] ICMP socket not allowed')
+            return
+        print('INFO: [TEST_022] Ping 127.0.0.1 to 127.0.0.5 from one socket')
+        hosts = ['127.0.0.{}'.format(i) for i in range(1, 6)]
+        try:
+            for _ in range(4):
+                rtts = icmp.probe(hosts, timeout=2)
+        finally:
+            icmp.close()
+        for host in hosts:
+            self.assertIsInstance(rtts[host], float)
+            stats = icmp.stats(host)
+            self.assertEqual(stats['loss'], 0)
+            self.assertIsNotNone(stats['jitter'])
+            self.assertEqual(len(icmp.history[host]), 3)
+
+    def test_023_amps_matcher(self):
+        """Check the AMPs processes matcher."""
+        from glances.amps_list import AmpsMatcher
+        print('INFO: [TEST_023] AMPs processes matcher')
+        matcher = AmpsMatcher()
+        matcher.set_regexes({'nginx': r'\/usr\/sbin\/nginx', 'python': r'python[23]?'})
+        self.assertIsNotNone(matcher.combined)
+        processes = [{'pid': 1, 'create_time': 1.0, 'name': 'nginx', 'cmdline': ['/usr/sbin/nginx']},
+                     {'pid': 2, 'create_time': 1.0, 'name': 'python3', 'cmdline': ['python3', 'app.py']},
+                     {'pid': 3, 'create_time': 1.0, 'name': 'kthreadd', 'cmdline': None}]
+        matcher.update(processes)
+        self.assertEqual(matcher.get('nginx'), set([1]))
+        self.assertEqual(matcher.get('python'), set([2]))
+        # Reused pid and departed process
+        processes = [{'pid': 1, 'create_time': 2.0, 'name': 'bash', 'cmdline': ['bash']},
+                     processes[2]]
+        matcher.update(processes)
+        self.assertEqual(matcher.get('nginx'), set())
+        self.assertEqual(matcher.get('python'), set())
+        self.assertEqual(sorted(matcher.cache), [1, 3])
+
+    def test_024_amps_executor(self):
+        """Check the AMPs executor timeouts."""
+        from glances.amps_list import AmpsExecutor
+        from glances.amps.glances_default import Amp
+        print('INFO: [TEST_024] AMPs executor')
+        amp = Amp(name='sleep')
+        amp.configs = {'enable': 'true', 'regex': 'sleep', 'refresh': 1,
+                       'timeout': 0.5, 'command': 'sleep 5'}
+        executor = AmpsExecutor()
+        try:
+            executor.submit(amp, [])
+            self.assertTrue(executor.is_running('sleep'))
+            # The command is killed after the timeout
+            for _ in range(30):
+                time.sleep(0.1)
+                executor.collect({'sleep': amp})
+                if not executor.is_running('sleep'):
+                    break
+        finally:
+            executor.exit()
+        self.assertFalse(executor.is_running('sleep'))
+        self.assertEqual(executor.get('sleep')['runs'], 1)
+        self.assertLess(executor.get('sleep')['run_time'], 3)
+
+    def test_025_systemd_units(self):
+        """Check the systemd units table updated from D-Bus signals."""
+        from glances.amps.glances_systemd import SystemdUnits, SYSTEMD_UNIT
+        print('INFO: [TEST_025] Systemd units from a mock D-Bus')
+
+        class MockBus(object):
+            units = [('a.service', '', 'loaded', 'active', 'running', '', '/unit/a', 0, '', '/'),
+                     ('b.service', '', 'loaded', 'failed', 'failed', '', '/unit/b', 0, '', '/'),
+                     ('c.service', '', 'loaded', 'inactive', 'dead', '', '/unit/c', 0, '', '/')]
+            pending = []
+            calls = 0
+
+            def list_units(self):
+                self.calls += 1
+                return self.units
+
+            def signals(self):
+                ret, self.pending = self.pending, []
+                return ret
+
+        bus = MockBus()
+        units = SystemdUnits(bus)
+        units.update()
+        self.assertEqual(units.status(), {'loaded': 2, 'active': 1, 'failed': 1})
+        # c is started, a is removed
+        bus.pending = [('PropertiesChanged', '/unit/c', (SYSTEMD_UNIT, {'ActiveState': 'active'}, [])),
+                       ('UnitRemoved', '/org/freedesktop/systemd1', ('a.service', '/unit/a'))]
+        units.update()
+        self.assertEqual(units.status(), {'loaded': 2, 'active': 1, 'failed': 1})
+        self.assertEqual(units.units['/unit/c']['active'], 'active')
+        self.assertEqual(bus.calls, 1)
+        # A job is started on the inactive b unit, then finished
+        bus.pending = [('PropertiesChanged', '/unit/b', (SYSTEMD_UNIT, {'ActiveState': 'inactive'}, [])),
+                       ('JobNew', '/org/freedesktop/systemd1', (42, '/job/42', 'b.service'))]
+        units.update()
+        self.assertEqual(units.units['/unit/b']['job'], 42)
+        self.assertEqual(units.status(), {'loaded': 2, 'active': 1, 'inactive': 1})
+        bus.pending = [('JobRemoved', '/org/freedesktop/systemd1', (42, '/job/42', 'b.service', 'done'))]
+        units.update()
+        self.assertEqual(units.status(), {'loaded': 1, 'active': 1})
+        bus.pending = [('PropertiesChanged', '/unit/b', (SYSTEMD_UNIT, {'Job': (7, '/job/7')}, []))]
+        units.update()
+        self.assertEqual(units.units['/unit/b']['job'], 7)
+        self.assertEqual(bus.calls, 1)
+        # Unknown unit: the list is read again
+        bus.pending = [('UnitNew', '/org/freedesktop/systemd1', ('d.service', '/unit/d'))]
+        units.update()
+        self.assertEqual(bus.calls, 2)
+
+    def test_026_hwmon(self):
+        """Check the hwmon sensors reader."""
+        import shutil
+        import tempfile
+        from glances.hwmon import GlancesHwmon
+        print('INFO: [TEST_026] Sensors from a fake sysfs')
+        root = tempfile.mkdtemp()
+
+        def write(path, value):
+            path = os.path.join(root, 'class', path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write(value)
+
+        try:
+            write('hwmon/hwmon0/name', 'coretemp\n')
+            write('hwmon/hwmon0/temp1_input', '45000\n')
+            write('hwmon/hwmon0/temp1_label', 'Package id 0\n')
+            write('hwmon/hwmon0/temp2_input', '41000\n')
+            write('hwmon/hwmon1/name', 'nct6775\n')
+            write('hwmon/hwmon1/fan1_input', '1200\n')
+            hwmon = GlancesHwmon(root=root)
+            self.assertEqual(hwmon.update(),
+                             [{'label': 'Package id 0', 'value': 45, 'unit': 'C'},
+                              {'label': 'coretemp 2', 'value': 41, 'unit': 'C'},
+                              {'label': 'nct6775 1', 'value': 1200, 'unit': 'R'}])
+            # The values are read again from the open files
+            write('hwmon/hwmon1/fan1_input', '900\n')
+            self.assertEqual(hwmon.update()[2]['value'], 900)
+            # Hotplug
+            write('hwmon/hwmon2/name', 'nvme\n')
+            write('hwmon/hwmon2/temp1_input', '38000\n')
+            self.assertEqual(len(hwmon.update()), 4)
+            hwmon.close()
+        finally:
+            shutil.rmtree(root)
+
+    def test_027_hddtemp(self):
+        """Check the hddtemp background client."""
+        import argparse
+        import socket
+        import threading
+        from glances.plugins.sensors.glances_hddtemp import GlancesGrabHDDTemp
+        print('INFO: [TEST_027] hddtemp client')
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+
+        def serve():
+            conn, _ = server.accept()
+            conn.sendall(b'|/dev/sda|WDC WD2500JS-75MHB0|44|C||/dev/sdb|???|SLP|*|')
+            conn.close()
+
+        port = server.getsockname()[1]
+        thread = threading.Thread(target=serve)
+        thread.start()
+        hddtemp = GlancesGrabHDDTemp(port=port, refresh=60, timeout=2)
+        try:
+            stats = hddtemp.get()
+        finally:
+            hddtemp.stop()
+            thread.join()
+            server.close()
+        self.assertEqual(stats, [{'label': 'sda', 'value': 44.0, 'unit': 'C'},
+                                 {'label': 'sdb', 'value': 'SLP', 'unit': '*'}])
+        # Dead daemon: no wait, the plugin is disabled and the thread stops
+        args = argparse.Namespace(disable_hddtemp=False)
+        hddtemp = GlancesGrabHDDTemp(port=port, args=args, refresh=0.1, timeout=0.5)
+        start = time.time()
+        self.assertEqual(hddtemp.get(), [])
+        self.assertLess(time.time() - start, 1)
+        hddtemp.thread.join(1)
+        self.assertFalse(hddtemp.thread.is_alive())
+        self.assertTrue(args.disable_hddtemp)
+        hddtemp.stop()
+
+    def test_028_mounts(self):
+        """Check the mount points list and the hang-proof file systems usage."""
+        import psutil
+        import threading
+        from glances.mounts import parse_mountinfo, GlancesFsUsage
+        print('INFO: [TEST_028] Mount points and stale file systems')
+        partitions = parse_mountinfo('36 35 98:0 / / rw,noatime master:1 - ext4 /dev/sda1 rw\n'
+                                     '37 35 0:42 / /mnt/my\\040disk rw shared:2 - nfs srv:/export rw\n')
+        self.assertEqual(partitions[0].device, '/dev/sda1')
+        self.assertEqual(partitions[1].mountpoint, '/mnt/my disk')
+        self.assertEqual(partitions[1].fstype, 'nfs')
+
+        disk_usage = psutil.disk_usage
+
+        never = threading.Event()
+
+        def hung_disk_usage(path):
+            if path == '/hung':
+                # The worker never returns
+                never.wait()
+            return disk_usage('/')
+
+        fs_usage = GlancesFsUsage(workers=2, timeout=0.5)
+        psutil.disk_usage = hung_disk_usage
+        try:
+            start = time.time()
+            usage = fs_usage.update(['/', '/hung'])
+            self.assertLess(time.time() - start, 1)
+            self.assertFalse(usage['/'][1])
+            # The hung mount point is not read again (back off)
+            self.assertEqual(fs_usage.failures['/hung'], 1)
+            self.assertEqual(fs_usage.update(['/', '/hung'])['/'][1], False)
+            self.assertEqual(fs_usage.threads, 3)
+            # Hung since its first read: reported as stale with an unknown usage
+            self.assertEqual(usage['/hung'], (None, True))
+        finally:
+            psutil.disk_usage = disk_usage
+            fs_usage.exit()
+
+    def test_029_tcp_states(self):
+        """Check the TCP states count from the sockets tables."""
+        import tempfile
+        from glances.plugins.glances_connections import tcp_states_count
+        print('INFO: [TEST_029] TCP states count')
+        line = '{:4}: 0100007F:BC8F 0100007F:1F90 {} 00000000:00000000 00:00000000 00000000 0 0 1020 1\n'
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            f.write('  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt\n')
+            for i, state in enumerate(['0A', '01', '01', '06', '02', '08']):
+                f.write(line.format(i, state))
+        try:
+            # Small chunks: lines split between two reads
+            counts = tcp_states_count([f.name, '/nonexistent'], chunk_size=50)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(counts, {'LISTEN': 1, 'ESTABLISHED': 2, 'TIME_WAIT': 1,
+                                  'SYN_SENT': 1, 'CLOSE_WAIT': 1})
+
+    def test_030_irq(self):
+        """Check the IRQ file parser."""
+        import tempfile
+        from glances.plugins.glances_irq import GlancesIRQ
+        print('INFO: [TEST_030] IRQ per-CPU rates')
+        # Per-CPU counters are written with the '%10u ' format
+        data = ('           CPU0       CPU1       CPU2       \n'
+                '  0: {:>10} {:>10} {:>10}   IO-APIC   2-edge      timer\n'
+                'LOC: {:>10} {:>10} {:>10}   Local timer interrupts\n'
+                'ERR: {:>10}\n')
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            f.write(data.format(5, 0, 0, 10, 100, 20, 0))
+        irq = GlancesIRQ()
+        irq.IRQ_FILE = f.name
+        try:
+            irq.get()
+            with open(f.name, 'w') as f:
+                f.write(data.format(5, 0, 0, 10, 100 + 3000, 20, 2))
+            stats = dict([(i['irq_line'], i) for i in irq.get()])
+        finally:
+            irq.close()
+            os.remove(f.name)
+        self.assertEqual(sorted(stats), ['0_timer', 'ERR', 'LOC'])
+        # Interrupts since the last update
+        self.assertEqual(stats['LOC']['irq_rate'], 3000)
+        self.assertEqual(stats['LOC']['irq_rate_per_cpu'], [0, 3000, 0])
+        self.assertEqual(stats['0_timer']['irq_rate_per_cpu'], [0, 0, 0])
+        self.assertEqual(stats['ERR']['irq_rate'], 2)
+        self.assertNotIn('irq_rate_per_cpu', stats['ERR'])
+
+    def test_031_procfs(self):
+        """Check the kernel stats read from /proc."""
+        import shutil
+        import tempfile
+        from glances.procfs import GlancesProcFS, ProcFile, CLOCK_TICKS
+        print('INFO: [TEST_031] Kernel stats files read once per update')
+        root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(root, 'net'))
+        files = {'stat': ('cpu  {0} 0 {0} {0} 0 0 0 0 0 0\ncpu0 {0} 0 {0} {0} 0 0 0 0 0 0\n'
+                          'intr 42 1 2 3\nctxt 10\nsoftirq 5 1 1\n').format(CLOCK_TICKS),
+                 'meminfo': 'MemTotal: 1000 kB\nMemFree: 200 kB\nMemAvailable: 500 kB\n'
+                            'SwapTotal: 100 kB\nSwapFree: 100 kB\n',
+                 'vmstat': 'pswpin 1\npswpout 2\n',
+                 'loadavg': '0.50 0.25 0.10 1/100 1234\n',
+                 'net/dev': ('Inter-| Receive | Transmit\n face |bytes packets\n'
+                             '  eth0: 100 1 0 0 0 0 0 0 200 2 0 0 0 0 0 0\n'),
+                 'diskstats': '   8       0 sda 1 0 8 0 2 0 16 0 0 0 0 0 0 0 0 0 0\n'}
+        for name, data in files.items():
+            with open(os.path.join(root, name), 'w') as f:
+                f.write(data)
+        procfs = GlancesProcFS(root=root, max_age=60)
+        procfs.enabled = True
+        try:
+            for _ in range(2):
+                self.assertEqual(procfs.cpu_times().user, 1.0)
+                self.assertEqual(len(procfs.cpu_times(percpu=True)), 1)
+                self.assertEqual(procfs.cpu_stats().interrupts, 42)
+                self.assertEqual(procfs.virtual_memory().percent, 50.0)
+                self.assertEqual(procfs.swap_memory().sout, 2 * 4096)
+                self.assertEqual(procfs.getloadavg(), (0.5, 0.25, 0.1))
+                self.assertEqual(procfs.net_io_counters()['eth0'].bytes_sent, 200)
+                self.assertEqual(procfs.disk_io_counters()['sda'].write_bytes, 16 * 512)
+            # The files are read once (data and end of file reads) and not per call
+            self.assertEqual(procfs.reads(), 2 * len(files))
+            procfs.tick()
+            procfs.cpu_stats()
+            self.assertEqual(procfs.reads(), 2 * len(files) + 2)
+            # 32 bits counter wrapping around (as psutil nowrap)
+            with open(os.path.join(root, 'net/dev'), 'w') as f:
+                f.write(files['net/dev'].replace(' 200 2 ', ' 50 2 '))
+            procfs.tick()
+            self.assertEqual(procfs.net_io_counters()['eth0'].bytes_sent, 250)
+            self.assertEqual(procfs.net_io_counters()['eth0'].bytes_recv, 100)
+        finally:
+            procfs.close()
+            shutil.rmtree(root)
+        # The seq_file based files return about one page per read
+        procfile = ProcFile('/proc/self/maps', size=1024)
+        try:
+            with open('/proc/self/maps', 'rb') as f:
+                maps = f.read()
+            data = procfile.read()
+        finally:
+            procfile.close()
+        self.assertTrue(len(maps) > 4096)
+        self.assertTrue(data.endswith(b'\n'))
+        # Same mappings (except those allocated between the two reads)
+        self.assertTrue(abs(data.count(b'\n') - maps.count(b'\n')) < 10)
+
+    def test_032_percpu_summary(self):
+        """Check the per-CPU stats summary."""
+        import shutil
+        import tempfile
+        from glances.cpu_percent import (CpuPercent, cpu_times_percent, cpu_topology,
+                                         percpu_groups, percpu_histogram)
+        from glances.plugins.glances_cpusummary import Plugin
+        from glances.procfs import GlancesProcFS, scputimes
+        print('INFO: [TEST_032] Per-CPU stats summary')
+        root = tempfile.mkdtemp()
+        try:
+            # CPU topology: 2 sockets, 2 NUMA nodes, CPU 3 is offline
+            for cpu, socket in [(0, 0), (1, 0), (2, 1), (3, 1), (4, 1)]:
+                os.makedirs(os.path.join(root, 'devices/system/cpu/cpu{}/topology'.format(cpu)))
+                with open(os.path.join(root, 'devices/system/cpu/cpu{}/topology/physical_package_id'.format(cpu)), 'w') as f:
+                    f.write('{}\n'.format(socket))
+            for node, cpulist in enumerate(['0,2', '1,3-4']):
+                os.makedirs(os.path.join(root, 'devices/system/node/node{}'.format(node)))
+                with open(os.path.join(root, 'devices/system/node/node{}/cpulist'.format(node)), 'w') as f:
+                    f.write(cpulist + '\n')
+            self.assertEqual(cpu_topology([0, 1, 2, 4, 5], root=root), ([0, 0, 1, 1, 0], [0, 1, 0, 1, 0]))
+
+            # 4 online CPUs: idle, 50% user, 100% user, 100% system
+            procfs = GlancesProcFS(root=root, max_age=0)
+            procfs.enabled = True
+            cpu_percent = CpuPercent(cached_time=0, kernel_stats=procfs, sys_root=root)
+            line = 'cpu{} {} 0 {} {} 0 0 0 0 0 0\n'
+            for times in [[(0, 0, 0)] * 4, [(0, 0, 100), (50, 0, 50), (100, 0, 0), (0, 100, 0)]]:
+                with open(os.path.join(root, 'stat'), 'w') as f:
+                    for cpu, (user, system, idle) in zip([0, 1, 2, 4], times):
+                        f.write(line.format(cpu, user, system, idle))
+                summary = cpu_percent.get_summary(top=2)
+            percpu = cpu_percent.percpu_percent
+            # Sub-second interval: 5 user, 5 system and 15 idle ticks
+            with open(os.path.join(root, 'stat'), 'w') as f:
+                for cpu, (user, system, idle) in zip([0, 1, 2, 4], [(5, 5, 115), (50, 0, 50), (100, 0, 0), (0, 100, 0)]):
+                    f.write(line.format(cpu, user, system, idle))
+            subsecond = cpu_percent.get(percpu=True)[0]
+            # No per-CPU stats
+            with open(os.path.join(root, 'stat'), 'w') as f:
+                f.write('cpu 1 0 1 1 0 0 0 0 0 0\n')
+            self.assertEqual(cpu_percent.get(percpu=True), [])
+            procfs.close()
+        finally:
+            shutil.rmtree(root)
+        self.assertEqual([cpu['cpu_number'] for cpu in percpu], [0, 1, 2, 4])
+        self.assertEqual((subsecond['total'], subsecond['user'], subsecond['system'], subsecond['idle']),
+                         (40.0, 20.0, 20.0, 60.0))
+        self.assertEqual(cpu_times_percent(scputimes(*[0] * 10), scputimes(0.1, 0, 0.1, 0.3, *[0] * 6))['idle'],
+                         60.0)
+        self.assertEqual([cpu['total'] for cpu in percpu], [0.0, 50.0, 100.0, 100.0])
+        self.assertEqual([cpu['cpu_number'] for cpu in summary['top']], [2, 4])
+        self.assertEqual([(s['socket'], s['cpus'], s['total']) for s in summary['sockets']],
+                         [(0, 2, 25.0), (1, 2, 100.0)])
+        self.assertEqual([(n['node'], n['total'], n['system']) for n in summary['nodes']],
+                         [(0, 50.0, 0.0), (1, 75.0, 50.0)])
+        self.assertEqual(summary['histogram'], [1, 0, 0, 0, 0, 1, 0, 0, 0, 2])
+        # Same results without NumPy
+        self.assertEqual(percpu_groups(percpu, 'socket'), summary['sockets'])
+        self.assertEqual(percpu_histogram(percpu), summary['histogram'])
+        # Flat export
+        plugin = Plugin()
+        plugin.stats = summary
+        export = plugin.get_export()
+        self.assertEqual((export['cpus'], export['top2_cpu_number'], export['top2_total']), (4, 4, 100.0))
+        self.assertEqual((export['socket1_cpus'], export['node1_system']), (2, 50.0))
+        self.assertEqual(export['histogram_90_100'], 2)
+        self.assertFalse([v for v in export.values() if isinstance(v, (list, dict))])
+
+    def test_033_restful_batch(self):
+        """Check the RESTful export batching with the spool."""
+        import json
+        import shutil
+        import tempfile
+        import threading
+        from glances.exports.glances_restful import Export
+        from glances.spool import GlancesSpool
+        print('INFO: [TEST_033] RESTful export batching')
+
+        class Response(object):
+            def raise_for_status(self):
+                pass
+
+        class Session(object):
+            """Stub HTTP session, down when up is False or after limit posts."""
+            def __init__(self):
+                self.up = True
+                self.limit = None
+                self.posts = []
+
+            def post(self, url, data=None, **kwargs):
+                if not self.up or len(self.posts) == self.limit:
+                    raise IOError('endpoint down')
+                self.posts.append([r['timestamp'] for r in json.loads(data.decode('utf-8'))])
+                return Response()
+
+            def close(self):
+                pass
+
+        path = tempfile.mkdtemp()
+        try:
+            export = Export.__new__(Export)
+            export.export_name = 'restful'
+            export.client = 'http://localhost/glances'
+            export.timeout = 1
+            export.batch_size = 3
+            export.max_payload = 0
+            export.compress = False
+            export.backoff_max = 0
+            export.buffer = []
+            export.pending = []
+            export.retry_delay = 0
+            export.next_try = 0
+            export.session = Session()
+            export.spool = GlancesSpool(path)
+            export.spool_rate = 10
+            export.spool_lock = threading.Lock()
+            export.export_time = None
+
+            def tick(timestamp):
+                export._GlancesExport__spool_batch(timestamp, [['cpu', ['total'], [timestamp]]])
+
+            # Batch of 3 refreshes, the endpoint is down for the second one
+            for timestamp in range(1, 4):
+                tick(timestamp)
+            export.session.up = False
+            for timestamp in range(4, 8):
+                tick(timestamp)
+            self.assertEqual(export.pending, [])
+            self.assertEqual(export.spool.peek()[0], 4)
+            # The spooled refreshes are replayed in order, then batched again
+            export.session.up = True
+            for timestamp in range(8, 10):
+                tick(timestamp)
+            self.assertTrue(export.spool.is_empty())
+            # The pending refreshes are posted on exit
+            export.exit()
+            self.assertEqual(export.session.posts, [[1, 2, 3], [4], [5], [6], [7], [8, 9]])
+            self.assertTrue(export.spool.is_empty())
+
+            # Split body (max_payload): only the refreshes not posted are spooled
+            export.max_payload = 1
+            export.pending = [[10, []], [11, []]]
+            export.session.limit = len(export.session.posts) + 1
+            export.exit()
+            self.assertEqual(export.session.posts[-1], [10])
+            self.assertEqual(export.spool.peek()[0], 11)
+            export.spool.pop()
+            self.assertTrue(export.spool.is_empty())
+        finally:
+            shutil.rmtree(path)
+
+    def test_034_parquet(self):
+        """Check the Parquet export row groups."""
+        import shutil
+        import tempfile
+        from datetime import datetime
+        try:
+            import pyarrow.parquet as pq
+            from glances.exports.glances_parquet import Export
+        except ImportError:
+            print('INFO: [TEST_034] PyArrow not found, skip the Parquet export test')
+            return
+        print('INFO: [TEST_034] Parquet export')
+        path = tempfile.mkdtemp()
+        try:
+            export = Export.__new__(Export)
+            export.path = path
+            export.rotate_every = 3600
+            export.compression = 'zstd'
+            export.buffer = {}
+            export.buffer_len = 0
+            export.writers = {}
+            # First row group: the mode column mixes numbers and strings
+            export.add_row('mem', datetime.now(), {'total': 1.5, 'mode': 1})
+            export.add_row('mem', datetime.now(), {'total': 2.5, 'mode': 'auto', 'flags': [1]})
+            export.flush_row_group()
+            # Second row group: integer total (cast to the file schema)
+            export.add_row('mem', datetime.now(), {'total': 3, 'mode': 'auto', 'flags': [2]})
+            export.flush_row_group()
+            export.close_writer('mem')
+
+            files = os.listdir(path)
+            self.assertEqual(len(files), 1)
+            parquet = pq.ParquetFile(os.path.join(path, files[0]))
+            self.assertEqual(parquet.num_row_groups, 2)
+            table = parquet.read().to_pydict()
+            self.assertEqual(table['total'], [1.5, 2.5, 3.0])
+            self.assertEqual(table['mode'], ['1', 'auto', 'auto'])
+            self.assertEqual(table['flags'], [None, '[1]', '[2]'])
+        finally:
+            shutil.rmtree(path)
+
+    def test_035_csv(self):
+        """Check the CSV export columns and the rotating file size."""
+        import csv
+        import shutil
+        import tempfile
+        from glances.exports.glances_csv import Export
+        from glances.rotating_file import GlancesRotatingFile
+        print('INFO: [TEST_035] CSV export')
+
+        class Stats(object):
+            def __init__(self, network):
+                self.network = network
+
+            def getAllExportsAsDict(self, plugin_list=None):
+                return {'load': {'min1': 0.5},
+                        'network': [{'key': 'interface_name', 'interface_name': i, 'rx': 1}
+                                    for i in self.network]}
+
+        path = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(path, 'glances.csv')
+            export = Export.__new__(Export)
+            export.export_name = 'csv'
+            export.export_list = ['load', 'network']
+            export.csv_file = GlancesRotatingFile(file_name, 'w')
+            export.writer = csv.writer(export.csv_file)
+            export.header = None
+            # New interface (new file), then an interface is removed (same file)
+            for network in [['eth0'], ['eth0', 'wlan0'], ['wlan0']]:
+                export.update(Stats(network))
+            export.exit()
+            self.assertEqual(len(os.listdir(path)), 2)
+            with open(file_name) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0][1:], ['load_min1',
+                                           'network_eth0_key', 'network_eth0_interface_name', 'network_eth0_rx',
+                                           'network_wlan0_key', 'network_wlan0_interface_name', 'network_wlan0_rx'])
+            self.assertEqual([row[1:] for row in rows[1:]],
+                             [['0.5', 'interface_name', 'eth0', '1', 'interface_name', 'wlan0', '1'],
+                              ['0.5', '', '', '', 'interface_name', 'wlan0', '1']])
+
+            # The size is counted in bytes
+            rotating_file = GlancesRotatingFile(file_name, 'w')
+            rotating_file.write(u'été\n')
+            rotating_file.close()
+            self.assertEqual(rotating_file.size, os.path.getsize(file_name))
+        finally:
+            shutil.rmtree(path)
+
+    def test_036_docker_inventory(self):
+        """Check the Docker containers list updated from the events."""
+        try:
+            import docker
+        except ImportError:
+            print('INFO: [TEST_036] Docker-py not found, skip the Docker inventory test')
+            return
+        from glances.plugins.glances_docker import ThreadDockerInventory
+        print('INFO: [TEST_036] Docker containers list from the events')
+
+        class Container(object):
+            def __init__(self, id, status='running'):
+                self.id = id
+                self.attrs = {'State': {'Status': status}}
+
+        class Containers(object):
+            """Stub Docker-py containers API (the daemon is down if error is set)."""
+            def __init__(self):
+                self.items = {'a': Container('a'), 'b': Container('b')}
+                self.error = None
+
+            def list(self, all=False):
+                if self.error is not None:
+                    raise self.error
+                return list(self.items.values())
+
+            def get(self, id):
+                if self.error is not None:
+                    raise self.error
+                if id not in self.items:
+                    raise docker.errors.NotFound('No such container: {}'.format(id))
+                return self.items[id]
+
+        class Client(object):
+            containers = Containers()
+
+        def ids():
+            return sorted(c.id for c in inventory.containers)
+
+        client = Client()
+        inventory = ThreadDockerInventory(client)
+        self.assertEqual(ids(), ['a', 'b'])
+        # New container, then stopped container
+        client.containers.items['c'] = Container('c')
+        inventory.update({'Action': 'start', 'id': 'c'})
+        client.containers.items['a'].attrs['State']['Status'] = 'exited'
+        inventory.update({'Action': 'die', 'id': 'a'})
+        inventory.update({'Action': 'exec_start', 'id': 'b'})
+        self.assertEqual(ids(), ['b', 'c'])
+        # Daemon error: the container is kept
+        client.containers.error = docker.errors.APIError('timeout')
+        inventory.update({'Action': 'update', 'id': 'c'})
+        self.assertEqual(ids(), ['b', 'c'])
+        # Removed container
+        client.containers.error = None
+        del client.containers.items['c']
+        inventory.update({'status': 'destroy', 'Actor': {'ID': 'c'}})
+        self.assertEqual(ids(), ['b'])
+        # Daemon unreachable: the list is cleared
+        client.containers.error = IOError('connection refused')
+        inventory.refresh()
+        self.assertEqual(ids(), [])
+
+    def test_037_folders_first_grab(self):
+        """Check the folders first grab and the directories cache."""
+        import shutil
+        import tempfile
+        from glances.config import Config
+        import glances.folder_list
+        from glances.folder_list import FolderList, FolderSizeCache, scandir
+        print('INFO: [TEST_037] Folders first grab and cache')
+        path = tempfile.mkdtemp()
+        try:
+            for folder in ['a', 'b']:
+                os.makedirs(os.path.join(path, 'root', folder))
+                with open(os.path.join(path, 'root', folder, 'file'), 'w') as f:
+                    f.write('x' * 1000)
+            with open(os.path.join(path, 'root', 'file'), 'w') as f:
+                f.write('x' * 10)
+            with open(os.path.join(path, 'glances.conf'), 'w') as f:
+                f.write('[folders]\nfolder_1_path={}\nfolder_1_refresh=15\n'.format(os.path.join(path, 'root')))
+            folders = FolderList(Config(os.path.join(path, 'glances.conf')))
+            # The cached sizes are not older than the folder refresh
+            self.assertEqual(folders.cache.max_age, 15)
+            # No time to walk the subfolders: partial size
+            folders.first_budget = 0
+            self.assertEqual(folders.update()[0]['size'], 10)
+            self.assertNotIn(0, folders.complete)
+            # The scan goes on at the next updates
+            for _ in range(50):
+                if 0 in folders.complete:
+                    break
+                time.sleep(0.1)
+                folders.update()
+            self.assertEqual(folders.get()[0]['size'], 2010)
+            folders.exit()
+
+            # An unchanged tree is not listed again, only the file sizes are read
+            listed = []
+
+            def counting_scandir(path):
+                listed.append(path)
+                return scandir(path)
+
+            cache = FolderSizeCache(max_age=0)
+            glances.folder_list.scandir = counting_scandir
+            try:
+                self.assertEqual(cache.walk(os.path.join(path, 'root')), (2010, True))
+                self.assertEqual(len(listed), 3)
+                with open(os.path.join(path, 'root', 'a', 'file'), 'a') as f:
+                    f.write('x' * 100)
+                self.assertEqual(cache.walk(os.path.join(path, 'root')), (2110, True))
+                self.assertEqual(len(listed), 3)
+            finally:
+                glances.folder_list.scandir = scandir
+        finally:
+            shutil.rmtree(path)
+
+    def test_038_cassandra(self):
+        """Check the Cassandra export round trips with a stub session."""
+        import argparse
+        import shutil
+        import tempfile
+        from glances.config import Config
+        try:
+            from glances.exports.glances_cassandra import Export
+        except ImportError:
+            print('INFO: [TEST_038] Cassandra driver not found, skip the Cassandra export test')
+            return
+        print('INFO: [TEST_038] Cassandra export')
+
+        class Future(object):
+            def __init__(self, error=None):
+                self.error = error
+
+            def result(self):
+                if self.error is not None:
+                    raise self.error
+                return []
+
+        class Session(object):
+            """Stub Cassandra session (the writes of the failed plugins fail)."""
+            def __init__(self):
+                self.prepared = []
+                self.executed = []
+                self.failed = set()
+
+            def prepare(self, query):
+                self.prepared.append(query)
+                return query
+
+            def execute_async(self, query, values=None):
+                if values[0] == 'down':
+                    raise IOError('no host available')
+                self.executed.append(values[0])
+                return Future(IOError('write timeout') if values[0] in self.failed else None)
+
+            def shutdown(self):
+                pass
+
+        class Cluster(object):
+            def shutdown(self):
+                pass
+
+        class StubExport(Export):
+            def init(self):
+                return Cluster(), Session()
+
+        path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(path, 'glances.conf'), 'w') as f:
+                f.write('[cassandra]\nhost=localhost\nport=9042\nkeyspace=glances\n'
+                        'table=localhost\nmax_inflight=2\n')
+            args = argparse.Namespace(**{'disable_' + p: False for p in Export.exportable_plugins})
+            export = StubExport(config=Config(os.path.join(path, 'glances.conf')), args=args)
+        finally:
+            shutil.rmtree(path)
+        session = export.session
+        batch = [[name, ['total'], [i]] for i, name in enumerate(['cpu', 'mem', 'load'])]
+        # One prepared statement, one write per plugin
+        for _ in range(2):
+            self.assertTrue(export.export_batch(batch))
+        self.assertEqual(len(session.prepared), 1)
+        self.assertEqual(session.executed, ['cpu', 'mem', 'load'] * 2)
+        self.assertEqual(len(export.inflight), 0)
+        # Failed writes (in the max_inflight window or at the flush)
+        session.failed = {'cpu', 'load'}
+        self.assertFalse(export.export_batch(batch))
+        self.assertEqual(len(export.inflight), 0)
+        self.assertFalse(export.export_batch([['down', ['total'], [0]]]))
+        session.failed = set()
+        self.assertTrue(export.export_batch(batch))
+        export.exit()
+
+    def test_039_statsd(self):
+        """Check the Statsd export pipeline with a stub client."""
+        import argparse
+        import shutil
+        import tempfile
+        from glances.config import Config
+        try:
+            from glances.exports.glances_statsd import Export
+        except ImportError:
+            print('INFO: [TEST_039] Statsd lib not found, skip the Statsd export test')
+            return
+        print('INFO: [TEST_039] Statsd export')
+
+        class Pipeline(object):
+            def __init__(self, client):
+                self.client = client
+                self.gauges = []
+
+            def gauge(self, stat, value):
+                self.gauges.append((stat, value))
+
+            def send(self):
+                self.client.sent.append(self.gauges)
+
+        class Client(object):
+            """Stub Statsd client: one list of gauges per pipeline sent."""
+            def __init__(self):
+                self.sent = []
+
+            def pipeline(self):
+                return Pipeline(self)
+
+        class StubExport(Export):
+            def init(self):
+                return Client()
+
+        path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(path, 'glances.conf'), 'w') as f:
+                f.write('[statsd]\nhost=localhost\nport=8125\nskip_unchanged=true\n')
+            args = argparse.Namespace(**{'disable_' + p: False for p in Export.exportable_plugins})
+            export = StubExport(config=Config(os.path.join(path, 'glances.conf')), args=args)
+        finally:
+            shutil.rmtree(path)
+        # One pipeline sent per refresh, the unchanged values are skipped
+        export.export_batch([['cpu', ['total', 'name'], [10, 'x']], ['load', ['min 1'], [0.5]]])
+        export.export_batch([['cpu', ['total', 'name'], [20, 'x']], ['load', ['min 1'], [0.5]]])
+        self.assertEqual(export.client.sent, [[('cpu.total', 10), ('load.min_1', 0.5)],
+                                              [('cpu.total', 20)]])
+        self.assertEqual(export.stat_names[('load', 'min 1')], 'load.min_1')
+
+    def test_040_graph_retry(self):
+        """Check that a failed graph is generated again."""
+        import shutil
+        import tempfile
+        from datetime import datetime, timedelta
+        from glances.exports.glances_graph import Export
+        print('INFO: [TEST_040] Graph export retry')
+        path = tempfile.mkdtemp()
+        try:
+            export = Export.__new__(Export)
+            export.path = os.path.join(path, 'missing')
+            export.width = 800
+            export.height = 600
+            export.style = 'DarkStyle'
+            export.processes = 0
+            export.signatures = {}
+            start = datetime(2019, 1, 1)
+            data = {'percent': [(start + timedelta(seconds=i), float(i)) for i in range(10)]}
+            # The folder does not exist: the graph is not written
+            self.assertTrue(export.export('mem', data))
+            self.assertNotIn('mem', export.signatures)
+            export.path = path
+            self.assertTrue(export.export('mem', data))
+            self.assertTrue(os.path.isfile(os.path.join(path, 'mem.svg')))
+            # Up to date
+            self.assertFalse(export.export('mem', data))
+        finally:
+            shutil.rmtree(path)
+
     def test_094_thresholds(self):
         """Test thresholds classes"""
         print('INFO: [TEST_094] Thresholds')